@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+HX Infrastructure - Dashboard Generation Benchmark
+Phase 3.4 - Production Operations Automation
+
+Times generate_all_dashboards against synthetic monitoring data at multiples
+of a typical day's volume
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import argparse
+import datetime
+import statistics
+from pathlib import Path
+from typing import Dict, List, Any
+import logging
+
+from dashboard_generator import DashboardGenerator
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Data files produced on one node in a day at the default schedules:
+# health every 5 minutes, SLA hourly, plus maintenance and incident records
+BASE_VOLUME = {"health": 288, "sla": 24, "maintenance": 10, "incidents": 50, "detected": 10}
+
+
+def iso8601(epoch: int) -> str:
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def build_dataset(data_dir: Path, scale: int, seed: int = 0):
+    """Write scale x BASE_VOLUME synthetic data files ending now"""
+    rng = random.Random(seed)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    now = int(time.time())
+
+    health_count = BASE_VOLUME["health"] * scale
+    for i in range(health_count):
+        epoch = now - (health_count - i) * 300
+        sample = {
+            "cpu_usage": round(rng.uniform(5, 95), 1),
+            "memory_usage": round(rng.uniform(20, 90), 1),
+            "disk_usage": rng.randint(30, 80),
+            "system_load": round(rng.uniform(0, 4), 2),
+            "timestamp": iso8601(epoch)
+        }
+        (data_dir / f"health-{epoch}.json").write_text(json.dumps(sample))
+
+    sla_count = BASE_VOLUME["sla"] * scale
+    for i in range(sla_count):
+        epoch = now - (sla_count - i) * 3600
+        response_time = rng.lognormvariate(5.5, 0.5)
+        violated = response_time > 1000
+        sample = {
+            "timestamp": iso8601(epoch),
+            "availability": {"current": round(rng.uniform(99.5, 100), 3), "status": "met"},
+            "response_time": {"current": round(response_time, 1), "status": "violated" if violated else "met"},
+            "error_rate": {"current": round(rng.uniform(0, 0.5), 2), "status": "met"},
+            "overall_status": "violated" if violated else "met"
+        }
+        (data_dir / f"sla-metrics-{epoch}.json").write_text(json.dumps(sample))
+
+    for i in range(BASE_VOLUME["maintenance"] * scale):
+        report = {
+            "report_metadata": {"maintenance_type": rng.choice(["patching", "cleanup", "backup"])},
+            "maintenance_window": {"actual_duration": rng.randint(300, 3600)},
+            "execution_summary": {"post_verification": {"verified": rng.random() > 0.1}}
+        }
+        (data_dir / f"maintenance-report-{now - i * 600}.json").write_text(json.dumps(report))
+
+    incidents = []
+    for i in range(BASE_VOLUME["incidents"] * scale):
+        created = iso8601(now - rng.randint(0, 30 * 86400))
+        incidents.append({
+            "incident_metadata": {"incident_id": f"INC-{i}", "created_at": created,
+                                  "status": rng.choice(["active", "resolved"])},
+            "remediation": {"attempted": rng.random() > 0.3, "successful": rng.random() > 0.4},
+            "escalation": {"escalated": rng.random() > 0.9}
+        })
+    (data_dir / "incident_database.json").write_text(json.dumps({
+        "incidents": incidents,
+        "statistics": {"total": len(incidents)}
+    }))
+
+    (data_dir / "incidents").mkdir(exist_ok=True)
+    for i in range(BASE_VOLUME["detected"] * scale):
+        (data_dir / "incidents" / f"detected-{now - i}.json").write_text(json.dumps(incidents[i]))
+
+
+def time_call(func, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(round(time.perf_counter() - started, 4))
+    return samples
+
+
+def benchmark_scale(scale: int, repeat: int, workers: int) -> Dict[str, Any]:
+    """Cold, forced serial, forced parallel and unchanged-input runs at one scale"""
+    work_dir = Path(tempfile.mkdtemp(prefix=f"hx-dashboard-bench-{scale}x-"))
+    try:
+        data_dir = work_dir / "data"
+        build_dataset(data_dir, scale)
+
+        def generator():
+            return DashboardGenerator(str(data_dir), str(work_dir / "out"), str(work_dir / "state"))
+
+        # The first run ingests every sample into the metric store
+        cold = time_call(lambda: generator().generate_all_dashboards(force=True, workers=1), 1)
+        serial = time_call(lambda: generator().generate_all_dashboards(force=True, workers=1), repeat)
+        parallel = time_call(lambda: generator().generate_all_dashboards(force=True, workers=workers), repeat)
+        unchanged = time_call(lambda: generator().generate_all_dashboards(), repeat)
+        return {
+            "cold_seconds": cold,
+            "serial_seconds": serial,
+            "parallel_seconds": parallel,
+            "unchanged_seconds": unchanged
+        }
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HX Infrastructure Dashboard Generation Benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100],
+                       help="Multiples of one day's data volume to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument("--workers", type=int, default=min(5, os.cpu_count() or 1),
+                       help="Worker processes for the parallel measurement")
+    parser.add_argument("--output", help="Output file for the results (JSON, default: benchmark_results/)")
+
+    args = parser.parse_args()
+    # Synthetic data has no APM or infrastructure samples; keep their warnings out of the timings
+    logging.getLogger().setLevel(logging.ERROR)
+
+    results = {}
+    for scale in args.scales:
+        for measurement, samples in benchmark_scale(scale, args.repeat, args.workers).items():
+            results[f"dashboard_generation_{scale}x_{measurement}"] = {
+                "samples": samples,
+                "median": statistics.median(samples),
+                "unit": "seconds"
+            }
+            print(f"{scale:>4}x {measurement:<18} median {statistics.median(samples):.3f}s")
+
+    report = {
+        "benchmark_timestamp": time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+        "benchmark": "dashboard_generation",
+        "parameters": {"base_volume": BASE_VOLUME, "scales": args.scales,
+                       "repeat": args.repeat, "workers": args.workers, "cpu_count": os.cpu_count()},
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else \
+        PROJECT_ROOT / "benchmark_results" / f"dashboard_benchmark_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,28 @@ Phase 3.4 - Production Operations Automation
 Generates operational dashboards from monitoring data
 """
 
+import re
 import json
+import math
 import os
 import sys
+import time
 import argparse
 import datetime
+import tempfile
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Union
 import logging
 
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+from data_catalog import DataCatalog
+from metric_store import MetricStore, TIMESTAMP_COLUMN
+from incident_store import IncidentStore
+from rolling_stats import WINDOWS, rolling_windows, summarize, window_rows
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,24 +36,345 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates" / "dashboards"
+
+# Bump when dashboard contents change so saved input fingerprints are discarded
+FINGERPRINT_VERSION = 2
+
+DASHBOARD_BUILDERS = {
+    "system_health": "generate_system_health_dashboard",
+    "incident": "generate_incident_dashboard",
+    "maintenance": "generate_maintenance_dashboard",
+    "sla": "generate_sla_dashboard",
+    "operational": "generate_operational_overview"
+}
+
+# Numeric series kept in columnar stores; each data file contributes one row
+METRIC_SERIES = {
+    "health": {
+        "pattern": "health-*.json",
+        "name": re.compile(r"^health-(\d{9,})\.json$"),
+        "columns": ["cpu_usage", "memory_usage", "disk_usage", "system_load"],
+        "extract": "_health_row"
+    },
+    "sla": {
+        "pattern": "sla-metrics-*.json",
+        "name": re.compile(r"^sla-metrics-(\d{9,})\.json$"),
+        "columns": ["availability", "response_time", "error_rate",
+                    "availability_violated", "response_time_violated", "error_rate_violated", "violated"],
+        "extract": "_sla_row"
+    }
+}
+
+SLA_NAMES = ["availability", "response_time", "error_rate"]
+
+def sample_epoch(path: Path, series: str) -> Optional[int]:
+    """Sample time encoded in a series data file name such as health-<epoch>.json.
+
+    Other files the glob also matches, like health_check.sh's
+    health-check-YYYYmmdd-HHMMSS.json reports, give None.
+    """
+    match = METRIC_SERIES[series]["name"].match(path.name)
+    return int(match.group(1)) if match else None
+
+def to_float(value: Any) -> float:
+    """Numeric metric value; Ansible-rendered numbers may arrive as strings"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def format_timestamp(epoch: float) -> str:
+    return datetime.datetime.fromtimestamp(epoch, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def trend(values) -> List[float]:
+    """Newest-first trend list with missing samples reported as 0"""
+    return [value if value == value else 0 for value in reversed(values)]
+
+def file_signature(path: Path) -> Optional[List[int]]:
+    """mtime and size of a file, or None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def write_atomic(path: Path, content: Union[str, Iterable[str]]):
+    """Write via a temp file and rename so readers never see a partial file"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            if isinstance(content, str):
+                f.write(content)
+            else:
+                f.writelines(content)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+# Generator owned by each worker process of a parallel generation
+_worker_generator = None
+
+def _init_worker(generator_args: tuple):
+    global _worker_generator
+    _worker_generator = DashboardGenerator(*generator_args)
+    # Pool workers exit without running atexit hooks, so release temp state on their shutdown
+    multiprocessing.util.Finalize(None, _worker_generator.close, exitpriority=10)
+
+def _generate_in_worker(name: str) -> Dict[str, Any]:
+    """Build one dashboard in a worker and hand its input fingerprint back"""
+    _worker_generator.begin_generation()
+    _worker_generator.generate_dashboard(name, force=True)
+    return _worker_generator.fingerprints[name]
+
 class DashboardGenerator:
     def __init__(self, data_dir: str = "/var/log/hx-infrastructure", 
-                 output_dir: str = "/var/www/html"):
+                 output_dir: str = "/var/www/html",
+                 state_dir: str = "/var/lib/hx-infrastructure/dashboards",
+                 incident_store: Optional[str] = None,
+                 workers: int = 1):
         self.data_dir = Path(data_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.state_dir = Path(state_dir)
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"State directory {state_dir} unavailable, caching in memory only: {e}")
+            self.state_dir = None
+        self.catalog = DataCatalog(
+            self.data_dir, self.state_dir / "data-catalog.json" if self.state_dir else None
+        )
+        self._json_cache = {}
+        # Without a state dir the metric stores live in a temp dir removed with the generator
+        self._metrics_tmp = None
+        if self.state_dir:
+            self.metrics_dir = self.state_dir / "metrics"
+        else:
+            self._metrics_tmp = tempfile.TemporaryDirectory(prefix="hx-dashboard-metrics-")
+            self.metrics_dir = Path(self._metrics_tmp.name)
+        self.metric_stores = {}
+        self._worker_args = (str(self.data_dir), str(self.output_dir), str(state_dir),
+                             str(incident_store) if incident_store else None)
+        # The incident store is opt-in: it is used only once it has been created
+        if incident_store is None and self.state_dir:
+            incident_store = self.state_dir / "incidents.db"
+        self.incident_store_path = Path(incident_store) if incident_store else None
+        self._incident_store = None
+        self.workers = workers
+        self._template_env = None
+        self.fingerprints = self._load_fingerprints()
+        self._fingerprints_dirty = False
+        # Inputs read by the dashboard currently being built
+        self._inputs = None
+    
+    def _fingerprint_file(self) -> Optional[Path]:
+        return self.state_dir / "dashboard-inputs.json" if self.state_dir else None
+    
+    def _load_fingerprints(self) -> Dict[str, Any]:
+        """Load the input fingerprints recorded by a previous run"""
+        fingerprint_file = self._fingerprint_file()
+        if fingerprint_file is None or not fingerprint_file.exists():
+            return {}
+        try:
+            with open(fingerprint_file, 'r') as f:
+                saved = json.load(f)
+            if saved.get("version") == FINGERPRINT_VERSION:
+                return saved.get("dashboards", {})
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable input fingerprints {fingerprint_file}: {e}")
+        return {}
+    
+    def close(self):
+        """Remove the temporary metric stores used when there is no state dir"""
+        if self._metrics_tmp is not None:
+            self._metrics_tmp.cleanup()
+            self._metrics_tmp = None
+    
+    def save_state(self):
+        """Persist the data catalog and input fingerprints"""
+        self.catalog.save()
+        fingerprint_file = self._fingerprint_file()
+        if fingerprint_file is None or not self._fingerprints_dirty:
+            return
+        try:
+            write_atomic(fingerprint_file, json.dumps({"version": FINGERPRINT_VERSION, "dashboards": self.fingerprints}))
+            self._fingerprints_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save input fingerprints {fingerprint_file}: {e}")
+    
+    def begin_generation(self):
+        """Start a generation pass: pick up new files and drop parsed data"""
+        self.catalog.begin_generation()
+        self._json_cache.clear()
+    
+    def _track_pattern(self, pattern: str, limit: int):
+        if self._inputs is not None:
+            limit = max(limit, self._inputs["patterns"].get(pattern, {}).get("limit", 0))
+            self._inputs["patterns"][pattern] = {"limit": limit, "files": self.catalog.names(pattern)[:limit]}
+    
+    def _track_file(self, path: Path, signature: Optional[List[int]] = None):
+        if self._inputs is not None:
+            self._inputs["files"][str(path)] = signature if signature is not None else file_signature(path)
+    
+    def _load_json(self, path: Path, track: bool = True) -> Any:
+        """Parse a data file at most once per generation pass"""
+        if path not in self._json_cache:
+            with open(path, 'r') as f:
+                # Fingerprint exactly the version of the file that was read
+                stat = os.fstat(f.fileno())
+                signature = [stat.st_mtime_ns, stat.st_size]
+                try:
+                    self._json_cache[path] = (signature, json.load(f))
+                except ValueError:
+                    # A half-written file still counts as read so finishing it triggers a rebuild
+                    if track:
+                        self._track_file(path, signature)
+                    raise
+        signature, data = self._json_cache[path]
+        if track:
+            self._track_file(path, signature)
+        return data
+    
+    def _get_metric_store(self, series: str) -> MetricStore:
+        if series not in self.metric_stores:
+            self.metric_stores[series] = MetricStore(self.metrics_dir / series, METRIC_SERIES[series]["columns"])
+        return self.metric_stores[series]
+    
+    def _health_row(self, sample: Dict[str, Any]) -> Dict[str, float]:
+        return {column: to_float(sample.get(column)) for column in METRIC_SERIES["health"]["columns"]}
+    
+    def _sla_row(self, sample: Dict[str, Any]) -> Dict[str, float]:
+        row = {"violated": 1.0 if sample.get("overall_status") == "violated" else 0.0}
+        for sla in SLA_NAMES:
+            row[sla] = to_float(sample.get(sla, {}).get("current"))
+            row[f"{sla}_violated"] = 1.0 if sample.get(sla, {}).get("status") == "violated" else 0.0
+        return row
+    
+    def load_series(self, series: str, window: int) -> Dict[str, Any]:
+        """Append samples newer than the metric store, then return its last `window` rows"""
+        spec = METRIC_SERIES[series]
+        store = self._get_metric_store(series)
+        self._track_pattern(spec["pattern"], window)
+        directory = self.data_dir / os.path.dirname(spec["pattern"])
+        
+        last = store.last_timestamp()
+        rows = []
+        # Every file newer than the store is read, whatever its ctime order.
+        # Once stored a sample is never re-read, so only the window counts as input
+        index = 0
+        for name in self.catalog.names(spec["pattern"]):
+            path = directory / name
+            epoch = sample_epoch(path, series)
+            if epoch is None:
+                continue
+            index += 1
+            if last is not None and epoch <= last:
+                continue
+            try:
+                sample = self._load_json(path, track=index <= window)
+                rows.append((epoch, getattr(self, spec["extract"])(sample)))
+            except Exception as e:
+                logger.warning(f"Error loading {path}: {e}")
+        rows.sort(key=lambda row: row[0])
+        store.extend(rows)
+        
+        return store.tail(window)
+    
+    def load_series_windows(self, series: str, columns: List[str]) -> Dict[str, Any]:
+        """Rolling window statistics per column, ending at the newest stored sample"""
+        store = self._get_metric_store(series)
+        end = store.last_timestamp()
+        if end is None:
+            return {}
+        rows = store.range(end - max(WINDOWS.values()))
+        return {column: rolling_windows(rows[TIMESTAMP_COLUMN], rows[column], end=end) for column in columns}
+    
+    def _get_incident_store(self) -> Optional[IncidentStore]:
+        """Open the incident store if present, importing incident_database.json when it changed"""
+        if self.incident_store_path is None or not self.incident_store_path.exists():
+            return None
+        if self._incident_store is None:
+            self._incident_store = IncidentStore(self.incident_store_path)
+        
+        incident_db_file = self.data_dir / "incident_database.json"
+        source_signature = file_signature(incident_db_file)
+        if source_signature is not None and not self._incident_store.is_current(source_signature):
+            try:
+                incident_db = self._load_json(incident_db_file)
+                count = self._incident_store.import_database(incident_db, self._json_cache[incident_db_file][0])
+                logger.info(f"Imported {count} incidents into {self.incident_store_path}")
+            except Exception as e:
+                logger.error(f"Error importing {incident_db_file} into the incident store: {e}")
+        self._track_file(incident_db_file)
+        self._track_file(self.incident_store_path)
+        return self._incident_store
+    
+    def _current_inputs(self, recorded: Dict[str, Any]) -> Dict[str, Any]:
+        """Re-evaluate a recorded input set against the data directory as it is now"""
+        patterns = {}
+        for pattern, entry in recorded["patterns"].items():
+            patterns[pattern] = {"limit": entry["limit"], "files": self.catalog.names(pattern)[:entry["limit"]]}
+        return {
+            "patterns": patterns,
+            "files": {path: file_signature(Path(path)) for path in recorded["files"]}
+        }
+    
+    def _output_files(self, name: str) -> List[Path]:
+        return [self.output_dir / f"{name}_dashboard.json", self.output_dir / f"{name}_dashboard.html"]
+    
+    def is_up_to_date(self, name: str) -> bool:
+        """Whether the dashboard's outputs exist and none of its inputs changed"""
+        recorded = self.fingerprints.get(name)
+        if recorded is None or not all(path.exists() for path in self._output_files(name)):
+            return False
+        return self._current_inputs(recorded) == recorded
+    
+    def generate_dashboard(self, name: str, force: bool = False) -> bool:
+        """Build and write one dashboard unless its inputs are unchanged; True if written"""
+        if not force and self.is_up_to_date(name):
+            logger.debug(f"Skipping {name} dashboard, inputs unchanged")
+            return False
+        
+        self._inputs = {"patterns": {}, "files": {}}
+        try:
+            data = getattr(self, DASHBOARD_BUILDERS[name])()
+            inputs = self._inputs
+        finally:
+            self._inputs = None
+        
+        json_file, html_file = self._output_files(name)
+        write_atomic(json_file, json.dumps(data, indent=2))
+        write_atomic(html_file, self.render_html_dashboard(data, name))
+        
+        # Our own outputs can be inputs (the incident dashboard carries active
+        # incidents forward); record them as just written, not as last read
+        for output_file in (json_file, html_file):
+            self._json_cache.pop(output_file, None)
+            if str(output_file) in inputs["files"]:
+                inputs["files"][str(output_file)] = file_signature(output_file)
+        
+        self.fingerprints[name] = inputs
+        self._fingerprints_dirty = True
+        logger.info(f"Generated {name} dashboard: {json_file} and {html_file}")
+        return True
         
     def load_latest_data(self, pattern: str) -> Dict[str, Any]:
-        """Load the latest data file matching the pattern"""
+        """Load the latest data file matching the pattern (and a series' file names)"""
         try:
-            files = list(self.data_dir.glob(pattern))
+            files = self.catalog.files(pattern)
+            series = next((name for name, spec in METRIC_SERIES.items() if spec["pattern"] == pattern), None)
+            if series is not None:
+                files = [path for path in files if sample_epoch(path, series) is not None]
+            files = files[:1]
+            self._track_pattern(pattern, 1)
             if not files:
                 logger.warning(f"No files found matching pattern: {pattern}")
                 return {}
             
-            latest_file = max(files, key=os.path.getctime)
-            with open(latest_file, 'r') as f:
-                return json.load(f)
+            return self._load_json(files[0])
         except Exception as e:
             logger.error(f"Error loading data from {pattern}: {e}")
             return {}
@@ -48,14 +382,13 @@ class DashboardGenerator:
     def load_multiple_data(self, pattern: str, limit: int = 24) -> List[Dict[str, Any]]:
         """Load multiple data files for trend analysis"""
         try:
-            files = list(self.data_dir.glob(pattern))
-            files.sort(key=os.path.getctime, reverse=True)
+            files = self.catalog.files(pattern, limit)
+            self._track_pattern(pattern, limit)
             
             data = []
-            for file in files[:limit]:
+            for file in files:
                 try:
-                    with open(file, 'r') as f:
-                        data.append(json.load(f))
+                    data.append(self._load_json(file))
                 except Exception as e:
                     logger.warning(f"Error loading {file}: {e}")
                     continue
@@ -73,20 +406,21 @@ class DashboardGenerator:
         health_data = self.load_latest_data("health-*.json")
         
         # Load historical data for trends
-        historical_health = self.load_multiple_data("health-*.json", 24)
+        history = self.load_series("health", 24)
+        windows = self.load_series_windows("health", ["cpu_usage", "memory_usage", "disk_usage"])
         
         dashboard = {
             "title": "HX Infrastructure - System Health Dashboard",
             "generated_at": datetime.datetime.now().isoformat(),
             "current_status": health_data,
             "trends": {
-                "cpu_usage": [h.get("cpu_usage", 0) for h in historical_health],
-                "memory_usage": [h.get("memory_usage", 0) for h in historical_health],
-                "disk_usage": [h.get("disk_usage", 0) for h in historical_health],
-                "timestamps": [h.get("timestamp", "") for h in historical_health]
+                "cpu_usage": trend(history["cpu_usage"]),
+                "memory_usage": trend(history["memory_usage"]),
+                "disk_usage": trend(history["disk_usage"]),
+                "timestamps": [format_timestamp(epoch) for epoch in reversed(history[TIMESTAMP_COLUMN])]
             },
             "alerts": self._generate_health_alerts(health_data),
-            "summary": self._generate_health_summary(health_data, historical_health)
+            "summary": self._generate_health_summary(health_data, windows)
         }
         
         return dashboard
@@ -95,12 +429,22 @@ class DashboardGenerator:
         """Generate incident response dashboard data"""
         logger.info("Generating incident dashboard")
         
-        # Load incident database
-        incident_db_file = self.data_dir / "incident_database.json"
-        incident_db = {}
-        if incident_db_file.exists():
-            with open(incident_db_file, 'r') as f:
-                incident_db = json.load(f)
+        incident_store = self._get_incident_store()
+        if incident_store is not None:
+            statistics = incident_store.statistics()
+            incident_trends = incident_store.incident_trends()
+            response_metrics = incident_store.response_metrics()
+        else:
+            # Load incident database
+            incident_db_file = self.data_dir / "incident_database.json"
+            incident_db = {}
+            self._track_file(incident_db_file)
+            if incident_db_file.exists():
+                incident_db = self._load_json(incident_db_file)
+            statistics = incident_db.get("statistics", {})
+            incident_trends = self._generate_incident_trends(incident_db)
+            response_metrics = self._generate_response_metrics(incident_db)
+        incident_trends["daily_stats"] = summarize(list(incident_trends["daily_incidents"].values()))
         
         # Load recent incidents
         recent_incidents = self.load_multiple_data("incidents/detected-*.json", 10)
@@ -108,18 +452,18 @@ class DashboardGenerator:
         # Load active incidents from dashboard
         active_incidents_file = self.output_dir / "incident_dashboard.json"
         active_incidents = {}
+        self._track_file(active_incidents_file)
         if active_incidents_file.exists():
-            with open(active_incidents_file, 'r') as f:
-                active_incidents = json.load(f)
+            active_incidents = self._load_json(active_incidents_file)
         
         dashboard = {
             "title": "HX Infrastructure - Incident Response Dashboard",
             "generated_at": datetime.datetime.now().isoformat(),
-            "statistics": incident_db.get("statistics", {}),
+            "statistics": statistics,
             "active_incidents": active_incidents.get("active_incidents", []),
             "recent_incidents": recent_incidents,
-            "incident_trends": self._generate_incident_trends(incident_db),
-            "response_metrics": self._generate_response_metrics(incident_db)
+            "incident_trends": incident_trends,
+            "response_metrics": response_metrics
         }
         
         return dashboard
@@ -150,15 +494,17 @@ class DashboardGenerator:
         logger.info("Generating SLA dashboard")
         
         # Load SLA metrics
-        sla_metrics = self.load_multiple_data("sla-metrics-*.json", 24)
+        current_sla = self.load_latest_data("sla-metrics-*.json")
+        sla_history = self.load_series("sla", 24)
+        sla_windows = self.load_series_windows("sla", SLA_NAMES)
         
         dashboard = {
             "title": "HX Infrastructure - SLA Dashboard",
             "generated_at": datetime.datetime.now().isoformat(),
-            "current_sla": sla_metrics[0] if sla_metrics else {},
-            "sla_trends": self._generate_sla_trends(sla_metrics),
-            "sla_violations": self._identify_sla_violations(sla_metrics),
-            "sla_summary": self._generate_sla_summary(sla_metrics)
+            "current_sla": current_sla,
+            "sla_trends": self._generate_sla_trends(sla_history),
+            "sla_violations": self._identify_sla_violations(sla_history),
+            "sla_summary": self._generate_sla_summary(sla_history, sla_windows)
         }
         
         return dashboard
@@ -173,11 +519,15 @@ class DashboardGenerator:
         infrastructure_data = self.load_latest_data("infrastructure-metrics-*.json")
         
         # Load incident statistics
+        incident_store = self._get_incident_store()
         incident_db_file = self.data_dir / "incident_database.json"
         incident_stats = {}
-        if incident_db_file.exists():
-            with open(incident_db_file, 'r') as f:
-                incident_stats = json.load(f).get("statistics", {})
+        if incident_store is not None:
+            incident_stats = incident_store.statistics()
+        else:
+            self._track_file(incident_db_file)
+            if incident_db_file.exists():
+                incident_stats = self._load_json(incident_db_file).get("statistics", {})
         
         dashboard = {
             "title": "HX Infrastructure - Operational Overview",
@@ -234,20 +584,23 @@ class DashboardGenerator:
         
         return alerts
     
-    def _generate_health_summary(self, current: Dict[str, Any], historical: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _generate_health_summary(self, current: Dict[str, Any], windows: Dict[str, Any]) -> Dict[str, Any]:
         """Generate health summary statistics"""
-        if not historical:
+        if not windows:
             return {"status": "no_data"}
         
-        cpu_values = [h.get("cpu_usage", 0) for h in historical if h.get("cpu_usage")]
-        memory_values = [h.get("memory_usage", 0) for h in historical if h.get("memory_usage")]
+        cpu_24h = windows["cpu_usage"]["24h"]
+        memory_24h = windows["memory_usage"]["24h"]
         
         return {
-            "avg_cpu_24h": sum(cpu_values) / len(cpu_values) if cpu_values else 0,
-            "avg_memory_24h": sum(memory_values) / len(memory_values) if memory_values else 0,
-            "peak_cpu_24h": max(cpu_values) if cpu_values else 0,
-            "peak_memory_24h": max(memory_values) if memory_values else 0,
-            "data_points": len(historical)
+            "avg_cpu_24h": cpu_24h.get("mean", 0),
+            "avg_memory_24h": memory_24h.get("mean", 0),
+            "peak_cpu_24h": cpu_24h.get("max", 0),
+            "peak_memory_24h": memory_24h.get("max", 0),
+            "p95_cpu_24h": cpu_24h.get("p95", 0),
+            "p95_memory_24h": memory_24h.get("p95", 0),
+            "data_points": cpu_24h.get("count", 0),
+            "windows": windows
         }
     
     def _generate_incident_trends(self, incident_db: Dict[str, Any]) -> Dict[str, Any]:
@@ -282,6 +635,7 @@ class DashboardGenerator:
     def _load_maintenance_summary(self) -> List[Dict[str, Any]]:
         """Load maintenance summary from CSV"""
         csv_file = self.data_dir / "maintenance-summary.csv"
+        self._track_file(csv_file)
         if not csv_file.exists():
             return []
         
@@ -312,54 +666,55 @@ class DashboardGenerator:
             return {}
         
         successful_maintenance = len([r for r in reports if r.get("execution_summary", {}).get("post_verification", {}).get("verified")])
+        durations = [to_float(r.get("maintenance_window", {}).get("actual_duration", 0)) for r in reports]
+        duration_stats = summarize(durations)
         
         return {
             "total_maintenance": len(reports),
             "success_rate": successful_maintenance / len(reports) * 100,
-            "avg_duration": sum([r.get("maintenance_window", {}).get("actual_duration", 0) for r in reports]) / len(reports)
+            "avg_duration": duration_stats.get("mean", 0),
+            "p95_duration": duration_stats.get("p95", 0),
+            "duration_stats": duration_stats
         }
     
-    def _generate_sla_trends(self, sla_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _generate_sla_trends(self, sla_history: Dict[str, Any]) -> Dict[str, Any]:
         """Generate SLA trend analysis"""
-        if not sla_metrics:
+        if not sla_history[TIMESTAMP_COLUMN]:
             return {}
         
-        availability_values = [s.get("availability", {}).get("current", 0) for s in sla_metrics]
-        response_time_values = [s.get("response_time", {}).get("current", 0) for s in sla_metrics]
-        
         return {
-            "availability_trend": availability_values,
-            "response_time_trend": response_time_values,
-            "timestamps": [s.get("timestamp", "") for s in sla_metrics]
+            "availability_trend": trend(sla_history["availability"]),
+            "response_time_trend": trend(sla_history["response_time"]),
+            "timestamps": [format_timestamp(epoch) for epoch in reversed(sla_history[TIMESTAMP_COLUMN])]
         }
     
-    def _identify_sla_violations(self, sla_metrics: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _identify_sla_violations(self, sla_history: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Identify SLA violations"""
         violations = []
         
-        for metric in sla_metrics:
-            if metric.get("overall_status") == "violated":
+        for index in reversed(range(len(sla_history[TIMESTAMP_COLUMN]))):
+            if sla_history["violated"][index]:
                 violations.append({
-                    "timestamp": metric.get("timestamp"),
-                    "violated_slas": [
-                        sla for sla in ["availability", "response_time", "error_rate"]
-                        if metric.get(sla, {}).get("status") == "violated"
-                    ]
+                    "timestamp": format_timestamp(sla_history[TIMESTAMP_COLUMN][index]),
+                    "violated_slas": [sla for sla in SLA_NAMES if sla_history[f"{sla}_violated"][index]]
                 })
         
         return violations
     
-    def _generate_sla_summary(self, sla_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _generate_sla_summary(self, sla_history: Dict[str, Any], windows: Dict[str, Any]) -> Dict[str, Any]:
         """Generate SLA summary statistics"""
-        if not sla_metrics:
+        data_points = len(sla_history[TIMESTAMP_COLUMN])
+        if not data_points:
             return {}
         
-        violations = len([s for s in sla_metrics if s.get("overall_status") == "violated"])
+        violations = int(math.fsum(sla_history["violated"]))
         
         return {
-            "sla_compliance_rate": (len(sla_metrics) - violations) / len(sla_metrics) * 100,
+            "sla_compliance_rate": (data_points - violations) / data_points * 100,
             "total_violations": violations,
-            "data_points": len(sla_metrics)
+            "data_points": data_points,
+            "p95_response_time_24h": windows.get("response_time", {}).get("24h", {}).get("p95", 0),
+            "windows": windows
         }
     
     def _determine_overall_status(self, health_data: Dict[str, Any]) -> str:
@@ -412,295 +767,78 @@ class DashboardGenerator:
         
         return alerts
     
-    def generate_html_dashboard(self, dashboard_data: Dict[str, Any], template_name: str) -> str:
+    def _get_template_env(self) -> Environment:
+        """Jinja2 environment whose compiled templates persist in the state dir"""
+        if self._template_env is None:
+            bytecode_cache = None
+            if self.state_dir:
+                cache_dir = self.state_dir / "template-cache"
+                cache_dir.mkdir(exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+            self._template_env = Environment(
+                loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                bytecode_cache=bytecode_cache,
+                autoescape=True,
+                trim_blocks=True,
+                lstrip_blocks=True
+            )
+            self._template_env.globals["window_rows"] = window_rows
+        return self._template_env
+    
+    def _get_template(self, template_name: str):
+        template_file = f"{template_name}.html.j2" if template_name in DASHBOARD_BUILDERS else "base.html.j2"
+        return self._get_template_env().get_template(template_file)
+    
+    def render_html_dashboard(self, dashboard_data: Dict[str, Any], template_name: str,
+                              live: bool = False) -> Iterator[str]:
+        """Render a dashboard page chunk by chunk; live pages take updates over SSE instead of reloading"""
+        return self._get_template(template_name).generate(data=dashboard_data, dashboard=template_name, live=live)
+    
+    def generate_html_dashboard(self, dashboard_data: Dict[str, Any], template_name: str,
+                                live: bool = False) -> str:
         """Generate HTML dashboard from data"""
-        html_template = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{dashboard_data.get('title', 'HX Infrastructure Dashboard')}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
-        .dashboard {{ max-width: 1200px; margin: 0 auto; }}
-        .header {{ background: #2c3e50; color: white; padding: 20px; border-radius: 5px; margin-bottom: 20px; }}
-        .card {{ background: white; padding: 20px; margin: 10px 0; border-radius: 5px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        .status-healthy {{ color: #27ae60; }}
-        .status-warning {{ color: #f39c12; }}
-        .status-critical {{ color: #e74c3c; }}
-        .metric {{ display: inline-block; margin: 10px 20px 10px 0; }}
-        .metric-value {{ font-size: 2em; font-weight: bold; }}
-        .metric-label {{ font-size: 0.9em; color: #666; }}
-        .alert {{ padding: 10px; margin: 5px 0; border-radius: 3px; }}
-        .alert-warning {{ background: #fff3cd; border-left: 4px solid #ffc107; }}
-        .alert-critical {{ background: #f8d7da; border-left: 4px solid #dc3545; }}
-        .timestamp {{ font-size: 0.8em; color: #666; }}
-    </style>
-</head>
-<body>
-    <div class="dashboard">
-        <div class="header">
-            <h1>{dashboard_data.get('title', 'HX Infrastructure Dashboard')}</h1>
-            <p class="timestamp">Generated: {dashboard_data.get('generated_at', '')}</p>
-        </div>
-        
-        <div class="content">
-            {self._generate_dashboard_content(dashboard_data, template_name)}
-        </div>
-    </div>
-    
-    <script>
-        // Auto-refresh every 5 minutes
-        setTimeout(function(){{ location.reload(); }}, 300000);
-    </script>
-</body>
-</html>
-        """
-        
-        return html_template
-    
-    def _generate_dashboard_content(self, data: Dict[str, Any], template_name: str) -> str:
-        """Generate dashboard-specific content"""
-        if template_name == "system_health":
-            return self._generate_health_content(data)
-        elif template_name == "incident":
-            return self._generate_incident_content(data)
-        elif template_name == "maintenance":
-            return self._generate_maintenance_content(data)
-        elif template_name == "sla":
-            return self._generate_sla_content(data)
-        elif template_name == "operational":
-            return self._generate_operational_content(data)
-        else:
-            return "<div class='card'><h2>Dashboard content not available</h2></div>"
-    
-    def _generate_health_content(self, data: Dict[str, Any]) -> str:
-        """Generate system health dashboard content"""
-        current = data.get("current_status", {})
-        alerts = data.get("alerts", [])
-        
-        content = f"""
-        <div class="card">
-            <h2>Current System Status</h2>
-            <div class="metric">
-                <div class="metric-value status-{'critical' if current.get('cpu_usage', 0) > 90 else 'warning' if current.get('cpu_usage', 0) > 80 else 'healthy'}">{current.get('cpu_usage', 0):.1f}%</div>
-                <div class="metric-label">CPU Usage</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-{'critical' if current.get('memory_usage', 0) > 95 else 'warning' if current.get('memory_usage', 0) > 85 else 'healthy'}">{current.get('memory_usage', 0):.1f}%</div>
-                <div class="metric-label">Memory Usage</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-{'critical' if current.get('disk_usage', 0) > 95 else 'warning' if current.get('disk_usage', 0) > 90 else 'healthy'}">{current.get('disk_usage', 0)}%</div>
-                <div class="metric-label">Disk Usage</div>
-            </div>
-        </div>
-        """
-        
-        if alerts:
-            content += "<div class='card'><h2>Active Alerts</h2>"
-            for alert in alerts:
-                content += f"<div class='alert alert-{alert.get('type', 'warning')}'>{alert.get('message', '')}</div>"
-            content += "</div>"
-        
-        return content
-    
-    def _generate_incident_content(self, data: Dict[str, Any]) -> str:
-        """Generate incident dashboard content"""
-        stats = data.get("statistics", {})
-        active = data.get("active_incidents", [])
-        
-        content = f"""
-        <div class="card">
-            <h2>Incident Statistics</h2>
-            <div class="metric">
-                <div class="metric-value">{stats.get('total', 0)}</div>
-                <div class="metric-label">Total Incidents</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-healthy">{stats.get('resolved', 0)}</div>
-                <div class="metric-label">Resolved</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-warning">{stats.get('escalated', 0)}</div>
-                <div class="metric-label">Escalated</div>
-            </div>
-        </div>
-        """
-        
-        if active:
-            content += "<div class='card'><h2>Active Incidents</h2>"
-            for incident in active:
-                content += f"""
-                <div class="alert alert-{incident.get('severity', 'warning')}">
-                    <strong>{incident.get('incident_id', 'Unknown')}</strong> - {incident.get('status', 'Unknown')}
-                    <br><small>{incident.get('timestamp', '')}</small>
-                </div>
-                """
-            content += "</div>"
-        
-        return content
-    
-    def _generate_maintenance_content(self, data: Dict[str, Any]) -> str:
-        """Generate maintenance dashboard content"""
-        recent = data.get("recent_maintenance", [])
-        metrics = data.get("maintenance_metrics", {})
-        
-        content = f"""
-        <div class="card">
-            <h2>Maintenance Metrics</h2>
-            <div class="metric">
-                <div class="metric-value">{metrics.get('total_maintenance', 0)}</div>
-                <div class="metric-label">Total Maintenance</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-healthy">{metrics.get('success_rate', 0):.1f}%</div>
-                <div class="metric-label">Success Rate</div>
-            </div>
-        </div>
-        """
-        
-        if recent:
-            content += "<div class='card'><h2>Recent Maintenance</h2>"
-            for maintenance in recent[:5]:
-                status = maintenance.get("execution_summary", {}).get("post_verification", {}).get("verified", False)
-                content += f"""
-                <div class="alert alert-{'warning' if not status else 'info'}">
-                    <strong>{maintenance.get('report_metadata', {}).get('maintenance_type', 'Unknown')}</strong> - 
-                    {'Success' if status else 'Failed'}
-                    <br><small>{maintenance.get('report_metadata', {}).get('generated_at', '')}</small>
-                </div>
-                """
-            content += "</div>"
-        
-        return content
-    
-    def _generate_sla_content(self, data: Dict[str, Any]) -> str:
-        """Generate SLA dashboard content"""
-        current = data.get("current_sla", {})
-        summary = data.get("sla_summary", {})
-        
-        content = f"""
-        <div class="card">
-            <h2>Current SLA Status</h2>
-            <div class="metric">
-                <div class="metric-value status-{'critical' if current.get('availability', {}).get('status') == 'violated' else 'healthy'}">{current.get('availability', {}).get('current', 0):.2f}%</div>
-                <div class="metric-label">Availability</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-{'critical' if current.get('response_time', {}).get('status') == 'violated' else 'healthy'}">{current.get('response_time', {}).get('current', 0):.0f}ms</div>
-                <div class="metric-label">Response Time</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-{'critical' if current.get('error_rate', {}).get('status') == 'violated' else 'healthy'}">{current.get('error_rate', {}).get('current', 0):.2f}%</div>
-                <div class="metric-label">Error Rate</div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h2>SLA Compliance</h2>
-            <div class="metric">
-                <div class="metric-value status-healthy">{summary.get('sla_compliance_rate', 0):.1f}%</div>
-                <div class="metric-label">Compliance Rate</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-warning">{summary.get('total_violations', 0)}</div>
-                <div class="metric-label">Total Violations</div>
-            </div>
-        </div>
-        """
-        
-        return content
-    
-    def _generate_operational_content(self, data: Dict[str, Any]) -> str:
-        """Generate operational overview content"""
-        system = data.get("system_health", {})
-        app = data.get("application_performance", {})
-        incidents = data.get("incidents", {})
-        alerts = data.get("alerts", [])
-        
-        content = f"""
-        <div class="card">
-            <h2>System Overview</h2>
-            <div class="metric">
-                <div class="metric-value status-{system.get('overall_status', 'unknown')}">{system.get('overall_status', 'Unknown').title()}</div>
-                <div class="metric-label">Overall Status</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value">{system.get('cpu_usage', 0):.1f}%</div>
-                <div class="metric-label">CPU</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value">{system.get('memory_usage', 0):.1f}%</div>
-                <div class="metric-label">Memory</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value">{system.get('disk_usage', 0)}%</div>
-                <div class="metric-label">Disk</div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h2>Application Performance</h2>
-            <div class="metric">
-                <div class="metric-value">{app.get('response_time', 0):.0f}ms</div>
-                <div class="metric-label">Response Time</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value">{app.get('error_rate', 0):.2f}%</div>
-                <div class="metric-label">Error Rate</div>
-            </div>
-        </div>
-        
-        <div class="card">
-            <h2>Incident Summary</h2>
-            <div class="metric">
-                <div class="metric-value">{incidents.get('total', 0)}</div>
-                <div class="metric-label">Total</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-healthy">{incidents.get('resolved', 0)}</div>
-                <div class="metric-label">Resolved</div>
-            </div>
-            <div class="metric">
-                <div class="metric-value status-warning">{incidents.get('escalated', 0)}</div>
-                <div class="metric-label">Escalated</div>
-            </div>
-        </div>
-        """
-        
-        if alerts:
-            content += "<div class='card'><h2>Active Alerts</h2>"
-            for alert in alerts[:10]:  # Show top 10 alerts
-                content += f"<div class='alert alert-{alert.get('type', 'warning')}'>{alert.get('message', '')}</div>"
-            content += "</div>"
-        
-        return content
-    
-    def generate_all_dashboards(self):
-        """Generate all dashboard types"""
-        dashboards = {
-            "system_health": self.generate_system_health_dashboard(),
-            "incident": self.generate_incident_dashboard(),
-            "maintenance": self.generate_maintenance_dashboard(),
-            "sla": self.generate_sla_dashboard(),
-            "operational": self.generate_operational_overview()
-        }
+        return "".join(self.render_html_dashboard(dashboard_data, template_name, live))
+    
+    def generate_content_fragment(self, dashboard_data: Dict[str, Any], template_name: str) -> str:
+        """Render only the page's content block, for pushing to live pages"""
+        template = self._get_template(template_name)
+        context = template.new_context({"data": dashboard_data, "dashboard": template_name})
+        return "".join(template.blocks["content"](context))
+    
+    def generate_all_dashboards(self, force: bool = False, workers: Optional[int] = None) -> List[str]:
+        """Generate all dashboard types whose inputs changed; returns the names written"""
+        self.begin_generation()
+        stale = [name for name in DASHBOARD_BUILDERS if force or not self.is_up_to_date(name)]
+        workers = min(self.workers if workers is None else workers, len(stale))
         
-        for name, data in dashboards.items():
-            # Save JSON data
-            json_file = self.output_dir / f"{name}_dashboard.json"
-            with open(json_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            
-            # Generate HTML dashboard
-            html_content = self.generate_html_dashboard(data, name)
-            html_file = self.output_dir / f"{name}_dashboard.html"
-            with open(html_file, 'w') as f:
-                f.write(html_content)
-            
-            logger.info(f"Generated {name} dashboard: {json_file} and {html_file}")
+        try:
+            if workers > 1:
+                # Import incidents once here rather than racing to do it in two workers,
+                # and hand the workers a saved catalog so they do not rescan
+                self._get_incident_store()
+                self.save_state()
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self._worker_args,)) as pool:
+                    for name, inputs in zip(stale, pool.map(_generate_in_worker, stale)):
+                        self.fingerprints[name] = inputs
+                        self._fingerprints_dirty = True
+            else:
+                for name in stale:
+                    self.generate_dashboard(name, force=True)
+        finally:
+            self.save_state()
+        return stale
+    
+    def watch(self, poll_interval: float = 0.5):
+        """Regenerate affected dashboards as new data lands, until interrupted"""
+        logger.info(f"Watching {self.data_dir} for new monitoring data")
+        while True:
+            started = time.monotonic()
+            try:
+                self.generate_all_dashboards()
+            except Exception as e:
+                logger.error(f"Dashboard generation failed: {e}")
+            time.sleep(max(0.0, poll_interval - (time.monotonic() - started)))
 
 def main():
     parser = argparse.ArgumentParser(description="HX Infrastructure Dashboard Generator")
@@ -708,40 +846,53 @@ def main():
                        help="Directory containing monitoring data")
     parser.add_argument("--output-dir", default="/var/www/html",
                        help="Directory to output dashboards")
-    parser.add_argument("--dashboard", choices=["system_health", "incident", "maintenance", "sla", "operational", "all"],
+    parser.add_argument("--state-dir", default="/var/lib/hx-infrastructure/dashboards",
+                       help="Directory for the data catalog and other generator state")
+    parser.add_argument("--incident-store",
+                       help="SQLite incident store to read incidents from when it exists "
+                            "(default: <state-dir>/incidents.db)")
+    parser.add_argument("--dashboard", choices=list(DASHBOARD_BUILDERS) + ["all"],
                        default="all", help="Dashboard type to generate")
+    parser.add_argument("--workers", type=int, default=min(len(DASHBOARD_BUILDERS), os.cpu_count() or 1),
+                       help="Worker processes for building dashboards in parallel (1 = serial)")
+    parser.add_argument("--force", action="store_true",
+                       help="Regenerate even when the inputs are unchanged")
+    parser.add_argument("--watch", action="store_true",
+                       help="Keep running and regenerate dashboards as new data lands")
+    parser.add_argument("--poll-interval", type=float, default=0.5,
+                       help="Seconds between input checks in watch and serve mode")
+    parser.add_argument("--serve", action="store_true",
+                       help="Serve the dashboards over HTTP and push updates to open pages")
+    parser.add_argument("--listen", default="0.0.0.0",
+                       help="Address to listen on in serve mode")
+    parser.add_argument("--port", type=int, default=8765,
+                       help="Port to listen on in serve mode")
     
     args = parser.parse_args()
     
-    generator = DashboardGenerator(args.data_dir, args.output_dir)
-    
-    if args.dashboard == "all":
-        generator.generate_all_dashboards()
-    else:
-        # Generate specific dashboard
-        if args.dashboard == "system_health":
-            data = generator.generate_system_health_dashboard()
-        elif args.dashboard == "incident":
-            data = generator.generate_incident_dashboard()
-        elif args.dashboard == "maintenance":
-            data = generator.generate_maintenance_dashboard()
-        elif args.dashboard == "sla":
-            data = generator.generate_sla_dashboard()
-        elif args.dashboard == "operational":
-            data = generator.generate_operational_overview()
-        
-        # Save JSON and HTML
-        json_file = Path(args.output_dir) / f"{args.dashboard}_dashboard.json"
-        html_file = Path(args.output_dir) / f"{args.dashboard}_dashboard.html"
-        
-        with open(json_file, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        html_content = generator.generate_html_dashboard(data, args.dashboard)
-        with open(html_file, 'w') as f:
-            f.write(html_content)
-        
-        logger.info(f"Generated {args.dashboard} dashboard: {json_file} and {html_file}")
+    generator = DashboardGenerator(args.data_dir, args.output_dir, args.state_dir, args.incident_store,
+                                   args.workers)
+    
+    try:
+        if args.serve:
+            from dashboard_server import DashboardServer
+            try:
+                DashboardServer(generator, args.listen, args.port, args.poll_interval).run()
+            except KeyboardInterrupt:
+                generator.save_state()
+        elif args.watch:
+            try:
+                generator.watch(args.poll_interval)
+            except KeyboardInterrupt:
+                generator.save_state()
+        elif args.dashboard == "all":
+            generator.generate_all_dashboards(args.force)
+        else:
+            generator.begin_generation()
+            generator.generate_dashboard(args.dashboard, args.force)
+            generator.save_state()
+    finally:
+        generator.close()
 
 if __name__ == "__main__":
     main()
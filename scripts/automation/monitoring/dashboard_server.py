@@ -0,0 +1,281 @@
+"""
+HX Infrastructure - Dashboard Server
+Phase 3.4 - Production Operations Automation
+
+Serves the generated dashboards over HTTP and pushes metric and alert updates
+to open pages with server-sent events. Dashboards are regenerated and rendered
+once per change into shared state, however many browsers are connected.
+"""
+
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from html import escape
+from urllib.parse import urlsplit, parse_qs
+from typing import Dict, List, Any, Optional, Set, Tuple
+import logging
+
+from dashboard_generator import DashboardGenerator, DASHBOARD_BUILDERS
+
+logger = logging.getLogger(__name__)
+
+# Keys that change on every build without the dashboard itself changing
+VOLATILE_KEYS = {"generated_at"}
+
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+MAX_REQUEST_LINE = 8192
+
+
+def sse_message(event: str, event_id: str, payload: Dict[str, Any]) -> bytes:
+    """Encode one server-sent event; payloads are single-line JSON"""
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(payload, separators=(',', ':'))}\n\n".encode()
+
+
+def http_response(status: int, content_type: str, body: bytes) -> bytes:
+    head = (f"HTTP/1.1 {status} {STATUS_REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Connection: close\r\n\r\n")
+    return head.encode() + body
+
+
+class DashboardServer:
+    def __init__(self, generator: DashboardGenerator, host: str = "0.0.0.0", port: int = 8765,
+                 poll_interval: float = 1.0, keepalive: float = 15.0, queue_size: int = 64):
+        self.generator = generator
+        self.host = host
+        self.port = port
+        self.poll_interval = poll_interval
+        self.keepalive = keepalive
+        self.queue_size = queue_size
+        # name -> {"version", "data", "json", "html"}; shared by every client
+        self.dashboards = {}
+        self.clients: List[Tuple[Set[str], asyncio.Queue]] = []
+        self.stats = {"refreshes": 0, "renders": 0, "events": 0, "clients": 0}
+        # The generator is not thread-safe; all regeneration runs on one thread
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dashboard-refresh")
+        self._server = None
+        self._stopping = None
+        self._loop = None
+
+    def _load_dashboard(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read a generated dashboard and render its live page and content fragment"""
+        json_file = self.generator.output_dir / f"{name}_dashboard.json"
+        try:
+            with open(json_file, 'rb') as f:
+                body = f.read()
+            data = json.loads(body)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dashboard {name} unavailable: {e}")
+            return None
+        self.stats["renders"] += 1
+        return {
+            "data": data,
+            "json": body,
+            "html": self.generator.generate_html_dashboard(data, name, live=True).encode(),
+            "fragment": self.generator.generate_content_fragment(data, name)
+        }
+
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Regenerate dashboards whose inputs changed and load them; runs on the refresh thread"""
+        self.stats["refreshes"] += 1
+        written = self.generator.generate_all_dashboards()
+        names = [name for name in DASHBOARD_BUILDERS if name in written or name not in self.dashboards]
+        loaded = {}
+        for name in names:
+            dashboard = self._load_dashboard(name)
+            if dashboard is not None:
+                loaded[name] = dashboard
+        return loaded
+
+    def _publish(self, loaded: Dict[str, Dict[str, Any]]):
+        """Swap in new dashboard state and queue one encoded update per change for subscribers"""
+        for name, dashboard in loaded.items():
+            previous = self.dashboards.get(name)
+            dashboard["version"] = previous["version"] + 1 if previous else 1
+            self.dashboards[name] = dashboard
+            if previous is None:
+                continue
+
+            old, new = previous["data"], dashboard["data"]
+            changed = {key: value for key, value in new.items()
+                       if key not in VOLATILE_KEYS and old.get(key) != value}
+            if not changed:
+                continue
+
+            event_id = f"{name}:{dashboard['version']}"
+            generated_at = new.get("generated_at")
+            messages = []
+            alerts = changed.pop("alerts", None)
+            if changed:
+                messages.append(sse_message("metrics", event_id, {
+                    "dashboard": name, "generated_at": generated_at, "changed": changed}))
+            if alerts is not None:
+                messages.append(sse_message("alerts", event_id, {
+                    "dashboard": name, "generated_at": generated_at, "alerts": alerts}))
+            messages.append(sse_message("content", event_id, {
+                "dashboard": name, "generated_at": generated_at, "html": dashboard["fragment"]}))
+
+            for names, queue in list(self.clients):
+                if name not in names:
+                    continue
+                try:
+                    for message in messages:
+                        queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # A client this far behind reconnects and starts from current state
+                    logger.warning("Dropping slow dashboard event subscriber")
+                    self._unsubscribe(names, queue)
+                    self._close_queue(queue)
+            self.stats["events"] += len(messages)
+
+    def _unsubscribe(self, names: Set[str], queue: asyncio.Queue):
+        try:
+            self.clients.remove((names, queue))
+        except ValueError:
+            pass
+
+    @staticmethod
+    def _close_queue(queue: asyncio.Queue):
+        """Discard pending events and tell the client's stream to end"""
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        while not self._stopping.is_set():
+            started = time.monotonic()
+            try:
+                self._publish(await loop.run_in_executor(self._executor, self.refresh))
+            except Exception as e:
+                logger.error(f"Dashboard refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(),
+                                       max(0.0, self.poll_interval - (time.monotonic() - started)))
+            except asyncio.TimeoutError:
+                pass
+
+    def _index(self) -> bytes:
+        links = "".join(f'<li><a href="/{name}">{escape(name.replace("_", " ").title())}</a></li>'
+                        for name in DASHBOARD_BUILDERS if name in self.dashboards)
+        return (f"<!DOCTYPE html><html><head><title>HX Infrastructure Dashboards</title></head>"
+                f"<body><h1>HX Infrastructure Dashboards</h1><ul>{links}</ul></body></html>").encode()
+
+    def _route(self, path: str) -> bytes:
+        """Response for a plain GET; everything is served from the shared state"""
+        name = path.strip("/")
+        if not name:
+            return http_response(200, "text/html; charset=utf-8", self._index())
+        if name == "healthz":
+            return http_response(200, "application/json", json.dumps(
+                dict(self.stats, dashboards={n: d["version"] for n, d in self.dashboards.items()})).encode())
+
+        content_type, key = "text/html; charset=utf-8", "html"
+        if name.endswith("_dashboard.json"):
+            name, content_type, key = name[:-len("_dashboard.json")], "application/json", "json"
+        elif name.endswith("_dashboard.html"):
+            name = name[:-len("_dashboard.html")]
+        dashboard = self.dashboards.get(name)
+        if dashboard is None:
+            return http_response(404, "text/plain", b"Dashboard not found\n")
+        return http_response(200, content_type, dashboard[key])
+
+    async def _stream_events(self, writer: asyncio.StreamWriter, query: Dict[str, List[str]],
+                             last_event_id: Optional[str]):
+        names = set(query.get("dashboard", [])) or set(DASHBOARD_BUILDERS)
+        unknown = names - set(DASHBOARD_BUILDERS)
+        if unknown:
+            writer.write(http_response(400, "text/plain", f"Unknown dashboard: {', '.join(sorted(unknown))}\n".encode()))
+            return
+
+        queue = asyncio.Queue(self.queue_size)
+        subscription = (names, queue)
+        self.clients.append(subscription)
+        self.stats["clients"] += 1
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n"
+                         b"retry: 3000\n\n")
+            # Bring a (re)connecting page up to date unless it has already seen this version
+            for name in sorted(names):
+                dashboard = self.dashboards.get(name)
+                if dashboard and last_event_id != f"{name}:{dashboard['version']}":
+                    data = dashboard["data"]
+                    writer.write(sse_message("content", f"{name}:{dashboard['version']}", {
+                        "dashboard": name, "generated_at": data.get("generated_at"), "html": dashboard["fragment"]}))
+            await writer.drain()
+
+            while not self._stopping.is_set():
+                try:
+                    message = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                writer.write(message)
+                await writer.drain()
+        finally:
+            self._unsubscribe(names, queue)
+            self.stats["clients"] -= 1
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            parts = request_line.decode("latin-1").split()
+            if len(request_line) > MAX_REQUEST_LINE or len(parts) != 3:
+                writer.write(http_response(400, "text/plain", b"Bad request\n"))
+            elif parts[0] != "GET":
+                writer.write(http_response(405, "text/plain", b"Only GET is supported\n"))
+            else:
+                url = urlsplit(parts[1])
+                if url.path == "/events":
+                    await self._stream_events(writer, parse_qs(url.query), headers.get("last-event-id"))
+                else:
+                    writer.write(self._route(url.path))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        """Serve until stop() is called"""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        # Have every dashboard in memory before accepting the first request
+        self._publish(await self._loop.run_in_executor(self._executor, self.refresh))
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving dashboards on http://{self.host}:{self.port}/")
+
+        poller = asyncio.create_task(self._poll())
+        try:
+            await self._stopping.wait()
+        finally:
+            self._server.close()
+            for _, queue in list(self.clients):
+                self._close_queue(queue)
+            await poller
+            await self._server.wait_closed()
+            self._executor.shutdown(wait=True)
+            self.generator.save_state()
+
+    def stop(self):
+        """Stop serving; safe to call from another thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    def run(self):
+        asyncio.run(self.serve())
@@ -0,0 +1,140 @@
+"""
+HX Infrastructure - Monitoring Data Catalog
+Phase 3.4 - Production Operations Automation
+
+Persistent index of monitoring data files so dashboards do not re-glob and
+re-stat the whole data directory on every lookup
+"""
+
+import json
+import os
+import time
+import fnmatch
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION = 2
+
+# Directory mtimes this close to the scan time are not trusted, since a file
+# created in the same clock tick would not change the mtime again
+RACY_WINDOW_SECONDS = 2.0
+
+
+class DataCatalog:
+    def __init__(self, data_dir: Path, catalog_file: Optional[Path] = None):
+        self.data_dir = Path(data_dir)
+        # Without a catalog file the index only lives for this process
+        self.catalog_file = Path(catalog_file) if catalog_file else None
+        self.directories = {}
+        self._fresh = set()
+        self._pattern_index = {}
+        self._dirty = False
+        self.stats = {"directory_scans": 0, "file_stats": 0}
+        self._load()
+
+    def _load(self):
+        """Load the catalog saved by a previous run"""
+        if self.catalog_file is None:
+            return
+        try:
+            with open(self.catalog_file, 'r') as f:
+                saved = json.load(f)
+            if saved.get("version") == CATALOG_VERSION:
+                self.directories = saved.get("directories", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable data catalog {self.catalog_file}: {e}")
+
+    def save(self):
+        """Persist the catalog if anything changed; a read-only data dir is not an error"""
+        if not self._dirty or self.catalog_file is None:
+            return
+        try:
+            tmp_file = self.catalog_file.with_name(self.catalog_file.name + ".tmp")
+            with open(tmp_file, 'w') as f:
+                f.write(json.dumps({"version": CATALOG_VERSION, "directories": self.directories}))
+            os.replace(tmp_file, self.catalog_file)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save data catalog {self.catalog_file}: {e}")
+
+    def begin_generation(self):
+        """Re-check directories for new files on the next lookup"""
+        self._fresh.clear()
+
+    def _refresh_directory(self, rel_dir: str):
+        """Bring one directory's entries up to date, statting only new or replaced files.
+
+        Each file is recorded as [ctime, inode]. The inode comes free with the
+        directory listing, so a file rewritten under a known name (atomically,
+        as write_atomic and Ansible's copy do) is noticed and re-statted.
+        """
+        if rel_dir in self._fresh:
+            return
+        self._fresh.add(rel_dir)
+
+        directory = self.data_dir / rel_dir
+        try:
+            dir_mtime = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            if self.directories.pop(rel_dir, None) is not None:
+                self._dirty = True
+                self._invalidate(rel_dir)
+            return
+
+        entry = self.directories.get(rel_dir)
+        if entry is not None and entry.get("mtime_ns") == dir_mtime:
+            return
+
+        self.stats["directory_scans"] += 1
+        known = entry.get("files", {}) if entry else {}
+        files = {}
+        with os.scandir(directory) as scan:
+            for dir_entry in scan:
+                if not dir_entry.is_file() or dir_entry.name.startswith('.'):
+                    continue
+                signature = known.get(dir_entry.name)
+                if signature is not None and signature[1] == dir_entry.inode():
+                    files[dir_entry.name] = signature
+                    continue
+                try:
+                    stat = dir_entry.stat()
+                except FileNotFoundError:
+                    continue
+                self.stats["file_stats"] += 1
+                files[dir_entry.name] = [stat.st_ctime, stat.st_ino]
+
+        racy = time.time() - dir_mtime / 1e9 < RACY_WINDOW_SECONDS
+        refreshed = {"mtime_ns": None if racy else dir_mtime, "files": files}
+        if refreshed != entry:
+            self.directories[rel_dir] = refreshed
+            self._dirty = True
+            self._invalidate(rel_dir)
+
+    def _invalidate(self, rel_dir: str):
+        for pattern in [p for p in self._pattern_index if os.path.dirname(p) == rel_dir]:
+            del self._pattern_index[pattern]
+
+    def names(self, pattern: str) -> List[str]:
+        """Names of files matching a glob pattern relative to the data dir, newest first"""
+        rel_dir, name_pattern = os.path.split(pattern)
+        self._refresh_directory(rel_dir)
+        if pattern not in self._pattern_index:
+            files = self.directories.get(rel_dir, {}).get("files", {})
+            names = fnmatch.filter(files, name_pattern)
+            names.sort(key=lambda name: files[name][0], reverse=True)
+            self._pattern_index[pattern] = names
+        return self._pattern_index[pattern]
+
+    def files(self, pattern: str, limit: Optional[int] = None) -> List[Path]:
+        """Paths of the newest `limit` files matching a glob pattern"""
+        directory = self.data_dir / os.path.dirname(pattern)
+        return [directory / name for name in self.names(pattern)[:limit]]
+
+    def latest(self, pattern: str) -> Optional[Path]:
+        files = self.files(pattern, 1)
+        return files[0] if files else None
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+HX Infrastructure - Fleet Health Sweep
+Phase 3.4 - Production Operations Automation
+
+Probes every inventory host from the control node concurrently and
+aggregates the results into a single fleet report
+"""
+
+import json
+import ssl
+import sys
+import time
+import asyncio
+import argparse
+import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlsplit
+import logging
+
+import yaml
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+
+def merge_vars(base: Dict[str, Any], override: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    merged = dict(base)
+    if isinstance(override, dict):
+        merged.update(override)
+    return merged
+
+
+def vars_files(roots: List[Path], kind: str, name: str) -> List[Path]:
+    """group_vars or host_vars files of one group or host, lowest precedence first"""
+    paths = []
+    for root in roots:
+        directory = root / kind
+        paths.extend(directory / f"{name}{suffix}" for suffix in ('', '.yml', '.yaml')
+                     if (directory / f"{name}{suffix}").is_file())
+        if (directory / name).is_dir():
+            paths.extend(sorted(path for path in (directory / name).rglob('*')
+                                if path.suffix in ('.yml', '.yaml') and path.is_file()))
+    return paths
+
+
+def load_vars_file(path: Path) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        data = yaml.safe_load(f)
+    return data if isinstance(data, dict) else {}
+
+
+def load_inventory(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Flatten a YAML inventory into host -> {'vars', 'groups'}
+
+    Variables are layered as Ansible does: each group's inline vars and then
+    its group_vars files, parents before children, then the host's inline vars
+    and host_vars files. group_vars and host_vars are read next to the
+    inventory's directory (shared between environments here) and next to the
+    inventory file, in increasing precedence.
+    """
+    path = Path(path)
+    with open(path, 'r') as f:
+        inventory = yaml.safe_load(f) or {}
+
+    inline_group_vars = {}
+    inline_host_vars = {}
+    host_groups = {}
+
+    def walk(group_name: str, group: Dict[str, Any], parents: List[str]):
+        group = group or {}
+        inline_group_vars[group_name] = merge_vars(inline_group_vars.get(group_name, {}), group.get('vars'))
+        groups = parents + [group_name]
+        for host_name, host_vars in (group.get('hosts') or {}).items():
+            inline_host_vars[host_name] = merge_vars(inline_host_vars.get(host_name, {}), host_vars)
+            memberships = host_groups.setdefault(host_name, {})
+            for depth, ancestor in enumerate(groups):
+                memberships[ancestor] = max(memberships.get(ancestor, 0), depth)
+        for child_name, child in (group.get('children') or {}).items():
+            walk(child_name, child, groups)
+
+    for group_name, group in inventory.items():
+        walk(group_name, group, [])
+
+    roots = [path.parent.parent, path.parent]
+    file_vars = {}
+
+    def layer(kind: str, name: str) -> Dict[str, Any]:
+        if (kind, name) not in file_vars:
+            layered = {}
+            for vars_path in vars_files(roots, kind, name):
+                layered = merge_vars(layered, load_vars_file(vars_path))
+            file_vars[(kind, name)] = layered
+        return file_vars[(kind, name)]
+
+    hosts = {}
+    for host_name, memberships in host_groups.items():
+        # Groups in the order they were first seen, stably sorted by depth
+        groups = sorted(memberships, key=lambda group: memberships[group])
+        host_vars = {}
+        for group in groups:
+            host_vars = merge_vars(host_vars, inline_group_vars.get(group))
+            host_vars = merge_vars(host_vars, layer('group_vars', group))
+        host_vars = merge_vars(host_vars, inline_host_vars.get(host_name))
+        host_vars = merge_vars(host_vars, layer('host_vars', host_name))
+        hosts[host_name] = {'vars': host_vars, 'groups': groups}
+    return hosts
+
+
+class FleetHealthSweep:
+    def __init__(self, concurrency: int = 64, host_deadline: float = 15.0,
+                 probe_timeout: float = 5.0, group_checks: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        self.concurrency = concurrency
+        self.host_deadline = host_deadline
+        self.probe_timeout = probe_timeout
+        self.group_checks = group_checks or {}
+
+    def services_for_host(self, host: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Services from the host's health_checks vars plus any configured per group
+
+        health_checks is either a list of services or a mapping with a
+        'services' list; entries without a port, http or tls probe are skipped.
+        """
+        health_checks = host['vars'].get('health_checks') or []
+        if isinstance(health_checks, dict):
+            health_checks = health_checks.get('services') or []
+        services = [service for service in health_checks if isinstance(service, dict)]
+        for group in host['groups']:
+            services.extend(self.group_checks.get(group, []))
+        return services
+
+    async def tcp_probe(self, address: str, port: int) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), self.probe_timeout)
+            latency_ms = (time.perf_counter() - started) * 1000
+            writer.close()
+            return {'port': port, 'accessible': True, 'passed': True, 'response_time_ms': round(latency_ms, 2)}
+        except (OSError, asyncio.TimeoutError) as e:
+            return {'port': port, 'accessible': False, 'passed': False, 'error': str(e) or 'timeout'}
+
+    async def http_probe(self, url: str, expected_status: int = 200,
+                         expected_body: Optional[str] = None, verify: bool = True) -> Dict[str, Any]:
+        """Minimal HTTP/1.1 GET so hundreds of probes can share one event loop"""
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        context = None
+        if parts.scheme == 'https':
+            context = ssl.create_default_context()
+            if not verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+
+        started = time.perf_counter()
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(parts.hostname, port, ssl=context), self.probe_timeout
+            )
+            try:
+                path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+                writer.write(
+                    f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+                    f'User-Agent: hx-fleet-health-sweep\r\nConnection: close\r\n\r\n'.encode('ascii')
+                )
+                await writer.drain()
+                response = await asyncio.wait_for(reader.read(), self.probe_timeout)
+            finally:
+                writer.close()
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            head, _, body = response.partition(b'\r\n\r\n')
+            status_code = int(head.split(b' ', 2)[1])
+            body_ok = expected_body is None or expected_body.encode('utf-8') in body
+            result = {
+                'url': url,
+                'status_code': status_code,
+                'passed': status_code == expected_status and body_ok,
+                'response_time_ms': round(latency_ms, 2)
+            }
+            if not body_ok:
+                result['error'] = f"Response body does not contain {expected_body!r}"
+            return result
+
+        except (OSError, ValueError, IndexError, asyncio.TimeoutError) as e:
+            return {'url': url, 'passed': False, 'error': str(e) or 'timeout'}
+
+    async def tls_probe(self, address: str, port: int = 443, server_name: Optional[str] = None,
+                        verify: bool = True) -> Dict[str, Any]:
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+        started = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(address, port, ssl=context, server_hostname=server_name or address),
+                self.probe_timeout
+            )
+            handshake_ms = (time.perf_counter() - started) * 1000
+            writer.close()
+            return {'port': port, 'passed': True, 'handshake_time_ms': round(handshake_ms, 2)}
+        except (OSError, asyncio.TimeoutError) as e:
+            return {'port': port, 'passed': False, 'error': str(e) or 'timeout'}
+
+    async def sweep_host(self, name: str, host: Dict[str, Any]) -> Dict[str, Any]:
+        """Run every probe configured for one host concurrently"""
+        address = host['vars'].get('ansible_host', name)
+        probes = {}
+        for service in self.services_for_host(host):
+            service_name = service.get('name')
+            if not service_name:
+                continue
+            if 'port' in service:
+                probes[f'port_{service_name}_{service["port"]}'] = self.tcp_probe(address, service['port'])
+            if 'http' in service:
+                http = service['http']
+                url = http.get('url') or f"http://{address}:{service.get('port', 80)}{http.get('path', '/')}"
+                probes[f'http_{service_name}'] = self.http_probe(
+                    url, http.get('expected_status', 200), http.get('expected_body'), http.get('verify', True)
+                )
+            if 'tls' in service:
+                tls = service['tls']
+                probes[f'tls_{service_name}'] = self.tls_probe(
+                    address, tls.get('port', 443), tls.get('server_name'), tls.get('verify', True)
+                )
+
+        outcomes = await asyncio.gather(*probes.values())
+        return dict(zip(probes.keys(), outcomes))
+
+    async def _sweep_host_bounded(self, semaphore: asyncio.Semaphore, name: str,
+                                  host: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            started = time.perf_counter()
+            report = {
+                'address': host['vars'].get('ansible_host', name),
+                'groups': host['groups']
+            }
+            try:
+                checks = await asyncio.wait_for(self.sweep_host(name, host), self.host_deadline)
+                report['checks'] = checks
+                # Hosts without any configured probes are reported as unchecked
+                report['healthy'] = all(check['passed'] for check in checks.values()) if checks else None
+            except asyncio.TimeoutError:
+                report['checks'] = {}
+                report['healthy'] = False
+                report['error'] = f"Host deadline of {self.host_deadline}s exceeded"
+            report['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+            return report
+
+    async def sweep(self, hosts: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Sweep all hosts with at most `concurrency` in flight"""
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        names = sorted(hosts)
+        reports = await asyncio.gather(*(self._sweep_host_bounded(semaphore, name, hosts[name]) for name in names))
+        host_reports = dict(zip(names, reports))
+
+        checks = [check for report in reports for check in report['checks'].values()]
+        return {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            'summary': {
+                'hosts': len(reports),
+                'healthy_hosts': sum(1 for report in reports if report['healthy'] is True),
+                'unhealthy_hosts': sum(1 for report in reports if report['healthy'] is False),
+                'unchecked_hosts': sum(1 for report in reports if report['healthy'] is None),
+                'deadline_exceeded': sum(1 for report in reports if 'error' in report),
+                'total_checks': len(checks),
+                'passed': sum(1 for check in checks if check['passed']),
+                'failed': sum(1 for check in checks if not check['passed'])
+            },
+            'hosts': host_reports
+        }
+
+    def run(self, hosts: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        return asyncio.run(self.sweep(hosts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HX Infrastructure Fleet Health Sweep")
+    parser.add_argument("--inventory", action="append",
+                       help="Inventory file to sweep (repeatable, default: inventories/*/hosts.yml)")
+    parser.add_argument("--limit", action="append", help="Only sweep hosts in this group (repeatable)")
+    parser.add_argument("--checks", help="YAML file mapping group names to health_checks service lists")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum hosts probed at once")
+    parser.add_argument("--host-deadline", type=float, default=15.0, help="Seconds allowed per host")
+    parser.add_argument("--timeout", type=float, default=5.0, help="Seconds allowed per probe")
+    parser.add_argument("--output", help="Output file for the fleet report (JSON)")
+
+    args = parser.parse_args()
+
+    inventories = [Path(path) for path in args.inventory] if args.inventory else \
+        sorted(PROJECT_ROOT.glob('inventories/*/hosts.yml'))
+
+    hosts = {}
+    for inventory in inventories:
+        for name, host in load_inventory(inventory).items():
+            if args.limit and not set(args.limit) & set(host['groups']):
+                continue
+            hosts[name] = host
+    logger.info(f"Sweeping {len(hosts)} hosts from {len(inventories)} inventories")
+
+    group_checks = {}
+    if args.checks:
+        with open(args.checks, 'r') as f:
+            group_checks = yaml.safe_load(f) or {}
+
+    sweeper = FleetHealthSweep(args.concurrency, args.host_deadline, args.timeout, group_checks)
+    report = sweeper.run(hosts)
+    report['inventories'] = [str(inventory) for inventory in inventories]
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Fleet report saved to: {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    summary = report['summary']
+    logger.info(f"{summary['healthy_hosts']}/{summary['hosts']} hosts healthy, "
+                f"{summary['unchecked_hosts']} without checks, "
+                f"{summary['failed']} of {summary['total_checks']} checks failed")
+    sys.exit(0 if summary['unhealthy_hosts'] == 0 else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+HX Infrastructure - Incident Store
+Phase 3.4 - Production Operations Automation
+
+SQLite copy of incident_database.json with indexes for the dashboard's trend
+and rate queries
+"""
+
+import json
+import os
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    incident_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    status TEXT,
+    remediation_attempted INTEGER NOT NULL,
+    remediation_successful INTEGER NOT NULL,
+    escalated INTEGER NOT NULL,
+    document TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_created_at ON incidents (created_at);
+CREATE INDEX IF NOT EXISTS idx_incidents_created_date ON incidents (substr(created_at, 1, 10));
+CREATE INDEX IF NOT EXISTS idx_incidents_status ON incidents (status);
+CREATE INDEX IF NOT EXISTS idx_incidents_remediation ON incidents (remediation_successful, remediation_attempted);
+CREATE INDEX IF NOT EXISTS idx_incidents_escalated ON incidents (escalated);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+UPSERT_INCIDENT = """
+INSERT INTO incidents (incident_id, created_at, status, remediation_attempted,
+                       remediation_successful, escalated, document)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (incident_id) DO UPDATE SET
+    created_at = excluded.created_at,
+    status = excluded.status,
+    remediation_attempted = excluded.remediation_attempted,
+    remediation_successful = excluded.remediation_successful,
+    escalated = excluded.escalated,
+    document = excluded.document
+"""
+
+
+def as_flag(value: Any) -> int:
+    """Incident flags are rendered by Ansible and may arrive as strings"""
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in ("true", "yes", "1") else 0
+    return 1 if value else 0
+
+
+def incident_row(incident: Dict[str, Any]) -> tuple:
+    metadata = incident.get("incident_metadata", {})
+    remediation = incident.get("remediation", {})
+    created_at = metadata.get("created_at", "")
+    # Incidents without an ID still need a stable key for re-imports
+    incident_id = metadata.get("incident_id") or f"{created_at}/{metadata.get('hostname', '')}"
+    return (
+        incident_id,
+        created_at,
+        metadata.get("status"),
+        as_flag(remediation.get("attempted")),
+        as_flag(remediation.get("successful")),
+        as_flag(incident.get("escalation", {}).get("escalated")),
+        json.dumps(incident, sort_keys=True)
+    )
+
+
+class IncidentStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def upsert(self, incidents: Iterable[Dict[str, Any]]) -> int:
+        rows = [incident_row(incident) for incident in incidents]
+        with self.conn:
+            self.conn.executemany(UPSERT_INCIDENT, rows)
+        return len(rows)
+
+    def get_metadata(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_metadata(self, key: str, value: str):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO metadata (key, value) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (key, value)
+            )
+
+    def import_database(self, incident_db: Dict[str, Any], source_signature: Optional[List[int]] = None) -> int:
+        """Upsert every incident of a parsed incident_database.json"""
+        count = self.upsert(incident_db.get("incidents", []))
+        if source_signature is not None:
+            self.set_metadata("source_signature", json.dumps(source_signature))
+        return count
+
+    def import_json(self, json_file: Path) -> int:
+        with open(json_file, 'r') as f:
+            stat = os.fstat(f.fileno())
+            incident_db = json.load(f)
+        return self.import_database(incident_db, [stat.st_mtime_ns, stat.st_size])
+
+    def is_current(self, source_signature: Optional[List[int]]) -> bool:
+        """Whether the last import came from this version of the JSON file"""
+        return self.get_metadata("source_signature") == json.dumps(source_signature)
+
+    def statistics(self) -> Dict[str, int]:
+        total, resolved, escalated = self.conn.execute(
+            "SELECT (SELECT COUNT(*) FROM incidents), "
+            "(SELECT COUNT(*) FROM incidents WHERE remediation_successful = 1), "
+            "(SELECT COUNT(*) FROM incidents WHERE escalated = 1)"
+        ).fetchone()
+        return {"total": total, "resolved": resolved, "escalated": escalated}
+
+    def status_counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute(
+            "SELECT status, COUNT(*) FROM incidents GROUP BY status"
+        ).fetchall())
+
+    def daily_counts(self, since: Optional[str] = None) -> Dict[str, int]:
+        """Incidents per created_at date, optionally from an ISO date onwards"""
+        query = "SELECT substr(created_at, 1, 10), COUNT(*) FROM incidents"
+        params = ()
+        if since is not None:
+            query += " WHERE created_at >= ?"
+            params = (since,)
+        query += " GROUP BY substr(created_at, 1, 10)"
+        return dict(self.conn.execute(query, params).fetchall())
+
+    def incident_trends(self) -> Dict[str, Any]:
+        daily_counts = self.daily_counts()
+        total = sum(daily_counts.values())
+        return {
+            "daily_incidents": daily_counts,
+            "total_incidents": total,
+            "avg_daily": total / len(daily_counts) if daily_counts else 0
+        }
+
+    def response_metrics(self) -> Dict[str, float]:
+        statistics = self.statistics()
+        total = statistics["total"]
+        (auto_resolved,) = self.conn.execute(
+            "SELECT COUNT(*) FROM incidents WHERE remediation_successful = 1 AND remediation_attempted = 1"
+        ).fetchone()
+        return {
+            "resolution_rate": statistics["resolved"] / total * 100 if total else 0,
+            "escalation_rate": statistics["escalated"] / total * 100 if total else 0,
+            "auto_resolution_rate": auto_resolved / total * 100 if total else 0
+        }
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return [json.loads(document) for (document,) in self.conn.execute(
+            "SELECT document FROM incidents ORDER BY created_at DESC LIMIT ?", (limit,)
+        )]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HX Infrastructure Incident Store")
+    parser.add_argument("--db", default="/var/lib/hx-infrastructure/dashboards/incidents.db",
+                       help="Incident store database file")
+    parser.add_argument("--import", dest="import_file",
+                       help="incident_database.json to import (incidents are upserted by ID)")
+    parser.add_argument("--stats", action="store_true", help="Print incident statistics")
+
+    args = parser.parse_args()
+
+    Path(args.db).parent.mkdir(parents=True, exist_ok=True)
+    store = IncidentStore(Path(args.db))
+    try:
+        if args.import_file:
+            count = store.import_json(Path(args.import_file))
+            logger.info(f"Imported {count} incidents from {args.import_file} into {args.db}")
+        if args.stats:
+            print(json.dumps({
+                "statistics": store.statistics(),
+                "status": store.status_counts(),
+                "response_metrics": store.response_metrics()
+            }, indent=2))
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
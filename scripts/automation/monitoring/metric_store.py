@@ -0,0 +1,142 @@
+"""
+HX Infrastructure - Columnar Metric Store
+Phase 3.4 - Production Operations Automation
+
+Append-only time series kept as one flat float64 file per column, so trend
+and summary reads touch only the rows they need instead of one JSON file
+per sample
+"""
+
+import os
+import math
+import mmap
+import bisect
+from array import array
+from pathlib import Path
+from typing import Dict, List, Iterable, Tuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_COLUMN = "timestamp"
+ITEM_SIZE = array('d').itemsize
+
+AGGREGATES = {
+    "mean": lambda values: math.fsum(values) / len(values),
+    "min": min,
+    "max": max,
+    "last": lambda values: values[-1]
+}
+
+
+def finite(values: Iterable[float]) -> array:
+    """Drop missing (NaN) samples from a column"""
+    return array('d', filter(math.isfinite, values))
+
+
+class MetricStore:
+    def __init__(self, path: Path, columns: List[str]):
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._length = self._repair()
+
+    def _column_file(self, column: str) -> Path:
+        return self.path / f"{column}.f64"
+
+    def _repair(self) -> int:
+        """Truncate columns left longer than the others by an interrupted append"""
+        sizes = {}
+        for column in [TIMESTAMP_COLUMN] + self.columns:
+            column_file = self._column_file(column)
+            column_file.touch(exist_ok=True)
+            sizes[column] = column_file.stat().st_size
+        length = min(sizes.values()) // ITEM_SIZE
+        for column, size in sizes.items():
+            if size != length * ITEM_SIZE:
+                logger.warning(f"Truncating column {column} in {self.path} to {length} rows")
+                os.truncate(self._column_file(column), length * ITEM_SIZE)
+        return length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def last_timestamp(self) -> Optional[float]:
+        if not self._length:
+            return None
+        return self._read_column(TIMESTAMP_COLUMN, self._length - 1, self._length)[0]
+
+    def append(self, timestamp: float, values: Dict[str, float]):
+        self.extend([(timestamp, values)])
+
+    def extend(self, rows: Iterable[Tuple[float, Dict[str, float]]]):
+        """Append rows in timestamp order; missing values are stored as NaN"""
+        rows = list(rows)
+        if not rows:
+            return
+        last = self.last_timestamp()
+        for timestamp, _ in rows:
+            if last is not None and timestamp < last:
+                raise ValueError(f"Timestamp {timestamp} is older than the last stored sample {last}")
+            last = timestamp
+
+        buffers = {TIMESTAMP_COLUMN: array('d', (float(timestamp) for timestamp, _ in rows))}
+        for column in self.columns:
+            buffers[column] = array('d', (float(values.get(column, math.nan)) for _, values in rows))
+        # Timestamps go last so a crash never exposes a row without its values
+        for column in self.columns + [TIMESTAMP_COLUMN]:
+            with open(self._column_file(column), 'ab') as f:
+                buffers[column].tofile(f)
+        self._length += len(rows)
+
+    def _read_column(self, column: str, start: int, end: int) -> array:
+        values = array('d')
+        if end > start:
+            with open(self._column_file(column), 'rb') as f:
+                f.seek(start * ITEM_SIZE)
+                values.fromfile(f, end - start)
+        return values
+
+    def _index_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        """Row indexes for [start, end), found by binary search over the mapped timestamps"""
+        if not self._length:
+            return 0, 0
+        with open(self._column_file(TIMESTAMP_COLUMN), 'rb') as f:
+            with mmap.mmap(f.fileno(), self._length * ITEM_SIZE, access=mmap.ACCESS_READ) as mapped:
+                timestamps = memoryview(mapped).cast('d')
+                try:
+                    first = 0 if start is None else bisect.bisect_left(timestamps, start)
+                    last = self._length if end is None else bisect.bisect_left(timestamps, end)
+                finally:
+                    timestamps.release()
+        return first, last
+
+    def _read_rows(self, first: int, last: int) -> Dict[str, array]:
+        return {column: self._read_column(column, first, last) for column in [TIMESTAMP_COLUMN] + self.columns}
+
+    def range(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, array]:
+        """All columns for samples with start <= timestamp < end, oldest first"""
+        return self._read_rows(*self._index_range(start, end))
+
+    def tail(self, count: int) -> Dict[str, array]:
+        """All columns for the most recent `count` samples, oldest first"""
+        return self._read_rows(max(0, self._length - count), self._length)
+
+    def downsample(self, bucket_seconds: float, start: Optional[float] = None, end: Optional[float] = None,
+                   aggregate: str = "mean") -> Dict[str, array]:
+        """Aggregate each column into fixed buckets; buckets without samples are omitted"""
+        reduce = AGGREGATES[aggregate]
+        rows = self.range(start, end)
+        timestamps = rows[TIMESTAMP_COLUMN]
+        result = {column: array('d') for column in [TIMESTAMP_COLUMN] + self.columns}
+
+        first = 0
+        while first < len(timestamps):
+            bucket = timestamps[first] - timestamps[first] % bucket_seconds
+            last = bisect.bisect_left(timestamps, bucket + bucket_seconds, first)
+            result[TIMESTAMP_COLUMN].append(bucket)
+            for column in self.columns:
+                values = finite(rows[column][first:last])
+                result[column].append(reduce(values) if values else math.nan)
+            first = last
+        return result
@@ -0,0 +1,96 @@
+"""
+HX Infrastructure - Rolling Window Statistics
+Phase 3.4 - Production Operations Automation
+
+Percentiles, EWMA, rate of change and extrema over time windows of a
+metric series, in a single sort per window
+"""
+
+import math
+import bisect
+from typing import Dict, List, Any, Optional, Sequence
+
+# Standard dashboard windows in seconds
+WINDOWS = {"1h": 3600, "24h": 86400, "7d": 604800}
+
+PERCENTILES = [50, 95, 99]
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Linearly interpolated percentile of already sorted values"""
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def ewma(values: Sequence[float], alpha: float = 0.3) -> Optional[float]:
+    """Exponentially weighted moving average, oldest value first"""
+    average = None
+    for value in values:
+        average = value if average is None else alpha * value + (1 - alpha) * average
+    return average
+
+
+def rate_of_change(timestamps: Sequence[float], values: Sequence[float]) -> Optional[float]:
+    """Least-squares slope per hour; less sensitive to a noisy first or last sample"""
+    count = len(values)
+    if count < 2:
+        return None
+    mean_t = math.fsum(timestamps) / count
+    mean_v = math.fsum(values) / count
+    variance = math.fsum((t - mean_t) ** 2 for t in timestamps)
+    if not variance:
+        return None
+    covariance = math.fsum((t - mean_t) * (v - mean_v) for t, v in zip(timestamps, values))
+    return covariance / variance * 3600
+
+
+def summarize(values: Sequence[float], precision: int = 3) -> Dict[str, Any]:
+    """Count, mean, extrema and percentiles of a sample, ignoring missing (NaN) values"""
+    ordered = sorted(value for value in values if value == value)
+    if not ordered:
+        return {"count": 0}
+    summary = {
+        "count": len(ordered),
+        "mean": round(math.fsum(ordered) / len(ordered), precision),
+        "min": ordered[0],
+        "max": ordered[-1]
+    }
+    for q in PERCENTILES:
+        summary[f"p{q}"] = round(percentile(ordered, q), precision)
+    return summary
+
+
+def window_stats(timestamps: Sequence[float], values: Sequence[float], seconds: float,
+                 end: Optional[float] = None, alpha: float = 0.3, precision: int = 3) -> Dict[str, Any]:
+    """Statistics for samples in (end - seconds, end]; timestamps must be ascending"""
+    if not timestamps:
+        return {"count": 0}
+    end = timestamps[-1] if end is None else end
+    first = bisect.bisect_right(timestamps, end - seconds)
+    last = bisect.bisect_right(timestamps, end)
+    window = [(t, v) for t, v in zip(timestamps[first:last], values[first:last]) if v == v]
+
+    stats = summarize([v for _, v in window], precision)
+    if window:
+        stats["ewma"] = round(ewma([v for _, v in window], alpha), precision)
+        rate = rate_of_change([t for t, _ in window], [v for _, v in window])
+        stats["rate_per_hour"] = round(rate, precision) if rate is not None else None
+    return stats
+
+
+def rolling_windows(timestamps: Sequence[float], values: Sequence[float],
+                    windows: Optional[Dict[str, float]] = None, end: Optional[float] = None) -> Dict[str, Any]:
+    """window_stats for each named window, all ending at the same time"""
+    windows = windows or WINDOWS
+    return {name: window_stats(timestamps, values, seconds, end) for name, seconds in windows.items()}
+
+
+def window_rows(stats_by_metric: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Flatten {metric: {window: stats}} into table rows for the HTML dashboards"""
+    return [dict(stats, metric=metric, window=window)
+            for metric, by_window in stats_by_metric.items()
+            for window, stats in by_window.items()]
@@ -6,16 +6,18 @@ Comprehensive variable mapping and consistency analysis
 """
 
 import os
-import yaml
 import json
 import re
 from pathlib import Path
 from collections import defaultdict, Counter
 from datetime import datetime
 
+from project_index import ProjectIndex
+
 class VariableAnalyzer:
-    def __init__(self, base_path):
+    def __init__(self, base_path, index=None):
         self.base_path = Path(base_path)
+        self.index = index or ProjectIndex(base_path)
         self.variables = defaultdict(list)
         self.variable_sources = defaultdict(set)
         self.naming_issues = []
@@ -23,21 +25,15 @@ class VariableAnalyzer:
         
     def scan_yaml_files(self):
         """Scan all YAML files for variable definitions"""
-        yaml_files = []
-        
-        # Scan common directories
-        for directory in ['group_vars', 'host_vars', 'vars', 'roles']:
-            dir_path = self.base_path / directory
-            if dir_path.exists():
-                yaml_files.extend(dir_path.rglob('*.yml'))
-                yaml_files.extend(dir_path.rglob('*.yaml'))
+        # Common variable directories, from the shared index
+        yaml_files = self.index.yaml_files(under=[self.base_path / directory
+                                                  for directory in ['group_vars', 'host_vars', 'vars', 'roles']])
         
         for yaml_file in yaml_files:
             try:
-                with open(yaml_file, 'r') as f:
-                    content = yaml.safe_load(f)
-                    if isinstance(content, dict):
-                        self.extract_variables(content, str(yaml_file.relative_to(self.base_path)))
+                content = self.index.load(yaml_file)
+                if isinstance(content, dict):
+                    self.extract_variables(content, str(yaml_file.relative_to(self.base_path)))
             except Exception as e:
                 print(f"Error processing {yaml_file}: {e}")
     
@@ -225,6 +221,7 @@ class VariableAnalyzer:
 def main():
     analyzer = VariableAnalyzer('/home/ubuntu/hx-infrastructure-ansible')
     report = analyzer.generate_report()
+    analyzer.index.save()
     
     # Save detailed report
     with open('/home/ubuntu/hx-infrastructure-ansible/docs/phase3/variable_analysis_report.json', 'w') as f:
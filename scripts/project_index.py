@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Project Index - Shared Parsed Model of the Ansible Repository
+Walks the tree once and parses each YAML file once for every tool that asks
+
+The security scanner, variable analysis, template tools, quality gate,
+diagram generator and the test suites all read the same roles, vars files and
+templates. ProjectIndex gives them one walk of the tree, one YAML parse per
+file (with the libyaml loader when PyYAML has it) and an on-disk cache of the
+parsed data keyed by path, mtime and size, so later tools in a CI run and
+later runs skip parsing unchanged files entirely.
+"""
+
+import os
+import sys
+import time
+import pickle
+import fnmatch
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import yaml
+
+# The C loader parses several times faster and builds the same safe types
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+YAML_SUFFIXES = ('.yml', '.yaml')
+
+SKIP_DIRS = {'.git', '__pycache__', '.pytest_cache', 'node_modules', '.venv', 'venv', '.cache'}
+
+# Directories holding variable definitions, at any depth
+VARS_DIRS = {'group_vars', 'host_vars', 'vars', 'defaults'}
+
+# Parsed data from another loader or PyYAML release is not reused
+CACHE_VERSION = f'1-{YAML_LOADER.__name__}-{yaml.__version__}'
+
+# Files modified this recently may change again within the same mtime tick;
+# they are parsed every time rather than trusted to the cache
+RACY_WINDOW_SECONDS = 2
+
+
+def load_yaml(text: str) -> Any:
+    """yaml.safe_load, with the C loader when available"""
+    return yaml.load(text, Loader=YAML_LOADER)
+
+
+class Role:
+    """A role directory whose YAML is parsed through the index"""
+
+    def __init__(self, index: 'ProjectIndex', path: Path):
+        self.index = index
+        self.path = path
+        self.name = path.name
+
+    def main_file(self, subdir: str) -> Optional[Path]:
+        """The role's <subdir>/main.yml (or main.yaml), if it has one"""
+        for name in ('main.yml', 'main.yaml'):
+            path = self.path / subdir / name
+            if self.index.exists(path):
+                return path
+        return None
+
+    def load_main(self, subdir: str, default: Any = None) -> Any:
+        """Parsed <subdir>/main.yml, or default when the role has none"""
+        path = self.main_file(subdir)
+        return self.index.load(path) if path else default
+
+    @property
+    def meta(self) -> Any:
+        return self.load_main('meta')
+
+    @property
+    def defaults(self) -> Any:
+        return self.load_main('defaults')
+
+    @property
+    def vars(self) -> Any:
+        return self.load_main('vars')
+
+    def yaml_files(self, subdir: str) -> List[Path]:
+        """YAML files directly in one of the role's directories"""
+        return [path for path in self.index.files(under=[self.path / subdir], recursive=False)
+                if path.name.endswith(YAML_SUFFIXES)]
+
+    @property
+    def tasks(self) -> Dict[Path, Any]:
+        """Parsed task files by path"""
+        return {path: self.index.load(path) for path in self.yaml_files('tasks')}
+
+    @property
+    def handlers(self) -> Dict[Path, Any]:
+        """Parsed handler files by path"""
+        return {path: self.index.load(path) for path in self.yaml_files('handlers')}
+
+    @property
+    def templates(self) -> List[Path]:
+        return self.index.files(under=[self.path / 'templates'])
+
+    def has_dir(self, subdir: str) -> bool:
+        return self.index.is_dir(self.path / subdir)
+
+
+class ProjectIndex:
+    """One walk and one YAML parse per file for the whole repository.
+
+    Paths are returned joined to root as given, so they relate to it the same
+    way paths built by hand do. Parsed data is shared between callers and must
+    not be modified.
+    """
+
+    def __init__(self, root: str = '.', cache_file: Optional[str] = None, use_cache: bool = True):
+        self.root = Path(root)
+        self.cache_file = None
+        if use_cache:
+            self.cache_file = Path(cache_file) if cache_file else self.root / '.cache' / 'project_index.pickle'
+        self.stats = {'parsed': 0, 'from_cache': 0}
+        self._files = None
+        self._file_set = None
+        self._dirs = None
+        self._entries = self._load_cache()
+        self._dirty = False
+
+    def _load_cache(self) -> Dict[str, Tuple]:
+        """Parsed files from the cache file, or nothing when missing or from another version"""
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception:
+            return {}
+        if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+            return {}
+        return cache.get('entries', {})
+
+    def save(self):
+        """Write parsed files back to the cache file atomically, if anything was parsed"""
+        if not self.cache_file or not self._dirty:
+            return
+        settled = time.time_ns() - RACY_WINDOW_SECONDS * 1_000_000_000
+        entries = {key: entry for key, entry in self._entries.items()
+                   if entry[0][0] < settled and (self._file_set is None or key in self._file_set)}
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_file.parent), prefix='.project-index-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'version': CACHE_VERSION, 'entries': entries}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._dirty = False
+
+    def _walk(self):
+        if self._files is not None:
+            return
+        files = []
+        dirs = set()
+        for current, subdirs, names in os.walk(self.root):
+            subdirs[:] = [d for d in subdirs if d not in SKIP_DIRS]
+            relative = os.path.relpath(current, self.root).replace(os.sep, '/')
+            prefix = '' if relative == '.' else relative + '/'
+            dirs.update(prefix + d for d in subdirs)
+            files.extend(prefix + name for name in names)
+        self._files = sorted(files)
+        self._file_set = set(files)
+        self._dirs = dirs
+
+    def _key(self, path) -> str:
+        """Path relative to root, with forward slashes"""
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def exists(self, path) -> bool:
+        self._walk()
+        return self._key(path) in self._file_set
+
+    def is_dir(self, path) -> bool:
+        self._walk()
+        return self._key(path) in self._dirs
+
+    def files(self, pattern: str = '*', under: Optional[Iterable] = None, recursive: bool = True) -> List[Path]:
+        """Files whose name matches the glob pattern, optionally only below some directories"""
+        self._walk()
+        prefixes = None
+        if under is not None:
+            prefixes = tuple(self._key(directory).rstrip('/') + '/' for directory in under)
+        matches = []
+        for key in self._files:
+            if prefixes is not None:
+                prefix = next((p for p in prefixes if key.startswith(p)), None)
+                if prefix is None or (not recursive and '/' in key[len(prefix):]):
+                    continue
+            if fnmatch.fnmatch(key.rsplit('/', 1)[-1], pattern):
+                matches.append(self.root / key)
+        return matches
+
+    def yaml_files(self, under: Optional[Iterable] = None) -> List[Path]:
+        return [path for path in self.files(under=under) if path.name.endswith(YAML_SUFFIXES)]
+
+    def templates(self, under: Optional[Iterable] = None) -> List[Path]:
+        """Jinja2 templates (*.j2)"""
+        return self.files('*.j2', under)
+
+    def vars_files(self) -> List[Path]:
+        """YAML files in group_vars, host_vars, vars and defaults directories at any depth"""
+        return [path for path in self.yaml_files()
+                if VARS_DIRS.intersection(self._key(path).split('/')[:-1])]
+
+    def roles(self) -> List[Role]:
+        """Roles under roles/, skipping hidden directories"""
+        self._walk()
+        names = sorted(d[len('roles/'):] for d in self._dirs
+                       if d.startswith('roles/') and d.count('/') == 1 and not d.startswith('roles/.'))
+        return [Role(self, self.root / 'roles' / name) for name in names]
+
+    def role(self, name: str) -> Optional[Role]:
+        return next((role for role in self.roles() if role.name == name), None)
+
+    def text(self, path) -> str:
+        with open(self.root / self._key(path), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def parse(self, path) -> Tuple[Any, Optional[str]]:
+        """(data, None) for a YAML file, or (None, error message) if it does not parse"""
+        key = self._key(path)
+        stat = os.stat(self.root / key)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.stats['from_cache'] += 1
+            return entry[1], entry[2]
+
+        text = self.text(path)
+        try:
+            entry = (signature, load_yaml(text), None)
+        except yaml.YAMLError as e:
+            entry = (signature, None, str(e))
+        self._entries[key] = entry
+        self._dirty = True
+        self.stats['parsed'] += 1
+        return entry[1], entry[2]
+
+    def load(self, path) -> Any:
+        """Parsed content of a YAML file; raises yaml.YAMLError if it does not parse"""
+        data, error = self.parse(path)
+        if error is not None:
+            raise yaml.YAMLError(error)
+        return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or refresh the shared project index cache')
+    parser.add_argument('path', nargs='?', default='.', help='Repository root')
+    parser.add_argument('--cache-file', help='Index cache file (default: <path>/.cache/project_index.pickle)')
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = ProjectIndex(args.path, args.cache_file)
+    errors = 0
+    for path in index.yaml_files():
+        try:
+            if index.parse(path)[1] is not None:
+                errors += 1
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Could not read {path}: {e}", file=sys.stderr)
+            errors += 1
+    index.save()
+    print(f"Indexed {len(index.yaml_files())} YAML files ({index.stats['parsed']} parsed, "
+          f"{index.stats['from_cache']} from cache, {errors} with errors) "
+          f"with {YAML_LOADER.__name__} in {time.perf_counter() - started:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -6,17 +6,30 @@ Sprint 2 - Advanced Capabilities Implementation
 
 This script evaluates the quality gate based on test results, security scans,
 and performance benchmarks to determine if the build should pass or fail.
+The gates are evaluated concurrently, and parsed artifacts are cached by
+content hash so re-evaluating unchanged artifacts skips parsing them.
 """
 
 import json
 import os
 import sys
-import glob
+import copy
+import time
+import heapq
+import hashlib
+import tempfile
+import threading
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Callable, Optional
 import logging
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from project_index import ProjectIndex
+from perf_regression import RegressionDetector, load_history
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,17 +37,94 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Bump whenever a parser changes what it extracts, so cached artifacts are re-parsed
+ARTIFACT_CACHE_VERSION = 2
+
+# Slowest test cases reported per JUnit file and for the testing gate
+SLOWEST_TESTS = 10
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """Parsed artifacts keyed by parser and content hash, shared by the gates.
+
+    Parsers extract counts independent of the thresholds, so a threshold change
+    re-evaluates from the cache without parsing anything. With a cache file the
+    entries used in a run are kept for the next one.
+    """
+
+    def __init__(self, cache_file: Optional[str] = None):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.entries = self._load()
+        self.used = {}
+        self.stats = {'parsed': 0, 'from_cache': 0}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cache.get('version') != ARTIFACT_CACHE_VERSION or not isinstance(cache.get('entries'), dict):
+            return {}
+        return cache['entries']
+
+    def get(self, file_path: str, kind: str, parse: Callable[[str], Any]) -> Any:
+        """parse(file_path), or its earlier result for the same content"""
+        key = f"{kind}:{file_sha256(file_path)}"
+        with self._lock:
+            entry = self.entries.get(key)
+        if entry is None:
+            entry = parse(file_path)
+            counter = 'parsed'
+        else:
+            counter = 'from_cache'
+        with self._lock:
+            self.entries[key] = self.used[key] = entry
+            self.stats[counter] += 1
+        # Callers annotate what they get back; the cached copy stays as parsed
+        return copy.deepcopy(entry)
+
+    def save(self):
+        """Write the entries used in this run to the cache file atomically"""
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_file.parent), prefix='.quality-gate-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': ARTIFACT_CACHE_VERSION, 'entries': self.used}, f, separators=(',', ':'))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
 class QualityGateEvaluator:
     """Evaluates quality gates based on various metrics and thresholds."""
     
-    def __init__(self):
+    def __init__(self, cache_file: Optional[str] = None, index: Optional[ProjectIndex] = None):
         self.results = {
             'timestamp': None,
             'overall_status': 'UNKNOWN',
             'gates': {},
             'metrics': {},
-            'recommendations': []
+            'recommendations': [],
+            'timing': {}
         }
+        self.artifacts = ArtifactCache(cache_file)
+        self.index = index or ProjectIndex(use_cache=False)
         
         # Quality gate thresholds (configurable via environment variables)
         self.thresholds = {
@@ -45,8 +135,11 @@ class QualityGateEvaluator:
             'max_test_failures': int(os.getenv('MAX_TEST_FAILURES', '0')),
             'max_lint_errors': int(os.getenv('MAX_LINT_ERRORS', '0')),
             'max_performance_degradation': float(os.getenv('MAX_PERFORMANCE_DEGRADATION', '20.0')),
-            'min_performance_score': float(os.getenv('MIN_PERFORMANCE_SCORE', '70.0'))
+            'min_performance_score': float(os.getenv('MIN_PERFORMANCE_SCORE', '70.0')),
+            'performance_regression_alpha': float(os.getenv('PERFORMANCE_REGRESSION_ALPHA', '0.05')),
+            'performance_history_runs': int(os.getenv('PERFORMANCE_HISTORY_RUNS', '5'))
         }
+        self.benchmark_history_dir = os.getenv('BENCHMARK_RESULTS_DIR', 'benchmark_results')
         
         logger.info(f"Quality gate thresholds: {self.thresholds}")
 
@@ -82,9 +175,9 @@ class QualityGateEvaluator:
                 
                 try:
                     if file_path.endswith('.sarif'):
-                        vulnerabilities = self._parse_sarif_file(file_path)
+                        vulnerabilities = self.artifacts.get(file_path, 'sarif', self._parse_sarif_file)
                     elif file_path.endswith('.json'):
-                        vulnerabilities = self._parse_security_json(file_path)
+                        vulnerabilities = self.artifacts.get(file_path, 'security_json', self._parse_security_json)
                     else:
                         continue
                     
@@ -135,19 +228,22 @@ class QualityGateEvaluator:
                 'skipped_tests': 0
             },
             'coverage': 0.0,
+            'suite_time': 0.0,
+            'slowest_tests': [],
             'issues': [],
             'test_suites': []
         }
         
-        # Check for test result files
-        test_files = glob.glob('**/test-results.xml', recursive=True) + \
-                    glob.glob('**/integration-test-results.xml', recursive=True) + \
-                    glob.glob('**/molecule-test-results-*', recursive=True)
+        # Check for test result files, found in the index's single walk of the tree
+        test_files = self.index.files('test-results.xml') + \
+                    self.index.files('integration-test-results.xml') + \
+                    self.index.files('molecule-test-results-*')
         
-        for test_file in test_files:
+        for test_file in map(str, test_files):
             try:
                 if test_file.endswith('.xml'):
-                    test_data = self._parse_junit_xml(test_file)
+                    test_data = self.artifacts.get(test_file, 'junit', self._parse_junit_xml)
+                    test_data['file'] = test_file
                     gate_result['test_suites'].append(test_data)
                     
                     # Aggregate results
@@ -155,18 +251,23 @@ class QualityGateEvaluator:
                     gate_result['test_results']['passed_tests'] += test_data.get('passed', 0)
                     gate_result['test_results']['failed_tests'] += test_data.get('failed', 0)
                     gate_result['test_results']['skipped_tests'] += test_data.get('skipped', 0)
+                    gate_result['suite_time'] += test_data.get('time', 0.0)
+                    gate_result['slowest_tests'].extend(dict(test, file=test_file)
+                                                        for test in test_data.get('slowest_tests', []))
                     
             except Exception as e:
                 logger.error(f"Error parsing test file {test_file}: {e}")
                 gate_result['issues'].append(f"Failed to parse {test_file}: {e}")
         
+        gate_result['suite_time'] = round(gate_result['suite_time'], 3)
+        gate_result['slowest_tests'] = sorted(gate_result['slowest_tests'],
+                                              key=lambda test: test['time'], reverse=True)[:SLOWEST_TESTS]
+
         # Calculate coverage if available
-        coverage_files = glob.glob('**/coverage.json', recursive=True)
+        coverage_files = self.index.files('coverage.json')
         if coverage_files:
             try:
-                with open(coverage_files[0], 'r') as f:
-                    coverage_data = json.load(f)
-                    gate_result['coverage'] = coverage_data.get('totals', {}).get('percent_covered', 0.0)
+                gate_result['coverage'] = self.artifacts.get(str(coverage_files[0]), 'coverage', self._parse_coverage)
             except Exception as e:
                 logger.error(f"Error parsing coverage file: {e}")
         
@@ -217,7 +318,8 @@ class QualityGateEvaluator:
                 if os.path.exists(pattern):
                     gate_result['tools_run'].append(tool)
                     try:
-                        errors = self._parse_lint_results(pattern, tool)
+                        errors = self.artifacts.get(pattern, f'lint:{tool}',
+                                                    lambda path, tool=tool: self._parse_lint_results(path, tool))
                         gate_result['lint_results'][f"{tool.replace('-', '_')}_errors"] = errors
                         total_lint_errors += errors
                     except Exception as e:
@@ -242,6 +344,7 @@ class QualityGateEvaluator:
             'status': 'PASS',
             'performance_score': 0.0,
             'benchmark_results': {},
+            'regression': {},
             'issues': []
         }
         
@@ -251,8 +354,7 @@ class QualityGateEvaluator:
         for perf_file in performance_files:
             if os.path.exists(perf_file):
                 try:
-                    with open(perf_file, 'r') as f:
-                        perf_data = json.load(f)
+                    perf_data = self.artifacts.get(perf_file, 'performance', self._load_json)
                     
                     # Extract performance score
                     if 'benchmarks' in perf_data and 'overall_metrics' in perf_data['benchmarks']:
@@ -274,6 +376,33 @@ class QualityGateEvaluator:
                 f"Performance score ({performance_score}) below threshold ({self.thresholds['min_performance_score']})"
             )
         
+        # Compare the latest benchmark runs with their history
+        detector = RegressionDetector(
+            self.thresholds['max_performance_degradation'],
+            self.thresholds['performance_regression_alpha'],
+            self.thresholds['performance_history_runs']
+        )
+        history = load_history(self.benchmark_history_dir,
+                               lambda path: self.artifacts.get(path, 'benchmark', self._load_json))
+        verdicts = detector.evaluate(history)
+        gate_result['regression'] = {
+            'history_dir': self.benchmark_history_dir,
+            'metrics': verdicts
+        }
+        
+        for metric, verdict in verdicts.items():
+            if not detector.fails(verdict):
+                continue
+            gate_result['status'] = 'FAIL'
+            if verdict['p_value'] is None:
+                evidence = f"{verdict['current_samples']} vs {verdict['baseline_samples']} samples, too few to test"
+            else:
+                evidence = f"p={verdict['p_value']:.3f}"
+            gate_result['issues'].append(
+                f"{metric} slowed down {verdict['degradation_percent']}% ({evidence}), "
+                f"above threshold ({self.thresholds['max_performance_degradation']}%)"
+            )
+        
         return gate_result['status'] == 'PASS', gate_result
 
     def _parse_sarif_file(self, file_path: str) -> Dict[str, int]:
@@ -322,42 +451,81 @@ class QualityGateEvaluator:
         return vulnerabilities
 
     def _parse_junit_xml(self, file_path: str) -> Dict[str, Any]:
-        """Parse JUnit XML file and extract test results."""
+        """Parse JUnit XML file and extract test results.
+
+        The file is streamed with iterparse and each test case is dropped once
+        read, so memory stays flat however large the suite; only the slowest
+        tests are kept.
+        """
         test_data = {
             'file': file_path,
             'total': 0,
             'passed': 0,
             'failed': 0,
             'skipped': 0,
-            'errors': 0
+            'errors': 0,
+            'time': 0.0,
+            'slowest_tests': []
         }
         
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
-            # Handle different XML structures
-            if root.tag == 'testsuite':
-                test_data['total'] = int(root.get('tests', 0))
-                test_data['failed'] = int(root.get('failures', 0))
-                test_data['errors'] = int(root.get('errors', 0))
-                test_data['skipped'] = int(root.get('skipped', 0))
-                test_data['passed'] = test_data['total'] - test_data['failed'] - test_data['errors'] - test_data['skipped']
+            counts = dict.fromkeys(('total', 'failed', 'errors', 'skipped'), 0)
+            suite_time = 0.0
+            case_time = 0.0
+            has_suite_time = False
+            slowest = []
+            stack = []
             
-            elif root.tag == 'testsuites':
-                for testsuite in root.findall('testsuite'):
-                    test_data['total'] += int(testsuite.get('tests', 0))
-                    test_data['failed'] += int(testsuite.get('failures', 0))
-                    test_data['errors'] += int(testsuite.get('errors', 0))
-                    test_data['skipped'] += int(testsuite.get('skipped', 0))
+            for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+                if event == 'start':
+                    # Counts come from the root testsuite, or each testsuite directly under testsuites
+                    if elem.tag == 'testsuite' and (not stack or (len(stack) == 1 and stack[0].tag == 'testsuites')):
+                        counts['total'] += int(elem.get('tests', 0))
+                        counts['failed'] += int(elem.get('failures', 0))
+                        counts['errors'] += int(elem.get('errors', 0))
+                        counts['skipped'] += int(elem.get('skipped', 0))
+                        if elem.get('time') is not None:
+                            suite_time += float(elem.get('time'))
+                            has_suite_time = True
+                    stack.append(elem)
+                    continue
                 
-                test_data['passed'] = test_data['total'] - test_data['failed'] - test_data['errors'] - test_data['skipped']
+                stack.pop()
+                if elem.tag == 'testcase':
+                    duration = float(elem.get('time', 0) or 0)
+                    case_time += duration
+                    outcome = next((child.tag for child in elem if child.tag in ('failure', 'error', 'skipped')), 'passed')
+                    test = (duration, elem.get('classname', ''), elem.get('name', ''), outcome)
+                    if len(slowest) < SLOWEST_TESTS:
+                        heapq.heappush(slowest, test)
+                    else:
+                        heapq.heappushpop(slowest, test)
+                    elem.clear()
+                    if stack:
+                        stack[-1].remove(elem)
+            
+            test_data.update(counts)
+            test_data['passed'] = counts['total'] - counts['failed'] - counts['errors'] - counts['skipped']
+            test_data['time'] = round(suite_time if has_suite_time else case_time, 3)
+            test_data['slowest_tests'] = [
+                {'name': name, 'classname': classname, 'time': duration, 'outcome': outcome}
+                for duration, classname, name, outcome in sorted(slowest, reverse=True)
+            ]
                 
         except Exception as e:
             logger.error(f"Error parsing JUnit XML file {file_path}: {e}")
         
         return test_data
 
+    def _parse_coverage(self, file_path: str) -> float:
+        """Total line coverage from a coverage.py JSON report."""
+        with open(file_path, 'r') as f:
+            return json.load(f).get('totals', {}).get('percent_covered', 0.0)
+
+    def _load_json(self, file_path: str) -> Any:
+        with open(file_path, 'r') as f:
+            return json.load(f)
+
     def _parse_lint_results(self, file_path: str, tool: str) -> int:
         """Parse lint results and return error count."""
         error_count = 0
@@ -374,12 +542,13 @@ class QualityGateEvaluator:
                 elif tool == 'flake8':
                     error_count = lint_data.get('error_count', 0)
             
-            else:  # Log file
-                with open(file_path, 'r') as f:
-                    lines = f.readlines()
-                
-                # Count error lines (simple heuristic)
-                error_count = len([line for line in lines if 'error' in line.lower() or 'fail' in line.lower()])
+            else:  # Log file, read a line at a time
+                with open(file_path, 'r', errors='replace') as f:
+                    # Count error lines (simple heuristic)
+                    for line in f:
+                        line = line.lower()
+                        if 'error' in line or 'fail' in line:
+                            error_count += 1
                 
         except Exception as e:
             logger.error(f"Error parsing lint file {file_path}: {e}")
@@ -419,14 +588,23 @@ class QualityGateEvaluator:
         
         return recommendations
 
+    def _timed_gate(self, gate_func: Callable[[], Tuple[bool, Dict[str, Any]]]) -> Tuple[Any, Optional[Exception], float]:
+        """Run one gate, returning its outcome or exception and how long it took."""
+        started = time.perf_counter()
+        try:
+            return gate_func(), None, time.perf_counter() - started
+        except Exception as e:
+            return None, e, time.perf_counter() - started
+
     def evaluate_all_gates(self) -> Dict[str, Any]:
         """Evaluate all quality gates and return comprehensive results."""
         logger.info("Starting comprehensive quality gate evaluation...")
+        started = time.perf_counter()
         
         # Initialize results
         self.results['timestamp'] = os.getenv('GITHUB_RUN_ID', 'local-run')
         
-        # Evaluate each gate
+        # The gates read separate artifacts and are independent of each other
         gates = {
             'security': self.evaluate_security_gate,
             'testing': self.evaluate_testing_gate,
@@ -434,15 +612,22 @@ class QualityGateEvaluator:
             'performance': self.evaluate_performance_gate
         }
         
+        with ThreadPoolExecutor(max_workers=len(gates)) as executor:
+            futures = {gate_name: executor.submit(self._timed_gate, gate_func)
+                       for gate_name, gate_func in gates.items()}
+        
         all_passed = True
+        gate_timing = {}
         
-        for gate_name, gate_func in gates.items():
-            logger.info(f"Evaluating {gate_name} gate...")
-            try:
-                passed, gate_result = gate_func()
+        for gate_name, future in futures.items():
+            outcome, error, duration = future.result()
+            gate_timing[gate_name] = round(duration, 4)
+            if error is None:
+                passed, gate_result = outcome
                 self.results['gates'][gate_name] = {
                     'passed': passed,
-                    'result': gate_result
+                    'result': gate_result,
+                    'duration_seconds': gate_timing[gate_name]
                 }
                 
                 if not passed:
@@ -451,14 +636,23 @@ class QualityGateEvaluator:
                 else:
                     logger.info(f"{gate_name} gate PASSED")
                     
-            except Exception as e:
-                logger.error(f"Error evaluating {gate_name} gate: {e}")
+            else:
+                logger.error(f"Error evaluating {gate_name} gate: {error}")
                 self.results['gates'][gate_name] = {
                     'passed': False,
-                    'result': {'status': 'ERROR', 'error': str(e)}
+                    'result': {'status': 'ERROR', 'error': str(error)},
+                    'duration_seconds': gate_timing[gate_name]
                 }
                 all_passed = False
         
+        self.artifacts.save()
+        self.results['timing'] = {
+            'total_seconds': round(time.perf_counter() - started, 4),
+            'gates': gate_timing,
+            'artifacts_parsed': self.artifacts.stats['parsed'],
+            'artifacts_from_cache': self.artifacts.stats['from_cache']
+        }
+        
         # Set overall status
         self.results['overall_status'] = 'PASS' if all_passed else 'FAIL'
         
@@ -491,7 +685,7 @@ def main():
     """Main execution function."""
     logger.info("Starting Quality Gate Evaluation")
     
-    evaluator = QualityGateEvaluator()
+    evaluator = QualityGateEvaluator(os.getenv('QUALITY_GATE_CACHE', '.cache/quality-gate-artifacts.json'))
     
     try:
         # Evaluate all gates
@@ -513,7 +707,18 @@ def main():
         
         for gate_name, gate_data in results['gates'].items():
             status = "✅ PASS" if gate_data['passed'] else "❌ FAIL"
-            print(f"  {gate_name.title()}: {status}")
+            print(f"  {gate_name.title()}: {status} ({gate_data['duration_seconds']:.2f}s)")
+
+        testing = results['gates'].get('testing', {}).get('result', {})
+        if testing.get('slowest_tests'):
+            print(f"\nSlowest Tests (total suite time {testing['suite_time']:.1f}s):")
+            for test in testing['slowest_tests'][:5]:
+                name = f"{test['classname']}::{test['name']}" if test['classname'] else test['name']
+                print(f"  {test['time']:8.2f}s  {name}")
+
+        timing = results['timing']
+        print(f"\nEvaluated in {timing['total_seconds']:.2f}s "
+              f"({timing['artifacts_parsed']} artifacts parsed, {timing['artifacts_from_cache']} from cache)")
         
         print("\nRecommendations:")
         for rec in results['recommendations']:
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Performance Regression Detection
+Sprint 2 - Advanced Capabilities Implementation
+
+Compares the latest run of each benchmark in benchmark_results/ with the runs
+before it. Each metric's samples are tested against the pooled samples of the
+earlier runs with a one-sided Mann-Whitney U test, so a slowdown only counts
+as a regression when it is both statistically significant and larger than the
+allowed degradation; noise between runs does not fail the gate. With too few
+samples for the test to ever reach significance, the verdict says so and only
+the allowed degradation is applied.
+"""
+
+import json
+import math
+import re
+import sys
+import argparse
+from functools import lru_cache
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Any, Callable, Tuple
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# <benchmark>_YYYYMMDD_HHMMSS.json, as written by the benchmark scripts
+RESULT_FILE = re.compile(r'^(?P<benchmark>.+?)_(?P<timestamp>\d{8}_\d{6})\.json$')
+
+# Above this many samples in total the U distribution is approximated as normal
+EXACT_MAX_SAMPLES = 20
+
+
+def _load_json(path: str) -> Any:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def load_history(history_dir: str, load: Callable[[str], Any] = _load_json) -> Dict[str, List[Dict[str, Any]]]:
+    """Benchmark results by benchmark name, oldest run first; unreadable files are skipped"""
+    runs = {}
+    for path in sorted(Path(history_dir).glob('*.json')):
+        match = RESULT_FILE.match(path.name)
+        if not match:
+            continue
+        try:
+            data = load(str(path))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable benchmark results {path}: {e}")
+            continue
+        runs.setdefault(match.group('benchmark'), []).append(
+            (match.group('timestamp'), {'file': str(path), 'results': data.get('results', {})}))
+    return {benchmark: [run for _, run in sorted(entries, key=lambda entry: entry[0])]
+            for benchmark, entries in runs.items()}
+
+
+def metric_samples(result: Any) -> List[float]:
+    """Timing or size samples of one metric; plain counts carry none"""
+    if not isinstance(result, dict):
+        return []
+    samples = result.get('samples')
+    if isinstance(samples, list) and samples:
+        return [float(sample) for sample in samples]
+    if isinstance(result.get('median'), (int, float)):
+        return [float(result['median'])]
+    return []
+
+
+@lru_cache(maxsize=None)
+def _u_counts(m: int, n: int) -> Tuple[int, ...]:
+    """Number of orderings of m and n untied samples giving each value of U"""
+    if m == 0 or n == 0:
+        return (1,)
+    # The largest value is either one of the m (adding n to U) or one of the n
+    with_m = _u_counts(m - 1, n)
+    with_n = _u_counts(m, n - 1)
+    counts = [0] * (m * n + 1)
+    for u, count in enumerate(with_m):
+        counts[u + n] += count
+    for u, count in enumerate(with_n):
+        counts[u] += count
+    return tuple(counts)
+
+
+def mann_whitney_u(current: List[float], baseline: List[float]) -> Tuple[float, float, float]:
+    """U of current over baseline, and one-sided p-values for current being larger and smaller.
+
+    Exact for small samples without ties; otherwise the normal approximation
+    with tie and continuity corrections.
+    """
+    m, n = len(current), len(baseline)
+    ranked = sorted([(value, 0) for value in current] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(ranked)
+    tie_term = 0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        tie_term += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u = rank_sum - m * (m + 1) / 2
+
+    if tie_term == 0 and m + n <= EXACT_MAX_SAMPLES:
+        counts = _u_counts(m, n)
+        total = sum(counts)
+        u = int(u)
+        return u, sum(counts[u:]) / total, sum(counts[:u + 1]) / total
+
+    mean = m * n / 2
+    variance = m * n / 12 * ((m + n + 1) - tie_term / ((m + n) * (m + n - 1)))
+    if variance <= 0:
+        return u, 1.0, 1.0
+    sd = math.sqrt(variance)
+    upper = 0.5 * math.erfc((u - 0.5 - mean) / sd / math.sqrt(2))
+    lower = 0.5 * math.erfc((mean - u - 0.5) / sd / math.sqrt(2))
+    return u, min(upper, 1.0), min(lower, 1.0)
+
+
+class RegressionDetector:
+    """Per-metric regression verdicts for benchmark history; larger values are slower."""
+
+    def __init__(self, max_degradation: float = 20.0, alpha: float = 0.05, history_runs: int = 5):
+        self.max_degradation = max_degradation
+        self.alpha = alpha
+        self.history_runs = history_runs
+
+    def testable(self, m: int, n: int) -> bool:
+        """Whether m and n samples can give a p-value at or below alpha at all"""
+        # The most extreme ordering has p = 1 / C(m + n, m); ties only raise it
+        return 1 / math.comb(m + n, m) <= self.alpha
+
+    def fails(self, verdict: Dict[str, Any]) -> bool:
+        """Whether a verdict fails the gate: a regression, or an untestable slowdown over the threshold"""
+        if verdict['verdict'] == 'insufficient_samples':
+            return verdict['degradation_percent'] > self.max_degradation
+        return verdict['verdict'] == 'regression'
+
+    def compare(self, current: List[float], baseline: List[float]) -> Dict[str, Any]:
+        """Verdict for one metric: regression, slower, faster, unchanged, insufficient_samples or no_baseline"""
+        verdict = {
+            'current_median': median(current),
+            'baseline_median': median(baseline) if baseline else None,
+            'current_samples': len(current),
+            'baseline_samples': len(baseline),
+            'degradation_percent': None,
+            'p_value': None,
+            'verdict': 'no_baseline'
+        }
+        # A zero baseline gives no relative change to judge
+        if not baseline or verdict['baseline_median'] <= 0:
+            return verdict
+
+        verdict['degradation_percent'] = round((verdict['current_median'] / verdict['baseline_median'] - 1) * 100, 2)
+        if not self.testable(len(current), len(baseline)):
+            verdict['verdict'] = 'insufficient_samples'
+            return verdict
+        _, p_slower, p_faster = mann_whitney_u(current, baseline)
+        degradation = verdict['degradation_percent']
+
+        if degradation > 0:
+            verdict['p_value'] = round(p_slower, 6)
+            if p_slower <= self.alpha:
+                verdict['verdict'] = 'regression' if degradation > self.max_degradation else 'slower'
+            else:
+                verdict['verdict'] = 'unchanged'
+        else:
+            verdict['p_value'] = round(p_faster, 6)
+            verdict['verdict'] = 'faster' if degradation < 0 and p_faster <= self.alpha else 'unchanged'
+        return verdict
+
+    def evaluate(self, history: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+        """Verdicts for every metric of the latest run of each benchmark, by metric name"""
+        verdicts = {}
+        for benchmark, runs in sorted(history.items()):
+            latest = runs[-1]
+            earlier = runs[max(len(runs) - 1 - self.history_runs, 0):-1]
+            for metric, result in latest['results'].items():
+                current = metric_samples(result)
+                if not current:
+                    continue
+                baseline = [sample for run in earlier for sample in metric_samples(run['results'].get(metric))]
+                verdicts[metric] = dict(self.compare(current, baseline),
+                                        benchmark=benchmark,
+                                        file=latest['file'],
+                                        baseline_runs=sum(1 for run in earlier if metric_samples(run['results'].get(metric))))
+        return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect performance regressions in benchmark history")
+    parser.add_argument("history_dir", nargs="?", default="benchmark_results", help="Benchmark results directory")
+    parser.add_argument("--max-degradation", type=float, default=20.0, help="Allowed slowdown in percent")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level")
+    parser.add_argument("--runs", type=int, default=5, help="Earlier runs forming the baseline")
+
+    args = parser.parse_args()
+
+    detector = RegressionDetector(args.max_degradation, args.alpha, args.runs)
+    verdicts = detector.evaluate(load_history(args.history_dir))
+    for metric, verdict in verdicts.items():
+        change = '' if verdict['degradation_percent'] is None else f" {verdict['degradation_percent']:+.1f}%"
+        p_value = '' if verdict['p_value'] is None else f" (p={verdict['p_value']:.3f})"
+        print(f"{verdict['verdict'].upper():20} {metric}{change}{p_value}")
+    sys.exit(1 if any(detector.fails(verdict) for verdict in verdicts.values()) else 0)
+
+if __name__ == "__main__":
+    main()
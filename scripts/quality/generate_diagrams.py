@@ -6,18 +6,23 @@ Creates visual documentation of system architecture and dependencies
 """
 
 import os
+import sys
 import subprocess
-import yaml
 from pathlib import Path
 from typing import Dict, List, Set, Any
 import json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from project_index import ProjectIndex
+
 
 class DiagramGenerator:
     """Generate architecture diagrams for Ansible infrastructure"""
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", index: ProjectIndex = None):
         self.project_root = Path(project_root)
+        # Parsed roles and playbooks shared with the other quality tools
+        self.index = index or ProjectIndex(project_root)
         self.diagrams_dir = self.project_root / "docs_site" / "docs" / "diagrams"
         self.diagrams_dir.mkdir(parents=True, exist_ok=True)
         
@@ -33,29 +38,27 @@ class DiagramGenerator:
         dependencies = {}
         roles = []
         
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                role_name = role_dir.name
-                roles.append(role_name)
-                dependencies[role_name] = []
-                
-                meta_file = role_dir / 'meta' / 'main.yml'
-                if meta_file.exists():
-                    try:
-                        with open(meta_file, 'r') as f:
-                            meta_data = yaml.safe_load(f) or {}
-                            deps = meta_data.get('dependencies', [])
-                            
-                            for dep in deps:
-                                if isinstance(dep, str):
-                                    dep_name = dep
-                                elif isinstance(dep, dict):
-                                    dep_name = dep.get('role', dep.get('name', ''))
-                                
-                                if dep_name and not dep_name.startswith('community.'):
-                                    dependencies[role_name].append(dep_name)
-                    except Exception as e:
-                        print(f"Warning: Could not parse {meta_file}: {e}")
+        for role in self.index.roles():
+            role_name = role.name
+            roles.append(role_name)
+            dependencies[role_name] = []
+            
+            meta_file = role.main_file('meta')
+            if meta_file:
+                try:
+                    meta_data = self.index.load(meta_file) or {}
+                    deps = meta_data.get('dependencies', [])
+                    
+                    for dep in deps:
+                        if isinstance(dep, str):
+                            dep_name = dep
+                        elif isinstance(dep, dict):
+                            dep_name = dep.get('role', dep.get('name', ''))
+                        
+                        if dep_name and not dep_name.startswith('community.'):
+                            dependencies[role_name].append(dep_name)
+                except Exception as e:
+                    print(f"Warning: Could not parse {meta_file}: {e}")
         
         # Generate DOT file
         dot_content = """digraph RoleDependencies {
@@ -125,8 +128,7 @@ class DiagramGenerator:
             return ""
         
         try:
-            with open(site_playbook, 'r') as f:
-                playbook_data = yaml.safe_load(f)
+            playbook_data = self.index.load(site_playbook)
         except Exception as e:
             print(f"Warning: Could not parse site.yml: {e}")
             return ""
@@ -479,6 +481,7 @@ def main():
     """Main execution function"""
     generator = DiagramGenerator()
     diagrams = generator.generate_all_diagrams()
+    generator.index.save()
     
     print(f"\n✅ Generated {len(diagrams)} architecture diagrams")
     for name, path in diagrams.items():
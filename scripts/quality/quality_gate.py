@@ -8,18 +8,31 @@ Evaluates overall project quality and enforces standards for Phase 4
 import json
 import sys
 import os
-import subprocess
 import time
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
-import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from project_index import ProjectIndex
+from tool_runner import ToolRunner
+
+# External tools the assessments read, run together up front
+ASSESSMENT_TOOLS = [
+    'mkdocs_build', 'markdownlint', 'pytest_unit', 'syntax_check', 'bandit',
+    'pytest_security', 'ansible_lint', 'yamllint', 'pytest_performance'
+]
 
 
 class QualityAssessment:
     """Comprehensive quality assessment for Ansible infrastructure"""
     
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", index: ProjectIndex = None, runner: ToolRunner = None):
         self.project_root = Path(project_root)
+        # Parsed roles and YAML shared with the other quality tools
+        self.index = index or ProjectIndex(project_root)
+        # Each external tool runs once, shared by every assessment that reads it
+        self.runner = runner or ToolRunner(project_root, index=self.index)
         self.reports_dir = self.project_root / "reports"
         self.reports_dir.mkdir(exist_ok=True)
         
@@ -79,30 +92,12 @@ class QualityAssessment:
             score += 20
             
             # Check if documentation builds successfully
-            try:
-                result = subprocess.run(
-                    ['mkdocs', 'build', '--strict'],
-                    cwd=docs_site,
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    score += 15
-            except FileNotFoundError:
-                pass
+            if self.runner.result('mkdocs_build')['returncode'] == 0:
+                score += 15
         
         # Check documentation style compliance
-        try:
-            result = subprocess.run(
-                ['markdownlint-cli2', '**/*.md'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 10
-        except FileNotFoundError:
-            pass
+        if self.runner.result('markdownlint')['returncode'] == 0:
+            score += 10
         
         self.quality_metrics['documentation'] = min(score, max_score)
         return self.quality_metrics['documentation']
@@ -137,20 +132,11 @@ class QualityAssessment:
             score += 20
         
         # Run actual tests and check results
-        try:
-            # Run unit tests
-            result = subprocess.run(
-                ['python', '-m', 'pytest', 'tests/unit/', '--tb=short'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 20
-            elif 'passed' in result.stdout:
-                score += 10
-        except Exception:
-            pass
+        result = self.runner.result('pytest_unit')
+        if result['returncode'] == 0:
+            score += 20
+        elif 'passed' in result['stdout']:
+            score += 10
         
         # Check for test configuration
         test_configs = ['.pytest.ini', 'pytest.ini', 'pyproject.toml']
@@ -160,17 +146,8 @@ class QualityAssessment:
                 break
         
         # Check syntax validation
-        try:
-            result = subprocess.run(
-                ['ansible-playbook', '--syntax-check', 'site.yml'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 15
-        except Exception:
-            pass
+        if self.runner.result('syntax_check')['returncode'] == 0:
+            score += 15
         
         self.quality_metrics['testing'] = min(score, max_score)
         return self.quality_metrics['testing']
@@ -189,28 +166,20 @@ class QualityAssessment:
                 score += 10
         
         # Run security scans
-        try:
-            result = subprocess.run(
-                ['bandit', '-r', '.', '-f', 'json'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 25
-                # Parse results for severity
-                try:
-                    bandit_data = json.loads(result.stdout)
-                    high_issues = len([
-                        issue for issue in bandit_data.get('results', [])
-                        if issue.get('issue_severity') == 'HIGH'
-                    ])
-                    if high_issues == 0:
-                        score += 15
-                except json.JSONDecodeError:
-                    pass
-        except Exception:
-            pass
+        result = self.runner.result('bandit')
+        if result['returncode'] == 0:
+            score += 25
+            # Parse results for severity
+            try:
+                bandit_data = json.loads(result['stdout'])
+                high_issues = len([
+                    issue for issue in bandit_data.get('results', [])
+                    if issue.get('issue_severity') == 'HIGH'
+                ])
+                if high_issues == 0:
+                    score += 15
+            except json.JSONDecodeError:
+                pass
         
         # Check for vault usage
         vault_files = list(self.project_root.rglob('*vault*'))
@@ -239,17 +208,8 @@ class QualityAssessment:
             score += 10
         
         # Run security tests
-        try:
-            result = subprocess.run(
-                ['python', '-m', 'pytest', 'tests/security/', '--tb=short'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 15
-        except Exception:
-            pass
+        if self.runner.result('pytest_security')['returncode'] == 0:
+            score += 15
         
         self.quality_metrics['security'] = min(score, max_score)
         return self.quality_metrics['security']
@@ -267,28 +227,14 @@ class QualityAssessment:
             score += 30
         
         # Run performance benchmarks
-        try:
-            result = subprocess.run(
-                ['python', '-m', 'pytest', 'tests/performance/', '--tb=short'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 25
-        except Exception:
-            pass
-        
-        # Check ansible-lint performance
-        try:
-            start_time = time.time()
-            result = subprocess.run(
-                ['ansible-lint', '.'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            duration = time.time() - start_time
+        if self.runner.result('pytest_performance')['returncode'] == 0:
+            score += 25
+        
+        # Check ansible-lint performance, timed alone on the run the compliance check also
+        # reads; a cached result scores the earlier run's timing, flagged in tool_runs
+        result = self.runner.result('ansible_lint')
+        if result['error'] is None:
+            duration = result['duration']
             
             # Score based on linting speed (under 60 seconds is good)
             if duration < 30:
@@ -297,8 +243,6 @@ class QualityAssessment:
                 score += 15
             elif duration < 120:
                 score += 10
-        except Exception:
-            pass
         
         # Check for optimization configurations
         optimization_files = ['.ansible-lint', '.yamllint', 'ansible.cfg']
@@ -338,51 +282,34 @@ class QualityAssessment:
         max_score = 100.0
         
         # Run ansible-lint for compliance
-        try:
-            result = subprocess.run(
-                ['ansible-lint', '--format', 'json', '.'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                score += 40
-            else:
-                try:
-                    lint_data = json.loads(result.stdout)
-                    error_count = len([
-                        issue for issue in lint_data
-                        if issue.get('level') == 'error'
-                    ])
-                    # Partial score based on error count
-                    if error_count == 0:
-                        score += 40
-                    elif error_count < 5:
-                        score += 30
-                    elif error_count < 10:
-                        score += 20
-                    else:
-                        score += 10
-                except json.JSONDecodeError:
+        result = self.runner.result('ansible_lint')
+        if result['returncode'] == 0:
+            score += 40
+        elif result['error'] is None:
+            try:
+                lint_data = json.loads(result['stdout'])
+                error_count = len([
+                    issue for issue in lint_data
+                    if issue.get('level') == 'error'
+                ])
+                # Partial score based on error count
+                if error_count == 0:
+                    score += 40
+                elif error_count < 5:
+                    score += 30
+                elif error_count < 10:
+                    score += 20
+                else:
                     score += 10
-        except Exception:
-            pass
+            except json.JSONDecodeError:
+                score += 10
         
         # Run yamllint for YAML compliance
-        try:
-            result = subprocess.run(
-                ['yamllint', '.'],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                score += 25
-            elif 'error' not in result.stdout.lower():
-                score += 15
-        except Exception:
-            pass
+        result = self.runner.result('yamllint')
+        if result['returncode'] == 0:
+            score += 25
+        elif result['error'] is None and 'error' not in result['stdout'].lower():
+            score += 15
         
         # Check for compliance documentation
         compliance_docs = [
@@ -404,18 +331,14 @@ class QualityAssessment:
             compliant_roles = 0
             total_roles = 0
             
-            for role_dir in roles_dir.iterdir():
-                if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                    total_roles += 1
-                    meta_file = role_dir / 'meta' / 'main.yml'
-                    if meta_file.exists():
-                        try:
-                            with open(meta_file, 'r') as f:
-                                meta_data = yaml.safe_load(f)
-                                if 'galaxy_info' in meta_data:
-                                    compliant_roles += 1
-                        except Exception:
-                            pass
+            for role in self.index.roles():
+                total_roles += 1
+                if role.main_file('meta'):
+                    try:
+                        if 'galaxy_info' in role.meta:
+                            compliant_roles += 1
+                    except Exception:
+                        pass
             
             if total_roles > 0:
                 score += (compliant_roles / total_roles) * 20
@@ -487,10 +410,9 @@ class QualityAssessment:
         if requirements.exists():
             score += 10
             try:
-                with open(requirements, 'r') as f:
-                    req_data = yaml.safe_load(f)
-                    if isinstance(req_data, list) and len(req_data) > 0:
-                        score += 5
+                req_data = self.index.load(requirements)
+                if isinstance(req_data, list) and len(req_data) > 0:
+                    score += 5
             except Exception:
                 pass
         
@@ -520,6 +442,10 @@ class QualityAssessment:
         """Generate comprehensive quality report"""
         print("\n🎯 Running comprehensive quality assessment...")
         
+        # Run the external tools in parallel before the assessments read them
+        print(f"🛠️  Running quality tools ({self.runner.max_workers} at a time)...")
+        self.runner.run(ASSESSMENT_TOOLS)
+        
         # Run all assessments
         self.assess_documentation_quality()
         self.assess_testing_coverage()
@@ -539,6 +465,15 @@ class QualityAssessment:
                 metric: round(score, 2)
                 for metric, score in self.quality_metrics.items()
             },
+            'tool_runs': {
+                name: {
+                    'returncode': result['returncode'],
+                    'duration': result['duration'],
+                    'cached': result['cached'],
+                    'error': result['error']
+                }
+                for name, result in self.runner.results.items()
+            },
             'assessment': self.get_quality_assessment(overall_score),
             'recommendations': self.get_recommendations(),
             'phase_status': self.get_phase_status(overall_score)
@@ -655,11 +590,24 @@ def main():
         default=9.0,
         help='Minimum acceptable score (default: 9.0)'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Quality tools run in parallel (default: CPU count)'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Rerun quality tools even if their inputs are unchanged'
+    )
     
     args = parser.parse_args()
     
     # Initialize quality assessment
-    qa = QualityAssessment()
+    index = ProjectIndex()
+    qa = QualityAssessment(index=index,
+                           runner=ToolRunner(index=index, max_workers=args.jobs, use_cache=not args.no_cache))
     qa.target_score = args.target
     qa.minimum_score = args.minimum
     
@@ -668,6 +616,7 @@ def main():
     
     # Save and display results
     qa.save_report(report)
+    qa.index.save()
     qa.print_summary(report)
     
     # Enforce quality gate if requested
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Quality Tool Runner for HX Infrastructure Ansible
+Runs each external quality tool once, in parallel, with results cached by input hash
+
+The quality assessment and the performance report both call ansible-lint,
+yamllint, pytest and friends. ToolRunner knows every tool invocation, the
+files it reads and what it waits for, runs the requested tools as a
+dependency graph on a worker pool capped at the CPU count, and stores each
+result under a hash of the command, the tool executable and the content of
+its inputs. Later callers in the same process, and later jobs of the same
+pipeline sharing .cache/, get the stored result instead of a second run.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from project_index import ProjectIndex
+
+
+# Bump whenever the stored result format changes
+CACHE_VERSION = 1
+
+# Files any Ansible-aware tool may read
+ANSIBLE_INPUTS = ['*.yml', '*.yaml', '*.j2', '*.cfg', '*.py', 'inventories/*']
+
+# Tests read the roles and scripts they cover as well as their own code
+TEST_INPUTS = ANSIBLE_INPUTS + ['tests/*', '*.ini', '*.toml', 'requirements*.txt']
+
+# Each tool: command, directory to run in (relative to the project root),
+# files it reads (globs on the path relative to the root), the tools it
+# waits for when they are run together, and whether its duration is scored
+# (timed tools run alone, so other tools do not skew the timing)
+TOOLS = {
+    'mkdocs_build': {
+        'command': ['mkdocs', 'build', '--strict'],
+        'cwd': 'docs_site',
+        'inputs': ['docs_site/mkdocs.yml', 'docs_site/docs/*']
+    },
+    'markdownlint': {
+        'command': ['markdownlint-cli2', '**/*.md'],
+        'inputs': ['*.md', '.markdownlint.json']
+    },
+    'pytest_unit': {
+        'command': ['python', '-m', 'pytest', 'tests/unit/', '--tb=short'],
+        'inputs': TEST_INPUTS
+    },
+    'pytest_security': {
+        'command': ['python', '-m', 'pytest', 'tests/security/', '--tb=short'],
+        'inputs': TEST_INPUTS
+    },
+    'syntax_check': {
+        'command': ['ansible-playbook', '--syntax-check', 'site.yml'],
+        'inputs': ANSIBLE_INPUTS
+    },
+    'bandit': {
+        'command': ['bandit', '-r', '.', '-f', 'json'],
+        'inputs': ['*.py', '.bandit']
+    },
+    'ansible_lint': {
+        'command': ['ansible-lint', '--format', 'json', '.'],
+        'inputs': ANSIBLE_INPUTS + ['.ansible-lint'],
+        'timed': True
+    },
+    'yamllint': {
+        'command': ['yamllint', '.'],
+        'inputs': ['*.yml', '*.yaml', '.yamllint']
+    },
+    # Benchmarks run after the other tools, so those do not skew their timings
+    'pytest_performance': {
+        'command': ['python', '-m', 'pytest', 'tests/performance/', '--tb=short'],
+        'inputs': TEST_INPUTS,
+        'after': ['mkdocs_build', 'markdownlint', 'pytest_unit', 'pytest_security', 'syntax_check',
+                  'bandit', 'ansible_lint', 'yamllint']
+    }
+}
+
+
+class ToolRunner:
+    """Runs registered tools as a dependency graph, each at most once per input state.
+
+    Results are dicts with the command, returncode, stdout, stderr, duration
+    (of the run that produced them), whether they came from the cache, and an
+    error message when the tool could not be run (returncode is then None).
+    """
+
+    def __init__(self, project_root: str = ".", tools: Optional[Dict[str, Dict[str, Any]]] = None,
+                 cache_dir: Optional[str] = None, max_workers: Optional[int] = None,
+                 index: Optional[ProjectIndex] = None, use_cache: bool = True):
+        self.project_root = Path(project_root)
+        self.tools = tools if tools is not None else TOOLS
+        self.index = index or ProjectIndex(project_root, use_cache=False)
+        self.cache_dir = None
+        if use_cache:
+            self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / '.cache' / 'tool-runs'
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.results = {}
+        self.stats = {'run': 0, 'from_cache': 0}
+        self._files = None
+        self._file_digests = {}
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+
+    def _project_files(self) -> List[str]:
+        """Paths relative to the root of every file in the index, walked once for all workers"""
+        with self._lock:
+            if self._files is None:
+                self._files = [path.relative_to(self.project_root).as_posix() for path in self.index.files()]
+        return self._files
+
+    def _file_digest(self, path: Path) -> str:
+        digest = self._file_digests.get(path)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            digest = self._file_digests[path] = sha.hexdigest()
+        return digest
+
+    def input_digest(self, name: str) -> Optional[str]:
+        """Hash of what the tool's output depends on, or None if its executable is missing"""
+        spec = self.tools[name]
+        executable = shutil.which(spec['command'][0])
+        if executable is None:
+            return None
+        stat = os.stat(executable)
+        sha = hashlib.sha256(json.dumps([spec['command'], spec.get('cwd', '.'), executable,
+                                         stat.st_mtime_ns, stat.st_size]).encode())
+        for relative in self._project_files():
+            if any(fnmatch.fnmatch(relative, pattern) for pattern in spec['inputs']):
+                sha.update(f"{relative}\0{self._file_digest(self.project_root / relative)}\0".encode())
+        return sha.hexdigest()
+
+    def _cache_file(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.json"
+
+    def _load_cached(self, name: str, digest: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_file(name), 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if cached.get('version') != CACHE_VERSION or cached.get('digest') != digest:
+            return None
+        return cached['result']
+
+    def _store(self, name: str, digest: str, result: Dict[str, Any]):
+        if not self.cache_dir:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), prefix=f".{name}-")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'digest': digest, 'result': result}, f)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self._cache_file(name))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _execute(self, name: str) -> Dict[str, Any]:
+        """Result of one tool, from the cache or by running it"""
+        spec = self.tools[name]
+        result = {'command': spec['command'], 'returncode': None, 'stdout': '', 'stderr': '',
+                  'duration': 0.0, 'cached': False, 'error': None}
+        digest = self.input_digest(name)
+        if digest is None:
+            result['error'] = f"{spec['command'][0]} not found"
+            return result
+
+        cached = self._load_cached(name, digest)
+        if cached is not None:
+            with self._lock:
+                self.stats['from_cache'] += 1
+            return dict(cached, cached=True)
+
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(spec['command'], cwd=self.project_root / spec.get('cwd', '.'),
+                                       capture_output=True, text=True)
+        except OSError as e:
+            result['error'] = str(e)
+            return result
+        result.update(returncode=completed.returncode, stdout=completed.stdout, stderr=completed.stderr,
+                      duration=round(time.perf_counter() - started, 3))
+        with self._lock:
+            self.stats['run'] += 1
+        self._store(name, digest, result)
+        return result
+
+    def run(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Results of the named tools, running those without one yet as a dependency graph.
+
+        A tool starts once every other requested tool it runs after has
+        finished; tools it runs after that were not requested are not run.
+        Timed tools start only when no other tool is running, and nothing
+        else starts until they finish.
+        """
+        names = list(names)
+        unknown = [name for name in names if name not in self.tools]
+        if unknown:
+            raise KeyError(f"Unknown tools: {', '.join(unknown)}")
+
+        with self._run_lock:
+            pending = [name for name in dict.fromkeys(names) if name not in self.results]
+            remaining = {name: set(self.tools[name].get('after', [])) & set(pending) for name in pending}
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending))) as executor:
+                    running = {}
+                    while remaining or running:
+                        ready = [name for name, waiting in remaining.items() if not waiting]
+                        timed = [name for name in ready if self.tools[name].get('timed')]
+                        if any(self.tools[name].get('timed') for name in running.values()):
+                            ready = []
+                        elif timed and not running:
+                            ready = timed[:1]
+                        else:
+                            ready = [name for name in ready if name not in timed]
+                        for name in ready:
+                            del remaining[name]
+                            running[executor.submit(self._execute, name)] = name
+                        if not running:
+                            raise ValueError(f"Tool dependency cycle among {', '.join(sorted(remaining))}")
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name = running.pop(future)
+                            self.results[name] = future.result()
+                            for waiting in remaining.values():
+                                waiting.discard(name)
+        return {name: self.results[name] for name in names}
+
+    def result(self, name: str) -> Dict[str, Any]:
+        """Result of one tool, running it (and what it runs after) if needed"""
+        return self.run([name])[name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run quality tools once, in parallel, with cached results')
+    parser.add_argument('tools', nargs='*', help=f"Tools to run (default: all of {', '.join(TOOLS)})")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Parallel tool runs (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Run every tool even if its inputs are unchanged')
+
+    args = parser.parse_args()
+
+    runner = ToolRunner(max_workers=args.jobs, use_cache=not args.no_cache)
+    started = time.perf_counter()
+    results = runner.run(args.tools or list(TOOLS))
+    for name, result in results.items():
+        outcome = result['error'] or f"exit {result['returncode']}"
+        source = 'cached' if result['cached'] else f"{result['duration']:.2f}s"
+        print(f"{name:20} {outcome:30} {source}")
+    print(f"{runner.stats['run']} tools run, {runner.stats['from_cache']} from cache "
+          f"in {time.perf_counter() - started:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Security Report Parsing Benchmark
+Sprint 2 - Advanced Capabilities Implementation
+
+Measures wall time and peak memory of collecting scan results from a synthetic
+result set (1 GB by default), comparing whole-document json.load parsing with
+the streaming parser, serially and with one worker process per tool.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import resource
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Any
+import logging
+
+from generate_security_report import SecurityReportGenerator, JSON_FINDING_PREFIXES, GENERIC_FINDING_KEYS
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Share of the result set written for each file; Grype output has no findings
+# the report understands and is only skipped over
+RESULT_FILES = {
+    'trivy-image.sarif': 0.35,
+    'trivy-fs.json': 0.20,
+    'grype-image.json': 0.15,
+    'snyk.json': 0.15,
+    'checkov-report.sarif': 0.10,
+    'bandit-report.json': 0.05
+}
+
+MODES = ['load', 'stream', 'stream_parallel']
+
+SEVERITIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(['package', 'overflow', 'remote', 'attacker', 'crafted', 'request',
+                                'allows', 'denial', 'service', 'memory', 'via', 'input'])
+                    for _ in range(words))
+
+
+def _sarif_rule(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        'id': f'CVE-2024-{i:05d}',
+        'shortDescription': {'text': _text(rng, 8)},
+        'fullDescription': {'text': _text(rng, 120)},
+        'help': {'text': _text(rng, 200), 'markdown': _text(rng, 200)},
+        'properties': {'security-severity': str(round(rng.uniform(1, 10), 1)), 'tags': ['vulnerability']}
+    }
+
+
+def _sarif_result(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        'ruleId': f'CVE-2024-{i:05d}',
+        'level': rng.choice(['error', 'warning', 'note']),
+        'message': {'text': _text(rng, 30)},
+        'locations': [{'physicalLocation': {'artifactLocation': {'uri': f'usr/lib/python3/pkg{i % 500}/__init__.py'},
+                                            'region': {'startLine': rng.randint(1, 900), 'startColumn': 1}}}]
+    }
+
+
+def _trivy_vulnerability(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        'VulnerabilityID': f'CVE-2023-{i:05d}',
+        'PkgName': f'lib{i % 300}',
+        'InstalledVersion': '1.2.3',
+        'FixedVersion': '1.2.4',
+        'Severity': rng.choice(SEVERITIES),
+        'Title': _text(rng, 10),
+        'Description': _text(rng, 150),
+        'CweIDs': [f'CWE-{rng.randint(20, 900)}'],
+        'CVSS': {'nvd': {'V3Score': round(rng.uniform(1, 10), 1)}},
+        'References': [f'https://example.invalid/advisory/{i}/{n}' for n in range(8)]
+    }
+
+
+def _grype_match(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        'vulnerability': {'id': f'GHSA-{i:08d}', 'severity': rng.choice(SEVERITIES),
+                          'description': _text(rng, 150), 'urls': [f'https://example.invalid/{i}']},
+        'artifact': {'name': f'lib{i % 300}', 'version': '0.9.1', 'locations': [{'path': f'/usr/lib/lib{i}.so'}]}
+    }
+
+
+def _snyk_vulnerability(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        'id': f'SNYK-PYTHON-{i:06d}',
+        'title': _text(rng, 6),
+        'description': _text(rng, 180),
+        'severity': rng.choice(SEVERITIES).lower(),
+        'packageName': f'pkg{i % 400}',
+        'identifiers': {'CVE': [f'CVE-2022-{i:05d}'], 'CWE': [f'CWE-{rng.randint(20, 900)}']},
+        'cvssScore': round(rng.uniform(1, 10), 1),
+        'remediation': {'advice': 'Upgrade to the latest version'}
+    }
+
+
+def _bandit_result(rng: random.Random, i: int) -> Dict[str, Any]:
+    return {
+        'test_id': f'B{rng.randint(101, 703)}',
+        'test_name': 'hardcoded_password_string',
+        'issue_text': _text(rng, 20),
+        'issue_severity': rng.choice(SEVERITIES[1:]),
+        'issue_cwe': {'id': rng.randint(20, 900)},
+        'filename': f'scripts/module{i % 200}.py',
+        'line_number': rng.randint(1, 500),
+        'col_offset': 4,
+        'code': _text(rng, 40),
+        'more_info': 'https://example.invalid/bandit'
+    }
+
+
+def _write_array(f, make_item, rng: random.Random, budget: int) -> int:
+    """Write array elements until about budget bytes; returns the number written"""
+    written = count = 0
+    f.write('[')
+    while written < budget:
+        text = json.dumps(make_item(rng, count))
+        f.write(text if count == 0 else ',\n' + text)
+        written += len(text) + 2
+        count += 1
+    f.write(']')
+    return count
+
+
+def build_result_set(results_dir: Path, size_bytes: int, seed: int = 0):
+    """Write synthetic tool output totalling about size_bytes, without holding it in memory"""
+    rng = random.Random(seed)
+    results_dir.mkdir(parents=True, exist_ok=True)
+    for name, share in RESULT_FILES.items():
+        budget = int(size_bytes * share)
+        with open(results_dir / name, 'w') as f:
+            if name.endswith('.sarif'):
+                driver = 'Trivy' if name.startswith('trivy') else 'Checkov'
+                f.write('{"version": "2.1.0", "runs": [{"tool": {"driver": {"name": "%s", "rules": ' % driver)
+                _write_array(f, _sarif_rule, rng, budget // 2)
+                f.write('}}, "results": ')
+                _write_array(f, _sarif_result, rng, budget // 2)
+                f.write('}]}')
+            elif name.startswith('trivy'):
+                f.write('{"SchemaVersion": 2, "Results": [{"Target": "hx-app:latest (debian 12)", "Vulnerabilities": ')
+                _write_array(f, _trivy_vulnerability, rng, budget)
+                f.write('}]}')
+            elif name.startswith('grype'):
+                f.write('{"matches": ')
+                _write_array(f, _grype_match, rng, budget)
+                f.write('}')
+            elif name.startswith('snyk'):
+                f.write('{"ok": false, "vulnerabilities": ')
+                _write_array(f, _snyk_vulnerability, rng, budget)
+                f.write('}')
+            else:
+                f.write('{"errors": [], "results": ')
+                _write_array(f, _bandit_result, rng, budget)
+                f.write('}')
+
+
+def collect_with_json_load(generator: SecurityReportGenerator) -> int:
+    """The original approach: json.load each file whole, one tool after another"""
+    count = 0
+    for tool_id, files in generator.find_result_files().items():
+        for result_file in files:
+            with open(result_file, 'r') as f:
+                data = json.load(f)
+            if result_file.endswith('.sarif'):
+                for run in data.get('runs', []):
+                    tool_name = run.get('tool', {}).get('driver', {}).get('name', tool_id)
+                    count += sum(1 for result in run.get('results', [])
+                                 if generator._sarif_finding(result, tool_name))
+            elif tool_id == 'trivy':
+                for result in data.get('Results', []):
+                    count += sum(1 for vuln in result.get('Vulnerabilities', [])
+                                 if generator._trivy_finding(vuln, result.get('Target', 'unknown')))
+            elif tool_id in JSON_FINDING_PREFIXES:
+                key = JSON_FINDING_PREFIXES[tool_id][0].split('.')[0]
+                convert = getattr(generator, f'_{tool_id}_finding')
+                count += sum(1 for item in data.get(key, []) if convert(item))
+            else:
+                for key in GENERIC_FINDING_KEYS:
+                    if isinstance(data.get(key), list):
+                        count += sum(1 for item in data[key] if generator._generic_finding(item, tool_id))
+                        break
+            del data
+    return count
+
+
+def measure(mode: str, results_dir: Path) -> Dict[str, Any]:
+    """Collect results once in this process and report time and peak memory"""
+    os.chdir(results_dir)
+    generator = SecurityReportGenerator()
+    started = time.perf_counter()
+    if mode == 'load':
+        findings = collect_with_json_load(generator)
+    else:
+        generator.collect_scan_results(workers=1 if mode == 'stream' else len(RESULT_FILES))
+        findings = len(generator.report_data['vulnerabilities'])
+    seconds = time.perf_counter() - started
+    # ru_maxrss is in KiB on Linux
+    return {
+        'seconds': round(seconds, 3),
+        'findings': findings,
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'worker_peak_rss_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1)
+    }
+
+
+def run_mode(mode: str, results_dir: Path) -> Dict[str, Any]:
+    """measure() in a fresh interpreter, so each mode's peak memory is its own"""
+    completed = subprocess.run(
+        [sys.executable, __file__, '--measure', mode, '--results-dir', str(results_dir)],
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        # json.load of the largest files can exhaust memory on small hosts
+        return {'error': completed.stderr.strip().splitlines()[-1:] or [f'exit status {completed.returncode}']}
+    return json.loads(completed.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Security Report Parsing Benchmark")
+    parser.add_argument("--size-mb", type=int, default=1024, help="Size of the synthetic result set")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="Parsing approaches to measure")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per mode")
+    parser.add_argument("--output", help="Output file for the results (JSON, default: benchmark_results/)")
+    parser.add_argument("--measure", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--results-dir", help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.ERROR)
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, Path(args.results_dir))))
+        return
+
+    work_dir = Path(tempfile.mkdtemp(prefix="hx-security-report-bench-"))
+    results = {}
+    try:
+        started = time.perf_counter()
+        build_result_set(work_dir, args.size_mb * 1024 * 1024)
+        total = sum(path.stat().st_size for path in work_dir.iterdir())
+        print(f"Wrote {total / 1024 ** 2:.0f} MB of synthetic results in {time.perf_counter() - started:.1f}s")
+
+        for mode in args.modes:
+            runs = [run_mode(mode, work_dir) for _ in range(args.repeat)]
+            failed = [run['error'] for run in runs if 'error' in run]
+            if failed:
+                results[f"security_report_parsing_{mode}_error"] = failed[0]
+                print(f"{mode:<16} failed: {failed[0]}")
+                continue
+            peaks = [max(run['peak_rss_mb'], run['worker_peak_rss_mb']) for run in runs]
+            seconds = [run['seconds'] for run in runs]
+            results[f"security_report_parsing_{mode}_seconds"] = {
+                "samples": seconds, "median": statistics.median(seconds), "unit": "seconds"}
+            results[f"security_report_parsing_{mode}_peak_rss"] = {
+                "samples": peaks, "median": statistics.median(peaks), "unit": "MB"}
+            results[f"security_report_parsing_{mode}_findings"] = runs[0]['findings']
+            print(f"{mode:<16} median {statistics.median(seconds):.1f}s, "
+                  f"peak RSS {statistics.median(peaks):.0f} MB, {runs[0]['findings']} findings")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "benchmark_timestamp": time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+        "benchmark": "security_report_parsing",
+        "parameters": {"size_mb": args.size_mb, "result_files": RESULT_FILES, "modes": args.modes,
+                       "repeat": args.repeat, "cpu_count": os.cpu_count()},
+        "results": results
+    }
+
+    output = Path(args.output) if args.output else \
+        PROJECT_ROOT / "benchmark_results" / f"security_report_benchmark_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Benchmark results saved to: {output}")
+
+if __name__ == "__main__":
+    main()
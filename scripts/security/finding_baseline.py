@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Security Findings Baseline
+Sprint 2 - Advanced Capabilities Implementation
+
+Records findings the team has already triaged, by fingerprint, so the
+security gate can evaluate only what is new since the baseline instead of
+re-litigating known findings on every build. Each entry keeps when the finding
+was first and last seen, whether it is accepted (a known, tolerated risk) or
+suppressed (not applicable), the reason, and an optional expiry after which
+it counts as new again.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional
+import logging
+
+from finding_dedup import fingerprint
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BASELINE_VERSION = 1
+
+DEFAULT_BASELINE_FILE = 'security-baseline.json'
+
+ACTIVE_STATUSES = ('accepted', 'suppressed')
+
+
+def finding_fingerprint(finding: Dict[str, Any]) -> str:
+    """The fingerprint the report assigned, or one computed for reports from before deduplication"""
+    return finding.get('fingerprint') or fingerprint(finding)
+
+
+def as_utc(moment: datetime) -> datetime:
+    """The moment as an aware UTC datetime; naive values are taken to be UTC"""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def utc_now(now: Optional[datetime] = None) -> datetime:
+    return as_utc(now) if now else datetime.now(timezone.utc)
+
+
+def parse_time(value: Optional[str]) -> Optional[datetime]:
+    """ISO date or date-time; a bare date means the start of that day, no offset means UTC"""
+    return as_utc(datetime.fromisoformat(value)) if value else None
+
+
+class FindingBaseline:
+    """Triaged findings keyed by fingerprint, stored as JSON.
+
+    Lookups are one dict access per finding, so classifying thousands of
+    findings costs no more than reading them.
+    """
+
+    def __init__(self, path: str = DEFAULT_BASELINE_FILE):
+        self.path = Path(path)
+        self.data = {'version': BASELINE_VERSION, 'updated_at': None, 'findings': {}}
+        if self.path.exists():
+            self.load()
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        return self.data['findings']
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != BASELINE_VERSION:
+            raise ValueError(f"Unsupported baseline version in {self.path}: {data.get('version')}")
+        self.data = data
+        logger.info(f"Loaded {len(self.entries)} baseline entries from {self.path}")
+
+    def save(self):
+        """Write the baseline atomically, sorted by fingerprint so it diffs cleanly in review"""
+        self.data['updated_at'] = utc_now().isoformat()
+        self.data['findings'] = dict(sorted(self.entries.items()))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix='.security-baseline-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.data, f, indent=2)
+                f.write('\n')
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logger.info(f"Saved {len(self.entries)} baseline entries to {self.path}")
+
+    @staticmethod
+    def is_active(entry: Dict[str, Any], now: Optional[datetime] = None) -> bool:
+        """Whether the entry still exempts its finding from the gate"""
+        if entry.get('status') not in ACTIVE_STATUSES:
+            return False
+        expires = parse_time(entry.get('expires'))
+        return expires is None or expires > utc_now(now)
+
+    def classify(self, finding: Dict[str, Any], now: Optional[datetime] = None) -> str:
+        """'new', 'accepted', 'suppressed', or 'expired' for a baselined finding whose exemption lapsed"""
+        entry = self.entries.get(finding_fingerprint(finding))
+        if entry is None:
+            return 'new'
+        if not self.is_active(entry, now):
+            return 'expired'
+        return entry['status']
+
+    def partition(self, findings: Iterable[Dict[str, Any]],
+                  now: Optional[datetime] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """Findings grouped by classify()"""
+        now = utc_now(now)
+        groups = {'new': [], 'accepted': [], 'suppressed': [], 'expired': []}
+        for finding in findings:
+            groups[self.classify(finding, now)].append(finding)
+        return groups
+
+    def accept(self, findings: Iterable[Dict[str, Any]], status: str = 'accepted', reason: Optional[str] = None,
+               expires: Optional[str] = None, now: Optional[datetime] = None) -> int:
+        """Add findings to the baseline, or update their entries; returns how many were not in it yet"""
+        if status not in ACTIVE_STATUSES:
+            raise ValueError(f"Status must be one of {', '.join(ACTIVE_STATUSES)}: {status}")
+        if expires:
+            expires = parse_time(expires).isoformat()
+        seen_at = utc_now(now).isoformat()
+        added = 0
+        for finding in findings:
+            key = finding_fingerprint(finding)
+            entry = self.entries.get(key)
+            if entry is None:
+                added += 1
+                entry = self.entries[key] = {'first_seen': seen_at}
+            locations = finding.get('locations') or [{}]
+            entry.update({
+                'last_seen': seen_at,
+                'status': status,
+                'reason': reason,
+                'expires': expires,
+                'id': finding.get('id'),
+                'severity': finding.get('severity'),
+                'tools': finding.get('tools') or [finding.get('tool')],
+                'package': finding.get('package'),
+                'location': locations[0].get('file')
+            })
+        return added
+
+    def expire(self, fingerprints: Optional[Iterable[str]] = None, now: Optional[datetime] = None) -> int:
+        """Mark entries expired, so their findings count as new again; returns how many changed.
+
+        Without fingerprints, every active entry whose expiry date has passed is marked.
+        """
+        now = utc_now(now)
+        if fingerprints is None:
+            keys = [key for key, entry in self.entries.items()
+                    if entry.get('status') in ACTIVE_STATUSES and not self.is_active(entry, now)]
+        else:
+            keys = [key for key in fingerprints if key in self.entries]
+        for key in keys:
+            self.entries[key]['status'] = 'expired'
+            self.entries[key]['expires'] = now.isoformat()
+        return len(keys)
+
+    def diff(self, other: 'FindingBaseline') -> Dict[str, List[str]]:
+        """Fingerprints added in, removed from, or with a changed status or expiry in the other baseline"""
+        return {
+            'added': sorted(other.entries.keys() - self.entries.keys()),
+            'removed': sorted(self.entries.keys() - other.entries.keys()),
+            'changed': sorted(key for key in self.entries.keys() & other.entries.keys()
+                              if (self.entries[key].get('status'), self.entries[key].get('expires')) !=
+                              (other.entries[key].get('status'), other.entries[key].get('expires')))
+        }
+
+    def fixed(self, findings: List[Dict[str, Any]], now: Optional[datetime] = None) -> List[str]:
+        """Fingerprints of exempted findings the report no longer has"""
+        now = utc_now(now)
+        present = {finding_fingerprint(finding) for finding in findings}
+        return sorted(key for key, entry in self.entries.items()
+                      if key not in present and self.is_active(entry, now))
+
+    def diff_report(self, findings: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """Findings of a report not exempted by the baseline, and exempted findings the report no longer has"""
+        now = utc_now(now)
+        return {
+            'new': sorted(finding_fingerprint(finding) for finding in findings
+                          if self.classify(finding, now) in ('new', 'expired')),
+            'fixed': self.fixed(findings, now)
+        }
+
+
+def load_report_findings(report_file: str) -> List[Dict[str, Any]]:
+    with open(report_file, 'r') as f:
+        return json.load(f).get('vulnerabilities', [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the security findings baseline")
+    parser.add_argument("--baseline", default=os.getenv('SECURITY_BASELINE_FILE', DEFAULT_BASELINE_FILE),
+                        help="Baseline file (default: $SECURITY_BASELINE_FILE or security-baseline.json)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    accept = commands.add_parser("accept", help="Add findings from a report to the baseline")
+    accept.add_argument("--report", default="security-report.json", help="Security report to take findings from")
+    accept.add_argument("--fingerprint", action="append",
+                        help="Only accept these findings (repeatable; default: every finding in the report)")
+    accept.add_argument("--status", choices=ACTIVE_STATUSES, default="accepted",
+                        help="accepted: known risk; suppressed: not applicable")
+    accept.add_argument("--reason", help="Why the findings are accepted or suppressed")
+    accept.add_argument("--expires", help="ISO date or date-time, UTC unless it has an offset, after which the findings count as new again")
+
+    expire = commands.add_parser("expire", help="Expire baseline entries")
+    expire.add_argument("--fingerprint", action="append",
+                        help="Entries to expire now (repeatable; default: entries past their expiry date)")
+
+    diff = commands.add_parser("diff", help="Compare the baseline with a report or another baseline")
+    target = diff.add_mutually_exclusive_group(required=True)
+    target.add_argument("--report", help="Security report: list new and fixed findings")
+    target.add_argument("--against", help="Other baseline: list added, removed and changed entries")
+
+    args = parser.parse_args()
+    baseline = FindingBaseline(args.baseline)
+
+    if args.command == "accept":
+        findings = load_report_findings(args.report)
+        if args.fingerprint:
+            wanted = set(args.fingerprint)
+            findings = [finding for finding in findings if finding_fingerprint(finding) in wanted]
+        added = baseline.accept(findings, args.status, args.reason, args.expires)
+        baseline.save()
+        print(f"{len(findings)} findings {args.status} ({added} new to the baseline)")
+    elif args.command == "expire":
+        expired = baseline.expire(args.fingerprint)
+        baseline.save()
+        print(f"{expired} baseline entries expired")
+    else:
+        if args.report:
+            changes = baseline.diff_report(load_report_findings(args.report))
+        else:
+            changes = baseline.diff(FindingBaseline(args.against))
+        print(json.dumps(changes, indent=2))
+        sys.exit(1 if changes.get('new') else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Security Finding Deduplication
+Sprint 2 - Advanced Capabilities Implementation
+
+Trivy, Grype, Snyk and Safety regularly report the same CVE on the same
+package. Findings are reduced to a fingerprint of (rule/CVE, package, version,
+location) and merged through a hash index in one pass, keeping which tools
+reported each one.
+"""
+
+import re
+import hashlib
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+SEVERITY_ORDER = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+CVE_PATTERN = re.compile(r'CVE-\d{4}-\d{4,}', re.IGNORECASE)
+GHSA_PATTERN = re.compile(r'GHSA(?:-[23456789cfghjmpqrvwx]{4}){3}', re.IGNORECASE)
+
+
+def normalize_rule(finding: Dict[str, Any]) -> str:
+    """The finding's CVE (or GHSA) when it has one, so advisories from different tools agree"""
+    candidates = [str(finding.get('id') or '')] + [str(alias) for alias in finding.get('aliases') or []]
+    for pattern in (CVE_PATTERN, GHSA_PATTERN):
+        for candidate in candidates:
+            match = pattern.search(candidate)
+            if match:
+                return match.group().upper()
+    return str(finding.get('id') or 'unknown').strip().lower()
+
+
+def normalize_package(package: Optional[str]) -> str:
+    """Lower-case with runs of '-', '_' and '.' collapsed, as PyPI compares names"""
+    return re.sub(r'[-_.]+', '-', package.strip().lower()) if package else ''
+
+
+def normalize_version(version: Optional[str]) -> str:
+    version = str(version).strip().lower() if version else ''
+    return version[1:] if version.startswith('v') and version[1:2].isdigit() else version
+
+
+def normalize_location(finding: Dict[str, Any]) -> str:
+    """File and line of a code finding; dependency findings are identified by their package instead
+
+    Each tool reports a dependency against something different (image target,
+    manifest, the package itself), so for them the location would only keep
+    true duplicates apart.
+    """
+    if finding.get('package'):
+        return ''
+    locations = finding.get('locations') or [{}]
+    path = str(locations[0].get('file') or '').replace('\\', '/')
+    while path.startswith('./'):
+        path = path[2:]
+    return f"{path}:{locations[0].get('line') or 0}"
+
+
+def fingerprint_key(finding: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    return (normalize_rule(finding), normalize_package(finding.get('package')),
+            normalize_version(finding.get('version')), normalize_location(finding))
+
+
+def fingerprint(finding: Dict[str, Any]) -> str:
+    """Stable identifier of a finding across tools and runs"""
+    return hashlib.sha256('\x1f'.join(fingerprint_key(finding)).encode()).hexdigest()[:32]
+
+
+class FindingIndex:
+    """Merge findings sharing a fingerprint, in one pass over the findings."""
+
+    def __init__(self):
+        self.index = {}
+        self.raw_count = 0
+
+    def add(self, finding: Dict[str, Any]):
+        self.raw_count += 1
+        key = fingerprint(finding)
+        provenance = {
+            'tool': finding.get('tool'),
+            'id': finding.get('id'),
+            'severity': finding.get('severity')
+        }
+        merged = self.index.get(key)
+        if merged is None:
+            merged = dict(finding, fingerprint=key, tools=[finding.get('tool')],
+                          provenance=[provenance], cwe=list(finding.get('cwe') or []))
+            self.index[key] = merged
+            return
+
+        merged['provenance'].append(provenance)
+        if finding.get('tool') not in merged['tools']:
+            merged['tools'].append(finding.get('tool'))
+        # Keep the most severe rating any tool gave
+        if SEVERITY_ORDER.get(finding.get('severity'), 1) > SEVERITY_ORDER.get(merged.get('severity'), 1):
+            merged['severity'] = finding['severity']
+        if finding.get('cvss_score') is not None and \
+                (merged.get('cvss_score') is None or finding['cvss_score'] > merged['cvss_score']):
+            merged['cvss_score'] = finding['cvss_score']
+        for cwe in finding.get('cwe') or []:
+            if cwe not in merged['cwe']:
+                merged['cwe'].append(cwe)
+        for field in ('remediation', 'description'):
+            if not merged.get(field) and finding.get(field):
+                merged[field] = finding[field]
+
+    def add_all(self, findings: Iterable[Dict[str, Any]]):
+        for finding in findings:
+            self.add(finding)
+
+    def findings(self) -> List[Dict[str, Any]]:
+        """Merged findings in the order they were first seen"""
+        return list(self.index.values())
+
+    @property
+    def duplicate_count(self) -> int:
+        return self.raw_count - len(self.index)
+
+
+def deduplicate(findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    index = FindingIndex()
+    index.add_all(findings)
+    return index.findings()
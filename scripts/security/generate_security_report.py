@@ -10,15 +10,21 @@ comprehensive security reports in HTML and JSON formats.
 
 import json
 import os
+import re
 import sys
 import glob
+import argparse
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
 import logging
 from jinja2 import Template
 
+from streaming_json import iter_items, START_ARRAY
+from finding_dedup import FindingIndex
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +32,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Where findings live in each tool's JSON output, as streaming reader prefixes
+JSON_FINDING_PREFIXES = {
+    'safety': ['vulnerabilities.item'],
+    'bandit': ['results.item'],
+    'trivy': ['Results.item.Target', 'Results.item.Vulnerabilities.item'],
+    'snyk': ['vulnerabilities.item'],
+    'grype': ['matches.item']
+}
+
+# Keys tried in order for tools without a dedicated parser
+GENERIC_FINDING_KEYS = ['vulnerabilities', 'issues', 'findings', 'results']
+
+SARIF_PREFIXES = ['runs.item.tool.driver.name', 'runs.item.results.item']
+
+# How Trivy and Grype name the affected package in SARIF result messages
+SARIF_PACKAGE_PATTERNS = [
+    re.compile(r'Package: (?P<package>\S+)\s+Installed Version: (?P<version>\S+)'),
+    re.compile(r'package: (?P<package>[^,\s]+), version (?P<version>[^\s,]+)')
+]
+
+
+def _collect_tool_results(tool_id: str, result_files: List[str]) -> Dict[str, Any]:
+    """Parse one tool's result files; runs in a worker process"""
+    return SecurityReportGenerator().collect_tool_results(tool_id, result_files)
+
+
 class SecurityReportGenerator:
     """Generates comprehensive security reports from multiple scan tools."""
     
@@ -95,263 +127,328 @@ class SecurityReportGenerator:
             }
         }
 
-    def collect_scan_results(self):
-        """Collect and parse results from all security scanning tools."""
-        logger.info("Collecting security scan results...")
-        
+    def find_result_files(self) -> Dict[str, List[str]]:
+        """Result files present for each tool, in tool order."""
+        result_files = {}
         for tool_id, config in self.tool_configs.items():
-            logger.info(f"Processing {config['name']} results...")
-            
-            tool_results = {
-                'name': config['name'],
-                'description': config['description'],
-                'executed': False,
-                'vulnerabilities': [],
-                'file_processed': None,
-                'errors': []
-            }
-            
-            # Find result files for this tool
-            result_files = []
+            files = []
             for pattern in config['file_patterns']:
-                result_files.extend(glob.glob(pattern, recursive=True))
-            
-            if result_files:
-                tool_results['executed'] = True
-                self.report_data['summary']['tools_executed'].append(config['name'])
+                files.extend(glob.glob(pattern, recursive=True))
+            result_files[tool_id] = files
+        return result_files
+
+    def collect_tool_results(self, tool_id: str, result_files: List[str]) -> Dict[str, Any]:
+        """Parse every result file of one tool."""
+        config = self.tool_configs[tool_id]
+        logger.info(f"Processing {config['name']} results...")
+        
+        tool_results = {
+            'name': config['name'],
+            'description': config['description'],
+            'executed': bool(result_files),
+            'vulnerabilities': [],
+            'file_processed': None,
+            'errors': []
+        }
+        
+        for result_file in result_files:
+            try:
+                logger.info(f"Processing file: {result_file}")
+                tool_results['file_processed'] = result_file
                 
-                for result_file in result_files:
-                    try:
-                        logger.info(f"Processing file: {result_file}")
-                        tool_results['file_processed'] = result_file
-                        
-                        if result_file.endswith('.sarif'):
-                            vulnerabilities = self._parse_sarif_file(result_file, tool_id)
-                        elif result_file.endswith('.json'):
-                            vulnerabilities = self._parse_json_file(result_file, tool_id)
-                        else:
-                            continue
-                        
-                        tool_results['vulnerabilities'].extend(vulnerabilities)
-                        self.report_data['vulnerabilities'].extend(vulnerabilities)
-                        
-                    except Exception as e:
-                        error_msg = f"Error processing {result_file}: {str(e)}"
-                        logger.error(error_msg)
-                        tool_results['errors'].append(error_msg)
-            
+                if result_file.endswith('.sarif'):
+                    vulnerabilities = self._parse_sarif_file(result_file, tool_id)
+                elif result_file.endswith('.json'):
+                    vulnerabilities = self._parse_json_file(result_file, tool_id)
+                else:
+                    continue
+                
+                tool_results['vulnerabilities'].extend(vulnerabilities)
+                
+            except Exception as e:
+                error_msg = f"Error processing {result_file}: {str(e)}"
+                logger.error(error_msg)
+                tool_results['errors'].append(error_msg)
+        
+        return tool_results
+
+    def collect_scan_results(self, workers: Optional[int] = None):
+        """Collect and parse results from all security scanning tools.
+        
+        Tools are parsed concurrently in worker processes; results are merged
+        in tool order, so the report does not depend on which finishes first.
+        """
+        logger.info("Collecting security scan results...")
+        
+        result_files = self.find_result_files()
+        found = [tool_id for tool_id, files in result_files.items() if files]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(found))
+        
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {tool_id: pool.submit(_collect_tool_results, tool_id, result_files[tool_id])
+                           for tool_id in found}
+                collected = {tool_id: future.result() for tool_id, future in futures.items()}
+        else:
+            collected = {tool_id: self.collect_tool_results(tool_id, result_files[tool_id])
+                         for tool_id in found}
+        
+        # Tools overlap (the same CVE on the same package from Trivy, Grype and
+        # Snyk); the report lists each finding once with every tool that found it
+        findings = FindingIndex()
+        for tool_id in self.tool_configs:
+            tool_results = collected.get(tool_id) or self.collect_tool_results(tool_id, [])
+            if tool_results['executed']:
+                self.report_data['summary']['tools_executed'].append(tool_results['name'])
+            findings.add_all(tool_results['vulnerabilities'])
             self.report_data['tool_results'][tool_id] = tool_results
+        self.report_data['vulnerabilities'] = findings.findings()
+        logger.info(f"Merged {findings.raw_count} findings into {len(self.report_data['vulnerabilities'])} "
+                    f"({findings.duplicate_count} reported by more than one tool)")
 
     def _parse_sarif_file(self, file_path: str, tool_id: str) -> List[Dict[str, Any]]:
         """Parse SARIF format security scan results."""
-        vulnerabilities = []
-        
         try:
-            with open(file_path, 'r') as f:
-                sarif_data = json.load(f)
-            
-            for run in sarif_data.get('runs', []):
-                tool_name = run.get('tool', {}).get('driver', {}).get('name', tool_id)
-                
-                for result in run.get('results', []):
-                    vulnerability = {
-                        'id': result.get('ruleId', 'unknown'),
-                        'title': result.get('message', {}).get('text', 'No title'),
-                        'description': result.get('message', {}).get('text', 'No description'),
-                        'severity': self._normalize_severity(result.get('level', 'info')),
-                        'tool': tool_name,
-                        'category': result.get('kind', 'vulnerability'),
-                        'locations': [],
-                        'cwe': [],
-                        'cvss_score': None,
-                        'remediation': None
-                    }
-                    
-                    # Extract locations
-                    for location in result.get('locations', []):
-                        physical_location = location.get('physicalLocation', {})
-                        artifact_location = physical_location.get('artifactLocation', {})
-                        region = physical_location.get('region', {})
-                        
-                        vulnerability['locations'].append({
-                            'file': artifact_location.get('uri', 'unknown'),
-                            'line': region.get('startLine', 0),
-                            'column': region.get('startColumn', 0)
-                        })
-                    
-                    # Extract CWE information
-                    for property_bag in result.get('properties', {}).values():
-                        if isinstance(property_bag, dict) and 'cwe' in property_bag:
-                            vulnerability['cwe'].append(property_bag['cwe'])
-                    
-                    vulnerabilities.append(vulnerability)
-                    
+            return list(self._iter_sarif_findings(file_path, tool_id))
         except Exception as e:
             logger.error(f"Error parsing SARIF file {file_path}: {e}")
             raise
+
+    def _iter_sarif_findings(self, file_path: str, tool_id: str) -> Iterator[Dict[str, Any]]:
+        """Stream findings out of a SARIF file one result at a time."""
+        tool_name = tool_id
+        for prefix, value in iter_items(file_path, SARIF_PREFIXES):
+            if value is START_ARRAY:
+                continue
+            if prefix == 'runs.item.tool.driver.name':
+                tool_name = value
+            else:
+                yield self._sarif_finding(value, tool_name)
+
+    def _sarif_finding(self, result: Dict[str, Any], tool_name: str) -> Dict[str, Any]:
+        """Convert one SARIF result."""
+        vulnerability = {
+            'id': result.get('ruleId', 'unknown'),
+            'title': result.get('message', {}).get('text', 'No title'),
+            'description': result.get('message', {}).get('text', 'No description'),
+            'severity': self._normalize_severity(result.get('level', 'info')),
+            'tool': tool_name,
+            'category': result.get('kind', 'vulnerability'),
+            'locations': [],
+            'cwe': [],
+            'cvss_score': None,
+            'remediation': None
+        }
+        
+        # Extract locations
+        for location in result.get('locations', []):
+            physical_location = location.get('physicalLocation', {})
+            artifact_location = physical_location.get('artifactLocation', {})
+            region = physical_location.get('region', {})
+            
+            vulnerability['locations'].append({
+                'file': artifact_location.get('uri', 'unknown'),
+                'line': region.get('startLine', 0),
+                'column': region.get('startColumn', 0)
+            })
+        
+        # Extract CWE information
+        for property_bag in result.get('properties', {}).values():
+            if isinstance(property_bag, dict) and 'cwe' in property_bag:
+                vulnerability['cwe'].append(property_bag['cwe'])
+        
+        # Dependency scanners only name the package in the message
+        for pattern in SARIF_PACKAGE_PATTERNS:
+            match = pattern.search(vulnerability['description'])
+            if match:
+                vulnerability['package'] = match.group('package')
+                vulnerability['version'] = match.group('version')
+                break
         
-        return vulnerabilities
+        return vulnerability
 
     def _parse_json_file(self, file_path: str, tool_id: str) -> List[Dict[str, Any]]:
         """Parse JSON format security scan results."""
-        vulnerabilities = []
-        
         try:
-            with open(file_path, 'r') as f:
-                json_data = json.load(f)
-            
-            # Handle different JSON structures based on tool
-            if tool_id == 'safety':
-                vulnerabilities = self._parse_safety_json(json_data)
-            elif tool_id == 'bandit':
-                vulnerabilities = self._parse_bandit_json(json_data)
-            elif tool_id == 'trivy':
-                vulnerabilities = self._parse_trivy_json(json_data)
-            elif tool_id == 'snyk':
-                vulnerabilities = self._parse_snyk_json(json_data)
-            else:
-                # Generic JSON parsing
-                vulnerabilities = self._parse_generic_json(json_data, tool_id)
-                
+            if tool_id in JSON_FINDING_PREFIXES:
+                return list(self._iter_json_findings(file_path, tool_id))
+            # Generic JSON parsing
+            return self._parse_generic_json(file_path, tool_id)
         except Exception as e:
             logger.error(f"Error parsing JSON file {file_path}: {e}")
             raise
-        
-        return vulnerabilities
-
-    def _parse_safety_json(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse Safety tool JSON results."""
-        vulnerabilities = []
-        
-        for vuln in data.get('vulnerabilities', []):
-            vulnerability = {
-                'id': vuln.get('id', 'unknown'),
-                'title': vuln.get('advisory', 'Unknown vulnerability'),
-                'description': vuln.get('advisory', 'No description available'),
-                'severity': self._normalize_severity(vuln.get('severity', 'medium')),
-                'tool': 'Safety',
-                'category': 'dependency',
-                'locations': [{
-                    'file': vuln.get('package_name', 'unknown'),
-                    'line': 0,
-                    'column': 0
-                }],
-                'cwe': [],
-                'cvss_score': vuln.get('cvss_score'),
-                'remediation': f"Update {vuln.get('package_name')} to version {vuln.get('safe_versions', 'latest')}"
-            }
-            vulnerabilities.append(vulnerability)
-        
-        return vulnerabilities
-
-    def _parse_bandit_json(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse Bandit tool JSON results."""
-        vulnerabilities = []
-        
-        for result in data.get('results', []):
-            vulnerability = {
-                'id': result.get('test_id', 'unknown'),
-                'title': result.get('test_name', 'Unknown issue'),
-                'description': result.get('issue_text', 'No description available'),
-                'severity': self._normalize_severity(result.get('issue_severity', 'medium')),
-                'tool': 'Bandit',
-                'category': 'code_quality',
-                'locations': [{
-                    'file': result.get('filename', 'unknown'),
-                    'line': result.get('line_number', 0),
-                    'column': result.get('col_offset', 0)
-                }],
-                'cwe': [result.get('issue_cwe', {}).get('id')] if result.get('issue_cwe') else [],
-                'cvss_score': None,
-                'remediation': result.get('more_info', 'Review code for security issues')
-            }
-            vulnerabilities.append(vulnerability)
-        
-        return vulnerabilities
 
-    def _parse_trivy_json(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse Trivy tool JSON results."""
-        vulnerabilities = []
-        
-        for result in data.get('Results', []):
-            target = result.get('Target', 'unknown')
-            
-            for vuln in result.get('Vulnerabilities', []):
-                vulnerability = {
-                    'id': vuln.get('VulnerabilityID', 'unknown'),
-                    'title': vuln.get('Title', 'Unknown vulnerability'),
-                    'description': vuln.get('Description', 'No description available'),
-                    'severity': self._normalize_severity(vuln.get('Severity', 'medium')),
-                    'tool': 'Trivy',
-                    'category': 'vulnerability',
-                    'locations': [{
-                        'file': target,
-                        'line': 0,
-                        'column': 0
-                    }],
-                    'cwe': vuln.get('CweIDs', []),
-                    'cvss_score': vuln.get('CVSS', {}).get('nvd', {}).get('V3Score'),
-                    'remediation': vuln.get('FixedVersion', 'Update to latest version')
-                }
-                vulnerabilities.append(vulnerability)
-        
-        return vulnerabilities
-
-    def _parse_snyk_json(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse Snyk tool JSON results."""
-        vulnerabilities = []
-        
-        for vuln in data.get('vulnerabilities', []):
-            vulnerability = {
-                'id': vuln.get('id', 'unknown'),
-                'title': vuln.get('title', 'Unknown vulnerability'),
-                'description': vuln.get('description', 'No description available'),
-                'severity': self._normalize_severity(vuln.get('severity', 'medium')),
-                'tool': 'Snyk',
-                'category': 'dependency',
-                'locations': [{
-                    'file': vuln.get('packageName', 'unknown'),
-                    'line': 0,
-                    'column': 0
-                }],
-                'cwe': vuln.get('identifiers', {}).get('CWE', []),
-                'cvss_score': vuln.get('cvssScore'),
-                'remediation': vuln.get('remediation', {}).get('advice', 'Update dependency')
-            }
-            vulnerabilities.append(vulnerability)
-        
-        return vulnerabilities
-
-    def _parse_generic_json(self, data: Dict[str, Any], tool_id: str) -> List[Dict[str, Any]]:
-        """Parse generic JSON format results."""
-        vulnerabilities = []
-        
-        # Try to find vulnerabilities in common JSON structures
-        vuln_keys = ['vulnerabilities', 'issues', 'findings', 'results']
-        
-        for key in vuln_keys:
-            if key in data and isinstance(data[key], list):
-                for item in data[key]:
-                    vulnerability = {
-                        'id': item.get('id', item.get('rule_id', 'unknown')),
-                        'title': item.get('title', item.get('message', 'Unknown issue')),
-                        'description': item.get('description', item.get('message', 'No description')),
-                        'severity': self._normalize_severity(item.get('severity', 'medium')),
-                        'tool': tool_id.title(),
-                        'category': item.get('category', 'security'),
-                        'locations': [{
-                            'file': item.get('file', item.get('filename', 'unknown')),
-                            'line': item.get('line', item.get('line_number', 0)),
-                            'column': item.get('column', 0)
-                        }],
-                        'cwe': item.get('cwe', []),
-                        'cvss_score': item.get('cvss_score'),
-                        'remediation': item.get('remediation', 'Review and fix issue')
-                    }
-                    vulnerabilities.append(vulnerability)
-                break
+    def _iter_json_findings(self, file_path: str, tool_id: str) -> Iterator[Dict[str, Any]]:
+        """Stream findings out of a tool's JSON output one item at a time."""
+        convert = {
+            'safety': self._safety_finding,
+            'bandit': self._bandit_finding,
+            'snyk': self._snyk_finding,
+            'grype': self._grype_finding
+        }.get(tool_id)
+        # Trivy names each result's target ahead of its vulnerabilities
+        target = 'unknown'
+        for prefix, value in iter_items(file_path, JSON_FINDING_PREFIXES[tool_id]):
+            if value is START_ARRAY:
+                continue
+            if prefix == 'Results.item.Target':
+                target = value
+            elif tool_id == 'trivy':
+                yield self._trivy_finding(value, target)
+            else:
+                yield convert(value)
+
+    def _safety_finding(self, vuln: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one Safety vulnerability."""
+        return {
+            'id': vuln.get('id', 'unknown'),
+            'title': vuln.get('advisory', 'Unknown vulnerability'),
+            'description': vuln.get('advisory', 'No description available'),
+            'severity': self._normalize_severity(vuln.get('severity', 'medium')),
+            'tool': 'Safety',
+            'category': 'dependency',
+            'locations': [{
+                'file': vuln.get('package_name', 'unknown'),
+                'line': 0,
+                'column': 0
+            }],
+            'cwe': [],
+            'cvss_score': vuln.get('cvss_score'),
+            'remediation': f"Update {vuln.get('package_name')} to version {vuln.get('safe_versions', 'latest')}",
+            'package': vuln.get('package_name'),
+            'version': vuln.get('analyzed_version'),
+            'aliases': [vuln['CVE']] if vuln.get('CVE') else []
+        }
+
+    def _bandit_finding(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one Bandit result."""
+        return {
+            'id': result.get('test_id', 'unknown'),
+            'title': result.get('test_name', 'Unknown issue'),
+            'description': result.get('issue_text', 'No description available'),
+            'severity': self._normalize_severity(result.get('issue_severity', 'medium')),
+            'tool': 'Bandit',
+            'category': 'code_quality',
+            'locations': [{
+                'file': result.get('filename', 'unknown'),
+                'line': result.get('line_number', 0),
+                'column': result.get('col_offset', 0)
+            }],
+            'cwe': [result.get('issue_cwe', {}).get('id')] if result.get('issue_cwe') else [],
+            'cvss_score': None,
+            'remediation': result.get('more_info', 'Review code for security issues')
+        }
+
+    def _trivy_finding(self, vuln: Dict[str, Any], target: str) -> Dict[str, Any]:
+        """Convert one Trivy vulnerability found in a target."""
+        return {
+            'id': vuln.get('VulnerabilityID', 'unknown'),
+            'title': vuln.get('Title', 'Unknown vulnerability'),
+            'description': vuln.get('Description', 'No description available'),
+            'severity': self._normalize_severity(vuln.get('Severity', 'medium')),
+            'tool': 'Trivy',
+            'category': 'vulnerability',
+            'locations': [{
+                'file': target,
+                'line': 0,
+                'column': 0
+            }],
+            'cwe': vuln.get('CweIDs', []),
+            'cvss_score': vuln.get('CVSS', {}).get('nvd', {}).get('V3Score'),
+            'remediation': vuln.get('FixedVersion', 'Update to latest version'),
+            'package': vuln.get('PkgName'),
+            'version': vuln.get('InstalledVersion'),
+            'aliases': vuln.get('VendorIDs', [])
+        }
+
+    def _snyk_finding(self, vuln: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one Snyk vulnerability."""
+        return {
+            'id': vuln.get('id', 'unknown'),
+            'title': vuln.get('title', 'Unknown vulnerability'),
+            'description': vuln.get('description', 'No description available'),
+            'severity': self._normalize_severity(vuln.get('severity', 'medium')),
+            'tool': 'Snyk',
+            'category': 'dependency',
+            'locations': [{
+                'file': vuln.get('packageName', 'unknown'),
+                'line': 0,
+                'column': 0
+            }],
+            'cwe': vuln.get('identifiers', {}).get('CWE', []),
+            'cvss_score': vuln.get('cvssScore'),
+            'remediation': vuln.get('remediation', {}).get('advice', 'Update dependency'),
+            'package': vuln.get('packageName'),
+            'version': vuln.get('version'),
+            'aliases': vuln.get('identifiers', {}).get('CVE', []) + vuln.get('identifiers', {}).get('GHSA', [])
+        }
+
+    def _grype_finding(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert one Grype match."""
+        vuln = match.get('vulnerability', {})
+        artifact = match.get('artifact', {})
+        locations = artifact.get('locations') or [{}]
+        cvss_scores = [cvss.get('metrics', {}).get('baseScore') for cvss in vuln.get('cvss', [])]
+        fix_versions = vuln.get('fix', {}).get('versions', [])
+        return {
+            'id': vuln.get('id', 'unknown'),
+            'title': f"{vuln.get('id', 'unknown')} in {artifact.get('name', 'unknown')}",
+            'description': vuln.get('description', 'No description available'),
+            'severity': self._normalize_severity(vuln.get('severity', 'medium')),
+            'tool': 'Grype',
+            'category': 'vulnerability',
+            'locations': [{
+                'file': locations[0].get('path', 'unknown'),
+                'line': 0,
+                'column': 0
+            }],
+            'cwe': [],
+            'cvss_score': max((score for score in cvss_scores if score is not None), default=None),
+            'remediation': f"Update to {', '.join(fix_versions)}" if fix_versions else 'Update to latest version',
+            'package': artifact.get('name'),
+            'version': artifact.get('version'),
+            'aliases': [related.get('id') for related in match.get('relatedVulnerabilities', []) if related.get('id')]
+        }
+
+    def _parse_generic_json(self, file_path: str, tool_id: str) -> List[Dict[str, Any]]:
+        """Parse generic JSON format results.
         
-        return vulnerabilities
+        Findings come from the first of GENERIC_FINDING_KEYS holding a list,
+        so items under the other keys are streamed but set aside.
+        """
+        found = {}
+        prefixes = {f"{key}.item": key for key in GENERIC_FINDING_KEYS}
+        for prefix, value in iter_items(file_path, prefixes):
+            if value is START_ARRAY:
+                found.setdefault(prefix, [])
+            else:
+                found.setdefault(prefixes[prefix], []).append(self._generic_finding(value, tool_id))
+        
+        for key in GENERIC_FINDING_KEYS:
+            if key in found:
+                return found[key]
+        return []
+
+    def _generic_finding(self, item: Dict[str, Any], tool_id: str) -> Dict[str, Any]:
+        """Convert one finding from a common JSON structure."""
+        return {
+            'id': item.get('id', item.get('rule_id', 'unknown')),
+            'title': item.get('title', item.get('message', 'Unknown issue')),
+            'description': item.get('description', item.get('message', 'No description')),
+            'severity': self._normalize_severity(item.get('severity', 'medium')),
+            'tool': tool_id.title(),
+            'category': item.get('category', 'security'),
+            'locations': [{
+                'file': item.get('file', item.get('filename', 'unknown')),
+                'line': item.get('line', item.get('line_number', 0)),
+                'column': item.get('column', 0)
+            }],
+            'cwe': item.get('cwe', []),
+            'cvss_score': item.get('cvss_score'),
+            'remediation': item.get('remediation', 'Review and fix issue')
+        }
 
     def _normalize_severity(self, severity: str) -> str:
         """Normalize severity levels across different tools."""
@@ -383,12 +480,24 @@ class SecurityReportGenerator:
             if severity in severity_counts:
                 severity_counts[severity] += 1
         
+        # The same counts before merging findings reported by several tools
+        raw_counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0}
+        for tool_result in self.report_data['tool_results'].values():
+            for vuln in tool_result['vulnerabilities']:
+                severity = vuln.get('severity', 'medium')
+                if severity in raw_counts:
+                    raw_counts[severity] += 1
+        raw_total = sum(len(tool_result['vulnerabilities'])
+                        for tool_result in self.report_data['tool_results'].values())
+        
         self.report_data['summary'].update({
             'total_vulnerabilities': len(self.report_data['vulnerabilities']),
             'critical_count': severity_counts['critical'],
             'high_count': severity_counts['high'],
             'medium_count': severity_counts['medium'],
-            'low_count': severity_counts['low']
+            'low_count': severity_counts['low'],
+            'raw_counts': dict(raw_counts, total=raw_total),
+            'duplicates_merged': raw_total - len(self.report_data['vulnerabilities'])
         })
         
         # Calculate scan coverage
@@ -534,6 +643,9 @@ class SecurityReportGenerator:
             <div class="summary-card">
                 <h3>Total</h3>
                 <div class="number">{{ report_data.summary.total_vulnerabilities }}</div>
+                {% if report_data.summary.duplicates_merged %}
+                <p>{{ report_data.summary.raw_counts.total }} reported, {{ report_data.summary.duplicates_merged }} duplicates merged</p>
+                {% endif %}
             </div>
         </div>
 
@@ -558,7 +670,7 @@ class SecurityReportGenerator:
                 <div class="meta">
                     <strong>ID:</strong> {{ vuln.id }} | 
                     <strong>Severity:</strong> {{ vuln.severity.title() }} | 
-                    <strong>Tool:</strong> {{ vuln.tool }} | 
+                    <strong>Tool:</strong> {{ vuln.tools | join(', ') if vuln.tools else vuln.tool }} | 
                     <strong>Category:</strong> {{ vuln.category }}
                     {% if vuln.cvss_score %}
                     | <strong>CVSS:</strong> {{ vuln.cvss_score }}
@@ -652,6 +764,8 @@ class SecurityReportGenerator:
 | 🟢 Low | {summary['low_count']} |
 | **Total** | **{summary['total_vulnerabilities']}** |
 
+{summary['raw_counts']['total']} findings reported across tools, {summary['duplicates_merged']} duplicates merged.
+
 ### 🛠️ Tools Executed
 **Coverage:** {summary['scan_coverage']['executed_tools']}/{summary['scan_coverage']['total_tools']} tools ({summary['scan_coverage']['coverage_percentage']:.1f}%)
 
@@ -692,12 +806,12 @@ class SecurityReportGenerator:
             logger.error(f"Error generating markdown summary: {e}")
             raise
 
-    def generate_all_reports(self):
+    def generate_all_reports(self, workers: Optional[int] = None):
         """Generate all report formats."""
         logger.info("Generating comprehensive security reports...")
         
         # Collect scan results
-        self.collect_scan_results()
+        self.collect_scan_results(workers)
         
         # Calculate statistics
         self.calculate_summary_statistics()
@@ -722,7 +836,8 @@ class SecurityReportGenerator:
         print("\n" + "="*60)
         print("SECURITY SCAN SUMMARY")
         print("="*60)
-        print(f"Total Vulnerabilities: {summary['total_vulnerabilities']}")
+        print(f"Total Vulnerabilities: {summary['total_vulnerabilities']} "
+              f"({summary['raw_counts']['total']} reported, {summary['duplicates_merged']} duplicates merged)")
         print(f"  Critical: {summary['critical_count']}")
         print(f"  High: {summary['high_count']}")
         print(f"  Medium: {summary['medium_count']}")
@@ -743,11 +858,16 @@ class SecurityReportGenerator:
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Security Report Generation")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                       help="Worker processes for parsing different tools' results (1 = serial)")
+    args = parser.parse_args()
+    
     logger.info("Starting Security Report Generation")
     
     try:
         generator = SecurityReportGenerator()
-        generator.generate_all_reports()
+        generator.generate_all_reports(args.workers)
         
         # Exit with appropriate code based on critical vulnerabilities
         critical_count = generator.report_data['summary']['critical_count']
@@ -12,9 +12,11 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Optional
 import logging
 
+from finding_baseline import FindingBaseline
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,7 +27,7 @@ logger = logging.getLogger(__name__)
 class SecurityGate:
     """Security quality gate evaluator."""
     
-    def __init__(self):
+    def __init__(self, baseline_file: Optional[str] = None, new_only: Optional[bool] = None):
         # Load thresholds from environment variables
         self.thresholds = {
             'max_critical_vulnerabilities': int(os.getenv('MAX_CRITICAL_VULNERABILITIES', '0')),
@@ -34,6 +36,13 @@ class SecurityGate:
             'min_scan_coverage': float(os.getenv('MIN_SCAN_COVERAGE', '80.0')),
             'required_tools': os.getenv('REQUIRED_SECURITY_TOOLS', 'trivy,kics').split(',')
         }
+
+        # With a baseline, thresholds can apply to findings new since it was taken
+        baseline_file = baseline_file or os.getenv('SECURITY_BASELINE_FILE')
+        if new_only is None:
+            new_only = os.getenv('SECURITY_GATE_NEW_ONLY', 'false').lower() == 'true'
+        self.baseline = FindingBaseline(baseline_file) if baseline_file else None
+        self.new_only = new_only and self.baseline is not None
         
         self.gate_result = {
             'status': 'UNKNOWN',
@@ -43,19 +52,25 @@ class SecurityGate:
                 'high': 0,
                 'medium': 0,
                 'low': 0,
-                'total': 0
+                'total': 0,
+                'raw': {},
+                'duplicates_merged': 0
             },
             'scan_coverage': {
                 'executed_tools': [],
                 'coverage_percentage': 0.0,
                 'missing_tools': []
             },
+            'baseline': None,
             'violations': [],
             'recommendations': [],
             'details': {}
         }
         
         logger.info(f"Security gate thresholds: {self.thresholds}")
+        if self.baseline:
+            logger.info(f"Security baseline: {self.baseline.path} "
+                        f"({'new findings only' if self.new_only else 'for reference'})")
 
     def load_security_report(self, report_file: str = 'security-report.json') -> Dict[str, Any]:
         """Load security report data."""
@@ -80,14 +95,28 @@ class SecurityGate:
         summary = report_data.get('summary', {})
         violations = []
         
-        # Extract vulnerability counts
-        self.gate_result['vulnerabilities'] = {
+        # Extract vulnerability counts; thresholds apply to deduplicated findings,
+        # the per-tool (raw) counts are kept for reference
+        counts = {
             'critical': summary.get('critical_count', 0),
             'high': summary.get('high_count', 0),
             'medium': summary.get('medium_count', 0),
             'low': summary.get('low_count', 0),
             'total': summary.get('total_vulnerabilities', 0)
         }
+        # Reports from before deduplication have no raw counts; theirs are the same
+        raw_counts = summary.get('raw_counts', dict(counts))
+        self.gate_result['vulnerabilities'] = dict(
+            counts,
+            raw=raw_counts,
+            duplicates_merged=summary.get('duplicates_merged', raw_counts.get('total', 0) - counts['total'])
+        )
+
+        if self.baseline:
+            new_counts = self.evaluate_baseline(report_data.get('vulnerabilities', []))
+            if self.new_only:
+                self.gate_result['vulnerabilities'].update(new_counts)
+        scope = 'new ' if self.new_only else ''
         
         # Check critical vulnerabilities
         critical_count = self.gate_result['vulnerabilities']['critical']
@@ -95,7 +124,7 @@ class SecurityGate:
             violation = {
                 'type': 'critical_vulnerabilities',
                 'severity': 'critical',
-                'message': f"Critical vulnerabilities ({critical_count}) exceed threshold ({self.thresholds['max_critical_vulnerabilities']})",
+                'message': f"Critical {scope}vulnerabilities ({critical_count}) exceed threshold ({self.thresholds['max_critical_vulnerabilities']})",
                 'current_value': critical_count,
                 'threshold': self.thresholds['max_critical_vulnerabilities'],
                 'blocking': True
@@ -109,7 +138,7 @@ class SecurityGate:
             violation = {
                 'type': 'high_vulnerabilities',
                 'severity': 'high',
-                'message': f"High vulnerabilities ({high_count}) exceed threshold ({self.thresholds['max_high_vulnerabilities']})",
+                'message': f"High {scope}vulnerabilities ({high_count}) exceed threshold ({self.thresholds['max_high_vulnerabilities']})",
                 'current_value': high_count,
                 'threshold': self.thresholds['max_high_vulnerabilities'],
                 'blocking': True
@@ -123,7 +152,7 @@ class SecurityGate:
             violation = {
                 'type': 'medium_vulnerabilities',
                 'severity': 'medium',
-                'message': f"Medium vulnerabilities ({medium_count}) exceed threshold ({self.thresholds['max_medium_vulnerabilities']})",
+                'message': f"Medium {scope}vulnerabilities ({medium_count}) exceed threshold ({self.thresholds['max_medium_vulnerabilities']})",
                 'current_value': medium_count,
                 'threshold': self.thresholds['max_medium_vulnerabilities'],
                 'blocking': False  # Medium violations are warnings, not blocking
@@ -137,6 +166,39 @@ class SecurityGate:
         
         return passed, violations
 
+    def evaluate_baseline(self, findings: list) -> Dict[str, int]:
+        """Classify findings against the baseline; returns severity counts of those not exempted by it."""
+        logger.info("Evaluating findings against the baseline...")
+
+        groups = self.baseline.partition(findings)
+        # A finding whose baseline entry expired is back under the gate
+        gated = groups['new'] + groups['expired']
+        counts = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'total': len(gated)}
+        for finding in gated:
+            severity = finding.get('severity', 'low').lower()
+            if severity in ('critical', 'high', 'medium', 'low'):
+                counts[severity] += 1
+
+        self.gate_result['baseline'] = {
+            'file': str(self.baseline.path),
+            'new_only': self.new_only,
+            'new': len(groups['new']),
+            'accepted': len(groups['accepted']),
+            'suppressed': len(groups['suppressed']),
+            'expired': len(groups['expired']),
+            'fixed': len(self.baseline.fixed(findings)),
+            'new_findings': [
+                {
+                    'fingerprint': finding.get('fingerprint'),
+                    'id': finding.get('id'),
+                    'severity': finding.get('severity'),
+                    'tools': finding.get('tools', [finding.get('tool')])
+                }
+                for finding in gated
+            ]
+        }
+        return counts
+
     def evaluate_scan_coverage(self, report_data: Dict[str, Any]) -> Tuple[bool, list]:
         """Evaluate security scan coverage."""
         logger.info("Evaluating scan coverage...")
@@ -366,6 +428,18 @@ class SecurityGate:
         print(f"  High: {self.gate_result['vulnerabilities']['high']} (max: {self.thresholds['max_high_vulnerabilities']})")
         print(f"  Medium: {self.gate_result['vulnerabilities']['medium']} (max: {self.thresholds['max_medium_vulnerabilities']})")
         print(f"  Total: {self.gate_result['vulnerabilities']['total']}")
+        raw_counts = self.gate_result['vulnerabilities']['raw']
+        if self.gate_result['vulnerabilities']['duplicates_merged']:
+            print(f"  Reported by tools: {raw_counts.get('total', 0)} (critical {raw_counts.get('critical', 0)}, "
+                  f"high {raw_counts.get('high', 0)}, medium {raw_counts.get('medium', 0)}; "
+                  f"{self.gate_result['vulnerabilities']['duplicates_merged']} duplicates merged)")
+        
+        baseline = self.gate_result['baseline']
+        if baseline:
+            scope = "gated on new findings" if baseline['new_only'] else "for reference"
+            print(f"\nBaseline ({baseline['file']}, {scope}):")
+            print(f"  New: {baseline['new']}  Expired: {baseline['expired']}  Accepted: {baseline['accepted']}  "
+                  f"Suppressed: {baseline['suppressed']}  Fixed: {baseline['fixed']}")
         
         print(f"\nScan Coverage:")
         print(f"  Coverage: {self.gate_result['scan_coverage']['coverage_percentage']:.1f}% (min: {self.thresholds['min_scan_coverage']}%)")
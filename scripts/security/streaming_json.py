@@ -0,0 +1,189 @@
+"""
+Streaming JSON Reader
+Sprint 2 - Advanced Capabilities Implementation
+
+Yields selected values from large JSON and SARIF documents one at a time, so
+scan results of hundreds of MB are parsed without materializing the whole
+document. Values off the requested paths are decoded an array element at a
+time and dropped, so memory is bounded by the largest element rather than
+the whole file.
+"""
+
+import re
+import json
+from typing import IO, Any, Iterable, Iterator, Set, Tuple
+
+CHUNK_SIZE = 1 << 20
+
+# Emitted for an array on the way to a requested prefix, before its elements
+START_ARRAY = object()
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+
+
+class StreamingJSONReader:
+    """Pull selected values out of a JSON text stream by dotted prefix.
+
+    Prefixes name object keys separated by dots, with 'item' standing for each
+    element of an array: 'runs.item.results.item' yields every SARIF result.
+    """
+
+    def __init__(self, stream: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int = 0) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text; False at end of input"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(size, self.chunk_size))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"{message} near: {self.buffer[self.pos:self.pos + 40]!r}")
+
+    def _peek(self) -> str:
+        """Next non-whitespace character without consuming it; '' at end of input"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise self._error(f"Expected {char!r}")
+        self.pos += 1
+
+    def _decode(self) -> Any:
+        """Decode the complete value at the current position"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value; read at least as much again as is buffered so
+                # very large values are re-scanned a logarithmic number of times
+                if self._fill(len(self.buffer) - self.pos):
+                    continue
+                raise
+            # A number running into the end of the buffer may continue in the next chunk
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and \
+                    NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def _members(self) -> Iterator[str]:
+        """Consume an object, yielding each key once the position is at its value.
+
+        The caller must consume the value before asking for the next key.
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise self._error("Expected an object key")
+            self._expect(':')
+            yield key
+            char = self._peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise self._error("Expected ',' or '}'")
+
+    def _elements(self) -> Iterator[None]:
+        """Consume an array, yielding once the position is at each element.
+
+        The caller must consume the element before asking for the next one.
+        """
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield
+            char = self._peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise self._error("Expected ',' or ']'")
+
+    def _skip(self):
+        """Step over the value at the current position.
+
+        Array elements are decoded and dropped one at a time: the C decoder is
+        several times faster than scanning the text in Python, and only one
+        element is held at once.
+        """
+        char = self._peek()
+        if char == '{':
+            for _ in self._members():
+                self._skip()
+        elif char == '[':
+            for _ in self._elements():
+                self._decode()
+        else:
+            self._decode()
+
+    def items(self, prefixes: Iterable[str]) -> Iterator[Tuple[str, Any]]:
+        """Yield (prefix, value) for each value at one of the prefixes, in document order.
+
+        Arrays on the way to a prefix are announced with (path, START_ARRAY)
+        so callers can tell an empty array from a missing key.
+        """
+        targets = set(prefixes)
+        parents = set()
+        for target in targets:
+            parts = target.split('.')
+            parents.update('.'.join(parts[:i]) for i in range(len(parts)))
+        yield from self._walk('', targets, parents)
+        if self._peek():
+            raise self._error("Extra data after JSON document")
+
+    def _walk(self, path: str, targets: Set[str], parents: Set[str]) -> Iterator[Tuple[str, Any]]:
+        if path in targets:
+            yield path, self._decode()
+            return
+        if path not in parents:
+            self._skip()
+            return
+
+        char = self._peek()
+        if char == '{':
+            for key in self._members():
+                yield from self._walk(f"{path}.{key}" if path else key, targets, parents)
+        elif char == '[':
+            yield path, START_ARRAY
+            item = f"{path}.item" if path else 'item'
+            wanted = item in targets
+            for _ in self._elements():
+                if wanted:
+                    yield item, self._decode()
+                else:
+                    yield from self._walk(item, targets, parents)
+        else:
+            # A scalar where a container was expected holds nothing we want
+            self._decode()
+
+
+def iter_items(file_path: str, prefixes: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+    """StreamingJSONReader.items over a file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from StreamingJSONReader(f, chunk_size).items(prefixes)
@@ -13,6 +13,8 @@ from typing import Dict, List, Any
 from jinja2 import Environment, FileSystemLoader, meta
 from datetime import datetime
 
+from project_index import ProjectIndex
+
 class TemplateDocGenerator:
     def __init__(self, base_path: str = "."):
         self.base_path = Path(base_path)
@@ -259,15 +261,18 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Generate template documentation")
-    parser.add_argument("--templates", required=True, help="File containing template list")
+    parser.add_argument("--templates", help="File containing template list (default: every *.j2 under the base path)")
     parser.add_argument("--output", default="docs/templates", help="Output directory")
     parser.add_argument("--base-path", default=".", help="Base path for templates")
     
     args = parser.parse_args()
     
-    # Read template list
-    with open(args.templates, 'r') as f:
-        templates = [line.strip() for line in f if line.strip()]
+    # Read template list, or take every template in the project index
+    if args.templates:
+        with open(args.templates, 'r') as f:
+            templates = [line.strip() for line in f if line.strip()]
+    else:
+        templates = [str(path) for path in ProjectIndex(args.base_path, use_cache=False).templates()]
     
     # Generate documentation
     generator = TemplateDocGenerator(args.base_path)
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Template Render Profiler for Ansible Jinja2 Templates
+Renders every role template against a realistic context and reports where render time goes
+
+Contexts come from the structure jinja2schema infers for each template, with
+lists of a chosen length and every condition true so all branches render, or
+from the real inventory, group_vars, host_vars and role variables of one
+host, with inferred values only for names those leave undefined. Each
+template is rendered several times; the report gives its median render time,
+output size and allocation peak, flags the slowest, and is written in the
+benchmark_results format so the performance gate tracks it over time.
+"""
+
+import os
+import sys
+import json
+import time
+import yaml
+import argparse
+import statistics
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from jinja2 import Environment, FileSystemLoader, ChainableUndefined, meta, nodes, exceptions
+from jinja2.visitor import NodeTransformer
+from jinja2schema import Config, infer_from_ast
+from jinja2schema.exceptions import InferException
+from jinja2schema.model import Dictionary, List as ListVariable, Tuple as TupleVariable, Boolean, Number
+
+from project_index import ProjectIndex
+
+DEFAULT_RUNS = 10
+DEFAULT_LIST_SIZE = 3
+SLOWEST_TEMPLATES = 10
+
+# Ansible renders templates with these extensions and trim_blocks
+EXTENSIONS = ['jinja2.ext.do', 'jinja2.ext.loopcontrols']
+
+# Filters and tests jinja2schema can infer through; others are rewritten away
+SCHEMA_FILTERS = frozenset([
+    'abs', 'striptags', 'capitalize', 'center', 'escape', 'filesizeformat', 'float', 'forceescape',
+    'format', 'indent', 'int', 'replace', 'round', 'safe', 'string', 'title', 'trim', 'truncate',
+    'upper', 'urlencode', 'urlize', 'wordcount', 'wordwrap', 'e', 'batch', 'slice', 'default', 'd',
+    'dictsort', 'join', 'first', 'last', 'random', 'length', 'sum', 'groupby', 'map', 'reject',
+    'rejectattr', 'select', 'selectattr', 'sort', 'list', 'pprint', 'xmlattr'
+])
+SCHEMA_TESTS = frozenset([
+    'divisibleby', 'escaped', 'even', 'lower', 'odd', 'upper', 'defined', 'undefined', 'equalto',
+    'iterable', 'mapping', 'none', 'number', 'sameas', 'sequence', 'string'
+])
+
+# Conditions stay untyped, so "{% if items %}{% for item in items %}" infers a list
+SCHEMA_CONFIG = Config(BOOLEAN_CONDITIONS=False)
+
+
+def _to_json(value, **kwargs):
+    return json.dumps(value, default=str, **kwargs)
+
+
+def _to_nice_json(value, indent=4, **kwargs):
+    return json.dumps(value, default=str, indent=indent, sort_keys=True, **kwargs)
+
+
+def _to_yaml(value, **kwargs):
+    return yaml.safe_dump(value, allow_unicode=True, **kwargs)
+
+
+def _to_nice_yaml(value, indent=4, **kwargs):
+    return yaml.safe_dump(value, indent=indent, allow_unicode=True, default_flow_style=False, **kwargs)
+
+
+def _bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('yes', 'on', '1', 'true', 't', 'y')
+    return bool(value)
+
+
+def _ternary(value, true_value, false_value, none_value=None):
+    if value is None and none_value is not None:
+        return none_value
+    return true_value if value else false_value
+
+
+def _comment(text, style='plain', decoration='# '):
+    return '\n'.join(f"{decoration}{line}".rstrip() for line in str(text).splitlines())
+
+
+def _strftime(string_format, second=None):
+    return time.strftime(string_format, time.localtime(second))
+
+
+def _version(value, version, operator='eq'):
+    def parts(v):
+        return [int(part) if part.isdigit() else part for part in str(v).replace('-', '.').split('.')]
+    operators = {'eq': '__eq__', '==': '__eq__', 'ne': '__ne__', '!=': '__ne__', 'lt': '__lt__', '<': '__lt__',
+                 'le': '__le__', '<=': '__le__', 'gt': '__gt__', '>': '__gt__', 'ge': '__ge__', '>=': '__ge__'}
+    try:
+        return getattr(parts(value), operators[operator])(parts(version))
+    except TypeError:
+        return False
+
+
+# Stand-ins for the Ansible filters and tests role templates use, when Ansible is not installed
+FALLBACK_FILTERS = {
+    'to_json': _to_json, 'to_nice_json': _to_nice_json, 'to_yaml': _to_yaml, 'to_nice_yaml': _to_nice_yaml,
+    'bool': _bool, 'ternary': _ternary, 'comment': _comment, 'strftime': _strftime
+}
+FALLBACK_TESTS = {'version': _version, 'version_compare': _version}
+
+
+def ansible_environment(loader=None) -> Environment:
+    """Environment configured like Ansible's templar, with its filters and tests"""
+    env = Environment(loader=loader, undefined=ChainableUndefined, extensions=EXTENSIONS,
+                      trim_blocks=True, keep_trailing_newline=True)
+    try:
+        from ansible.plugins.filter.core import FilterModule
+        from ansible.plugins.test.core import TestModule
+        env.filters.update(FilterModule().filters())
+        env.tests.update(TestModule().tests())
+    except ImportError:
+        env.filters.update(FALLBACK_FILTERS)
+        env.tests.update(FALLBACK_TESTS)
+    return env
+
+
+class SchemaRewriter(NodeTransformer):
+    """Rewrites what jinja2schema cannot infer through into expressions it can.
+
+    Unknown filters and tests become a string test of their operand, which
+    infers what the operand is built from but not its own type; where their
+    result must be a string that conflicts, so without keep_operands they
+    become a constant instead. On a loop's iterable an unknown filter is
+    dropped, as the value it filters must be a sequence. dict.items()
+    becomes dictsort, which infers the same mapping.
+    """
+
+    def __init__(self, keep_operands: bool = True):
+        self.keep_operands = keep_operands
+
+    def _unknown(self, node):
+        if self.keep_operands:
+            return nodes.Test(node.node, 'string', [], [], None, None, lineno=node.lineno)
+        return nodes.Const('', lineno=node.lineno)
+
+    def visit_For(self, node):
+        if isinstance(node.iter, nodes.Filter) and node.iter.name not in SCHEMA_FILTERS and node.iter.node is not None:
+            node.iter = node.iter.node
+        return self.generic_visit(node)
+
+    def visit_Filter(self, node):
+        node = self.generic_visit(node)
+        if node.name not in SCHEMA_FILTERS and node.node is not None:
+            return self._unknown(node)
+        return node
+
+    def visit_Test(self, node):
+        node = self.generic_visit(node)
+        if node.name not in SCHEMA_TESTS:
+            return self._unknown(node)
+        return node
+
+    def visit_Call(self, node):
+        node = self.generic_visit(node)
+        if isinstance(node.node, nodes.Getattr) and node.node.attr in ('items', 'iteritems') and not node.args:
+            return nodes.Filter(node.node.node, 'dictsort', [], [], None, None, lineno=node.lineno)
+        return node
+
+
+def sample_value(variable, list_size: int = DEFAULT_LIST_SIZE, name: str = 'value') -> Any:
+    """A value with the inferred structure: lists of list_size items, true booleans, strings named after their variable"""
+    if isinstance(variable, Dictionary):
+        if not variable.data:
+            # Only iterated or passed whole; give it list_size entries
+            return {f"{name}_{i}": name for i in range(list_size)}
+        return {key: sample_value(child, list_size, key) for key, child in variable.items()
+                if not child.used_with_default}
+    if isinstance(variable, ListVariable):
+        return [sample_value(variable.item, list_size, name) for _ in range(list_size)]
+    if isinstance(variable, TupleVariable):
+        return tuple(sample_value(item, list_size, name) for item in variable.items or ())
+    if isinstance(variable, Boolean):
+        return True
+    if isinstance(variable, Number):
+        return 1
+    return name
+
+
+def schema_context(env: Environment, source: str, list_size: int = DEFAULT_LIST_SIZE) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Context synthesized from the template's inferred schema, and why inference failed if it did.
+
+    Names the template reads that the schema does not cover (those only
+    passed to filters rewritten to constants, or all of them when inference
+    fails) get a string value.
+    """
+    ast = env.parse(source)
+    try:
+        undeclared = meta.find_undeclared_variables(ast)
+    except exceptions.TemplateAssertionError:
+        undeclared = set()
+
+    schema, error = Dictionary(), None
+    for keep_operands in (True, False):
+        try:
+            schema = infer_from_ast(SchemaRewriter(keep_operands).visit(env.parse(source)), config=SCHEMA_CONFIG)
+            error = None
+            break
+        except InferException as e:
+            error = str(e)
+
+    context = sample_value(schema, list_size) if schema.data else {}
+    for name in sorted(undeclared):
+        if name not in schema:
+            context[name] = name
+    return context, error
+
+
+def _merge(base: Dict[str, Any], override: Any) -> Dict[str, Any]:
+    """Later variable layers replace earlier ones key by key, as Ansible's default hash_behaviour does"""
+    if isinstance(override, dict):
+        base.update(override)
+    return base
+
+
+def resolve_templated(env: Environment, variables: Dict[str, Any], passes: int = 3) -> Dict[str, Any]:
+    """Render variable values that are themselves templates, as Ansible does lazily on use"""
+    def resolve(value):
+        if isinstance(value, str) and ('{{' in value or '{%' in value):
+            try:
+                return env.from_string(value).render(variables)
+            except Exception:
+                return value
+        if isinstance(value, dict):
+            return {key: resolve(child) for key, child in value.items()}
+        if isinstance(value, list):
+            return [resolve(child) for child in value]
+        return value
+
+    for _ in range(passes):
+        resolved = {key: resolve(value) for key, value in variables.items()}
+        if resolved == variables:
+            break
+        variables = resolved
+    return variables
+
+
+class Inventory:
+    """Groups, hosts and inline variables of a YAML inventory file"""
+
+    def __init__(self, index: ProjectIndex, path: Path):
+        self.path = path
+        self.groups = {}
+        self.children = {}
+        self.group_vars = {}
+        self.host_vars = {}
+        data = index.load(path) or {}
+        self._add_group('all', data.get('all', data))
+
+    def _add_group(self, name: str, data: Any):
+        data = data or {}
+        self.groups.setdefault(name, [])
+        self.children.setdefault(name, [])
+        _merge(self.group_vars.setdefault(name, {}), data.get('vars'))
+        for host, host_vars in (data.get('hosts') or {}).items():
+            if host not in self.groups[name]:
+                self.groups[name].append(host)
+            _merge(self.host_vars.setdefault(host, {}), host_vars)
+        for child, child_data in (data.get('children') or {}).items():
+            self.children[name].append(child)
+            self._add_group(child, child_data)
+
+    def host_groups(self, host: str) -> List[str]:
+        """Groups the host belongs to, parents before children, as Ansible orders their variables"""
+        ordered = []
+
+        def visit(group, depth):
+            members = set(self.groups[group])
+            below = []
+            for child in self.children[group]:
+                below.extend(visit(child, depth + 1))
+            if host in members or below:
+                ordered.append((depth, group))
+                return [group]
+            return []
+
+        visit('all', 0)
+        if not ordered:
+            raise ValueError(f"Host {host} is not in inventory {self.path}")
+        return [group for _, group in sorted(ordered, key=lambda entry: entry[0])]
+
+    def all_groups(self) -> Dict[str, List[str]]:
+        """Hosts of every group including those of its children, the 'groups' magic variable"""
+        def members(group):
+            hosts = list(self.groups[group])
+            for child in self.children[group]:
+                hosts.extend(host for host in members(child) if host not in hosts)
+            return hosts
+        return {group: members(group) for group in self.groups}
+
+
+def host_variables(index: ProjectIndex, inventory_path: Path, host: str) -> Dict[str, Any]:
+    """Inventory, group_vars and host_vars variables of one host, with Ansible's magic variables.
+
+    group_vars and host_vars are read next to the inventory file, next to
+    its directory (shared between environments here) and at the project root,
+    in increasing precedence.
+    """
+    inventory = Inventory(index, inventory_path)
+    groups = inventory.host_groups(host)
+    vars_roots = [inventory_path.parent.parent, inventory_path.parent, index.root]
+
+    def vars_files(kind, name):
+        paths = []
+        for root in vars_roots:
+            directory = root / kind
+            paths.extend(directory / f"{name}{suffix}" for suffix in ('', '.yml', '.yaml')
+                         if index.exists(directory / f"{name}{suffix}"))
+            if index.is_dir(directory / name):
+                paths.extend(sorted(index.yaml_files(under=[directory / name])))
+        return paths
+
+    variables = {}
+    for group in groups:
+        _merge(variables, inventory.group_vars.get(group))
+        for path in vars_files('group_vars', group):
+            _merge(variables, index.load(path))
+    _merge(variables, inventory.host_vars.get(host))
+    for path in vars_files('host_vars', host):
+        _merge(variables, index.load(path))
+
+    variables.update({
+        'inventory_hostname': host,
+        'inventory_hostname_short': host.split('.')[0],
+        'group_names': sorted(group for group in groups if group != 'all'),
+        'groups': inventory.all_groups(),
+        'hostvars': {name: dict(inventory.host_vars.get(name) or {}) for name in inventory.host_vars}
+    })
+    return variables
+
+
+class TemplateRenderProfiler:
+    """Renders role templates repeatedly against synthesized or real host contexts"""
+
+    def __init__(self, project_root: str = ".", runs: int = DEFAULT_RUNS, list_size: int = DEFAULT_LIST_SIZE,
+                 host: Optional[str] = None, inventory: Optional[str] = None,
+                 index: Optional[ProjectIndex] = None):
+        self.project_root = Path(project_root)
+        self.runs = max(1, runs)
+        self.list_size = list_size
+        self.host = host
+        self.index = index or ProjectIndex(project_root, use_cache=False)
+        self.inventory = Path(inventory) if inventory else self.project_root / 'inventories' / 'dev' / 'hosts.yml'
+        self._environments = {}
+        self._host_variables = None
+
+    def environment(self, templates_dir: Path) -> Environment:
+        """One environment per templates directory, so includes resolve and compiled templates are reused"""
+        if templates_dir not in self._environments:
+            self._environments[templates_dir] = ansible_environment(FileSystemLoader(str(templates_dir)))
+        return self._environments[templates_dir]
+
+    def templates(self) -> List[Path]:
+        """Every template under roles/*/templates"""
+        return self.index.templates(under=[role.path / 'templates' for role in self.index.roles()])
+
+    def context(self, env: Environment, source: str, role_path: Path) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Render context of one template and the schema inference error, if any"""
+        context, error = schema_context(env, source, self.list_size)
+        if self.host is None:
+            return context, error
+
+        role = self.index.role(role_path.name)
+        variables = _merge({}, role.defaults if role else None)
+        _merge(variables, self._host_variables)
+        _merge(variables, role.vars if role else None)
+        # Real variables win; inferred values only stand in for what the host leaves undefined
+        return resolve_templated(env, _merge(context, variables)), error
+
+    def measure(self, template, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Render timings over the configured runs, output size and the allocation peak of one render"""
+        samples = []
+        output = ''
+        for _ in range(self.runs):
+            started = time.perf_counter()
+            output = template.render(context)
+            samples.append(time.perf_counter() - started)
+
+        # A separate render, so tracing does not slow the timed ones
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            template.render(context)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        return {
+            "samples": [round(sample, 6) for sample in samples],
+            "median_ms": round(statistics.median(samples) * 1000, 3),
+            "min_ms": round(min(samples) * 1000, 3),
+            "output_bytes": len(output.encode('utf-8')),
+            "peak_bytes": max(peak - baseline, 0)
+        }
+
+    def profile_template(self, template_path: Path) -> Dict[str, Any]:
+        """Profile of one role template; templates that do not compile or render carry an error"""
+        templates_dir = next((parent for parent in template_path.parents if parent.name == 'templates'),
+                             template_path.parent)
+        env = self.environment(templates_dir)
+        result = {
+            "role": templates_dir.parent.name,
+            "context": "host" if self.host else "schema",
+            "schema_error": None,
+            "error": None
+        }
+        try:
+            source = self.index.text(template_path)
+            started = time.perf_counter()
+            template = env.get_template(template_path.relative_to(templates_dir).as_posix())
+            result["compile_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            context, result["schema_error"] = self.context(env, source, templates_dir.parent)
+            result.update(self.measure(template, context))
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    def profile(self, templates: Optional[List[Path]] = None, slowest: int = SLOWEST_TEMPLATES) -> Dict[str, Any]:
+        """Profiles of the templates (default: all role templates) and the slowest of them.
+
+        Raises ValueError when the chosen host is not in the inventory.
+        """
+        templates = self.templates() if templates is None else templates
+        if self.host is not None and self._host_variables is None:
+            self._host_variables = host_variables(self.index, self.inventory, self.host)
+        profiles = {}
+        for path in templates:
+            relative = os.path.relpath(path, self.project_root)
+            profiles[relative] = self.profile_template(Path(path))
+
+        rendered = {path: profile for path, profile in profiles.items() if profile["error"] is None}
+        ranked = sorted(rendered, key=lambda path: rendered[path]["median_ms"], reverse=True)
+        for path in ranked[:slowest]:
+            rendered[path]["slow"] = True
+
+        return {
+            "templates": profiles,
+            "slowest": ranked[:slowest],
+            "summary": {
+                "total_templates": len(profiles),
+                "rendered_templates": len(rendered),
+                "failed_templates": len(profiles) - len(rendered),
+                "schema_inferred": sum(1 for profile in rendered.values() if profile["schema_error"] is None),
+                "total_median_ms": round(sum(profile["median_ms"] for profile in rendered.values()), 3)
+            }
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ansible Template Render Profiler")
+    parser.add_argument("templates", nargs="*", help="Templates to profile (default: every roles/*/templates template)")
+    parser.add_argument("--base-path", default=".", help="Project root")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Timed renders per template")
+    parser.add_argument("--list-size", type=int, default=DEFAULT_LIST_SIZE,
+                        help="Items in each synthesized list, e.g. providers or upstreams")
+    parser.add_argument("--host", help="Render with the real variables of this inventory host")
+    parser.add_argument("--inventory", help="Inventory file for --host (default: inventories/dev/hosts.yml)")
+    parser.add_argument("--top", type=int, default=SLOWEST_TEMPLATES, help="Slowest templates to flag")
+    parser.add_argument("--output", help="Output file for the results (JSON, default: benchmark_results/)")
+
+    args = parser.parse_args()
+
+    profiler = TemplateRenderProfiler(args.base_path, args.runs, args.list_size, args.host, args.inventory)
+    templates = [Path(template) for template in args.templates] or None
+    try:
+        profile = profiler.profile(templates, args.top)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Per-template samples in the benchmark history format, for the regression gate
+    results = {}
+    for path, template in profile["templates"].items():
+        if template["error"] is None:
+            results[f"template_render_{path}"] = {
+                "samples": template["samples"],
+                "median": statistics.median(template["samples"]),
+                "unit": "seconds"
+            }
+
+    report = {
+        "benchmark_timestamp": time.strftime('%Y-%m-%d %H:%M:%S UTC', time.gmtime()),
+        "benchmark": "template_render",
+        "parameters": {"runs": profiler.runs, "list_size": args.list_size, "host": args.host,
+                       "inventory": str(profiler.inventory) if args.host else None},
+        "results": results,
+        **profile
+    }
+
+    output = Path(args.output) if args.output else \
+        Path(args.base_path) / "benchmark_results" / f"template_render_benchmark_{time.strftime('%Y%m%d_%H%M%S', time.gmtime())}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    summary = profile["summary"]
+    print(f"\n=== TEMPLATE RENDER PROFILE ===")
+    print(f"Templates Rendered: {summary['rendered_templates']}/{summary['total_templates']}")
+    print(f"Schema Inferred: {summary['schema_inferred']}")
+    print(f"Total Median Render Time: {summary['total_median_ms']:.3f} ms")
+    print(f"\nSlowest templates:")
+    for path in profile["slowest"]:
+        template = profile["templates"][path]
+        print(f"  {template['median_ms']:>9.3f} ms  {template['output_bytes']:>8} B  "
+              f"peak {template['peak_bytes']:>9} B  {path}")
+    failed = {path: template["error"] for path, template in profile["templates"].items() if template["error"]}
+    if failed:
+        print(f"\nFailed to render:")
+        for path, error in failed.items():
+            print(f"  {path}: {error}")
+    print(f"\nResults saved to: {output}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,123 @@ from jinja2 import Environment, FileSystemLoader, meta, exceptions
 from jinja2schema import infer, to_json_schema
 import subprocess
 import hashlib
+import time
+from jinja2 import nodes
 from datetime import datetime
 
+from project_index import ProjectIndex
+
+# Performance thresholds for the AST metrics
+MAX_FILTER_CHAIN = 3
+MAX_INCLUDES = 3
+MAX_BOOLEAN_OPERANDS = 3
+
+
+def template_metrics(ast: nodes.Template) -> Dict[str, Any]:
+    """Structure of a parsed template: nesting, filter chains, includes, inheritance and complexity.
+
+    Cognitive complexity counts one per if, elif, for and inline if, plus the
+    depth of control structures it is nested in, plus one per run of like
+    boolean operators in a condition.
+    """
+    metrics = {
+        "max_loop_depth": 0,
+        "nested_loops": 0,
+        "complex_conditionals": 0,
+        "max_filter_chain": 0,
+        "long_filter_chains": 0,
+        "filters": 0,
+        "includes": [],
+        "extends": None,
+        "blocks": [],
+        "macros": [],
+        "super_calls": 0,
+        "cognitive_complexity": 0
+    }
+
+    def target(node):
+        return node.value if isinstance(node, nodes.Const) else type(node).__name__
+
+    def boolean_terms(node, operator=None):
+        """Operands of a chain of and/or, and the number of runs of like operators"""
+        if isinstance(node, (nodes.And, nodes.Or)):
+            left_operands, left_runs = boolean_terms(node.left, type(node))
+            right_operands, right_runs = boolean_terms(node.right, type(node))
+            runs = left_runs + right_runs + (0 if operator is type(node) else 1)
+            return left_operands + right_operands, runs
+        return 1, 0
+
+    def condition(test, depth):
+        operands, runs = boolean_terms(test)
+        metrics["cognitive_complexity"] += runs
+        if operands > MAX_BOOLEAN_OPERANDS or (isinstance(test, (nodes.And, nodes.Or)) and
+                                                   test.find(nodes.And if isinstance(test, nodes.Or) else nodes.Or)):
+            metrics["complex_conditionals"] += 1
+        visit(test, depth, 0)
+
+    def visit(node, depth, loop_depth):
+        if isinstance(node, nodes.For):
+            loop_depth += 1
+            metrics["max_loop_depth"] = max(metrics["max_loop_depth"], loop_depth)
+            if loop_depth > 1:
+                metrics["nested_loops"] += 1
+            metrics["cognitive_complexity"] += 1 + depth
+            visit(node.iter, depth, loop_depth - 1)
+            for child in node.body + node.else_:
+                visit(child, depth + 1, loop_depth)
+            if node.test is not None:
+                condition(node.test, depth + 1)
+            return
+        if isinstance(node, nodes.If):
+            metrics["cognitive_complexity"] += 1 + depth
+            condition(node.test, depth)
+            for child in node.body + node.else_:
+                visit(child, depth + 1, loop_depth)
+            for branch in node.elif_:
+                metrics["cognitive_complexity"] += 1
+                condition(branch.test, depth)
+                for child in branch.body:
+                    visit(child, depth + 1, loop_depth)
+            return
+        if isinstance(node, nodes.CondExpr):
+            metrics["cognitive_complexity"] += 1 + depth
+            condition(node.test, depth)
+            for child in (node.expr1, node.expr2):
+                if child is not None:
+                    visit(child, depth + 1, loop_depth)
+            return
+        if isinstance(node, nodes.Filter):
+            # Count a chain once, from its outermost filter
+            chain = 0
+            inner = node
+            while isinstance(inner, nodes.Filter):
+                chain += 1
+                for argument in inner.args + [kwarg.value for kwarg in inner.kwargs]:
+                    visit(argument, depth, loop_depth)
+                inner = inner.node
+            metrics["filters"] += chain
+            metrics["max_filter_chain"] = max(metrics["max_filter_chain"], chain)
+            if chain > MAX_FILTER_CHAIN:
+                metrics["long_filter_chains"] += 1
+            if inner is not None:
+                visit(inner, depth, loop_depth)
+            return
+        if isinstance(node, nodes.Include):
+            metrics["includes"].append(target(node.template))
+        elif isinstance(node, nodes.Extends):
+            metrics["extends"] = target(node.template)
+        elif isinstance(node, nodes.Block):
+            metrics["blocks"].append(node.name)
+        elif isinstance(node, nodes.Macro):
+            metrics["macros"].append(node.name)
+        elif isinstance(node, nodes.Call) and isinstance(node.node, nodes.Name) and node.node.name == 'super':
+            metrics["super_calls"] += 1
+        for child in node.iter_child_nodes():
+            visit(child, depth, loop_depth)
+
+    visit(ast, 0, 0)
+    return metrics
+
 class TemplateValidator:
     def __init__(self, base_path: str = "."):
         self.base_path = Path(base_path)
@@ -32,6 +147,9 @@ class TemplateValidator:
             "inheritance_analysis": {},
             "version": "1.0.0"
         }
+        # Templates are read and parsed once; ASTs are shared by content hash
+        self.sources = {}
+        self.ast_cache = {}
         
         # Security patterns to detect
         self.security_patterns = {
@@ -55,19 +173,43 @@ class TemplateValidator:
             ]
         }
         
-        # Performance anti-patterns
-        self.performance_patterns = {
-            "nested_loops": r'{%\s*for.*%}.*{%\s*for.*%}',
-            "complex_conditionals": r'{%\s*if.*and.*or.*%}',
-            "repeated_calculations": r'{{\s*.*\|\s*.*\|\s*.*\|\s*.*}}',
-            "large_includes": r'{%\s*include.*%}'
-        }
+    def parse_template(self, template_path: str) -> Tuple[str, str, Any, str]:
+        """Content, sha256, AST (None if it does not parse) and syntax error of a template, each read once"""
+        template_path = str(template_path)
+        if template_path not in self.sources:
+            with open(template_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            self.sources[template_path] = (content, hashlib.sha256(content.encode()).hexdigest())
+        content, digest = self.sources[template_path]
+        
+        if digest not in self.ast_cache:
+            try:
+                ast = self.env.parse(content, name=os.path.relpath(template_path, self.base_path))
+                metrics = template_metrics(ast)
+                metrics["variables"] = self.undeclared_variables(ast)
+                self.ast_cache[digest] = (ast, metrics, None)
+            except exceptions.TemplateSyntaxError as e:
+                self.ast_cache[digest] = (None, None, str(e))
+        ast, _, error = self.ast_cache[digest]
+        return content, digest, ast, error
+
+    def undeclared_variables(self, ast: nodes.Template) -> List[str]:
+        """Variables the template reads from its context"""
+        try:
+            return sorted(meta.find_undeclared_variables(ast))
+        except exceptions.TemplateAssertionError:
+            # Filters Jinja2 does not know (Ansible's) stop its code generator;
+            # fall back to names read but never assigned in the template
+            assigned = {node.name for node in ast.find_all(nodes.Name) if node.ctx in ('store', 'param')}
+            loaded = {node.name for node in ast.find_all(nodes.Name) if node.ctx == 'load'}
+            return sorted(loaded - assigned - set(self.env.globals) - {'loop', 'super', 'caller', 'varargs', 'kwargs'})
 
     def analyze_template(self, template_path: str) -> Dict[str, Any]:
         """Comprehensive analysis of a single template"""
         try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            started = time.perf_counter()
+            content, digest, ast, error = self.parse_template(template_path)
+            parsed = time.perf_counter()
             
             template_name = os.path.relpath(template_path, self.base_path)
             
@@ -75,7 +217,7 @@ class TemplateValidator:
                 "path": template_name,
                 "size": len(content),
                 "lines": len(content.splitlines()),
-                "hash": hashlib.sha256(content.encode()).hexdigest()[:16],
+                "hash": digest[:16],
                 "syntax_valid": True,
                 "variables": [],
                 "blocks": [],
@@ -85,44 +227,42 @@ class TemplateValidator:
                 "security_score": 100,
                 "performance_score": 100,
                 "complexity_score": 0,
+                "metrics": {},
                 "issues": [],
                 "recommendations": []
             }
             
-            # Parse template for AST analysis
-            try:
-                ast = self.env.parse(content, name=template_name)
-                analysis["variables"] = list(meta.find_undeclared_variables(ast))
-                
-                # Extract blocks, macros, includes
-                for node in ast.find_all():
-                    if hasattr(node, 'name'):
-                        if node.__class__.__name__ == 'Block':
-                            analysis["blocks"].append(node.name)
-                        elif node.__class__.__name__ == 'Macro':
-                            analysis["macros"].append(node.name)
-                        elif node.__class__.__name__ == 'Include':
-                            analysis["includes"].append(str(node.template))
-                        elif node.__class__.__name__ == 'Extends':
-                            analysis["extends"] = str(node.template)
-                            
-            except exceptions.TemplateSyntaxError as e:
+            # Structure comes from the AST
+            if ast is not None:
+                metrics = self.ast_cache[digest][1]
+                analysis["variables"] = list(metrics["variables"])
+                analysis["blocks"] = list(metrics["blocks"])
+                analysis["macros"] = list(metrics["macros"])
+                analysis["includes"] = list(metrics["includes"])
+                analysis["extends"] = metrics["extends"]
+                analysis["metrics"] = {key: value for key, value in metrics.items()
+                                       if key not in ("variables", "blocks", "macros", "includes", "extends")}
+            else:
                 analysis["syntax_valid"] = False
-                analysis["issues"].append(f"Syntax Error: {str(e)}")
+                analysis["issues"].append(f"Syntax Error: {error}")
                 analysis["security_score"] -= 20
             
             # Security analysis
             self._analyze_security(content, analysis)
             
             # Performance analysis
-            self._analyze_performance(content, analysis)
+            self._analyze_performance(analysis)
             
             # Complexity analysis
-            self._analyze_complexity(content, analysis)
+            self._analyze_complexity(analysis)
             
             # Best practices check
             self._check_best_practices(content, analysis)
             
+            analysis["timing_ms"] = {
+                "parse": round((parsed - started) * 1000, 3),
+                "total": round((time.perf_counter() - started) * 1000, 3)
+            }
             return analysis
             
         except Exception as e:
@@ -162,16 +302,22 @@ class TemplateValidator:
         
         analysis["security_issues"] = security_issues
 
-    def _analyze_performance(self, content: str, analysis: Dict[str, Any]):
-        """Performance optimization analysis"""
+    def _analyze_performance(self, analysis: Dict[str, Any]):
+        """Performance optimization analysis from the template's AST metrics"""
         perf_issues = []
+        metrics = analysis["metrics"]
         
-        for issue_type, pattern in self.performance_patterns.items():
-            matches = re.findall(pattern, content, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-            if matches:
+        counts = {
+            "nested_loops": metrics.get("nested_loops", 0),
+            "complex_conditionals": metrics.get("complex_conditionals", 0),
+            "long_filter_chains": metrics.get("long_filter_chains", 0),
+            "include_fan_out": len(analysis["includes"]) if len(analysis["includes"]) > MAX_INCLUDES else 0
+        }
+        for issue_type, count in counts.items():
+            if count:
                 perf_issues.append({
                     "type": issue_type,
-                    "count": len(matches),
+                    "count": count,
                     "impact": "HIGH" if issue_type == "nested_loops" else "MEDIUM"
                 })
                 analysis["performance_score"] -= 20 if issue_type == "nested_loops" else 10
@@ -187,14 +333,13 @@ class TemplateValidator:
         
         analysis["performance_issues"] = perf_issues
 
-    def _analyze_complexity(self, content: str, analysis: Dict[str, Any]):
+    def _analyze_complexity(self, analysis: Dict[str, Any]):
         """Template complexity analysis"""
-        complexity = 0
+        metrics = analysis["metrics"]
         
-        # Count control structures
-        complexity += len(re.findall(r'{%\s*(if|for|while)', content))
-        complexity += len(re.findall(r'{%\s*elif', content)) * 0.5
-        complexity += len(re.findall(r'\|\s*\w+', content)) * 0.3  # Filters
+        # Control structures weighted by nesting, then filters and inputs
+        complexity = metrics.get("cognitive_complexity", 0)
+        complexity += metrics.get("filters", 0) * 0.3
         complexity += len(analysis["variables"]) * 0.1
         
         analysis["complexity_score"] = round(complexity, 2)
@@ -243,34 +388,34 @@ class TemplateValidator:
         
         for template_path in templates:
             try:
-                with open(template_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                template_name = os.path.relpath(template_path, self.base_path)
-                
-                # Find extends
-                extends_match = re.search(r'{%\s*extends\s+["\']([^"\']+)["\']', content)
-                if extends_match:
-                    parent = extends_match.group(1)
-                    inheritance_map[template_name] = {
-                        "extends": parent,
-                        "blocks": re.findall(r'{%\s*block\s+(\w+)', content),
-                        "super_calls": len(re.findall(r'super\(\)', content))
-                    }
-                    child_templates.add(template_name)
-                    base_templates.add(parent)
-                
-                # Find blocks in potential base templates
-                blocks = re.findall(r'{%\s*block\s+(\w+)', content)
-                if blocks and template_name not in child_templates:
-                    inheritance_map[template_name] = {
-                        "extends": None,
-                        "blocks": blocks,
-                        "super_calls": 0
-                    }
+                _, digest, ast, _ = self.parse_template(template_path)
             except Exception as e:
                 # Skip templates that can't be read
                 continue
+            if ast is None:
+                continue
+            
+            template_name = os.path.relpath(template_path, self.base_path)
+            metrics = self.ast_cache[digest][1]
+            
+            # Find extends
+            if metrics["extends"] is not None:
+                parent = metrics["extends"]
+                inheritance_map[template_name] = {
+                    "extends": parent,
+                    "blocks": list(metrics["blocks"]),
+                    "super_calls": metrics["super_calls"]
+                }
+                child_templates.add(template_name)
+                base_templates.add(parent)
+            
+            # Find blocks in potential base templates
+            elif metrics["blocks"]:
+                inheritance_map[template_name] = {
+                    "extends": None,
+                    "blocks": list(metrics["blocks"]),
+                    "super_calls": 0
+                }
         
         return {
             "inheritance_map": inheritance_map,
@@ -325,15 +470,18 @@ class TemplateValidator:
 
 def main():
     parser = argparse.ArgumentParser(description="Ansible Template Quality Validator")
-    parser.add_argument("--list", required=True, help="File containing list of templates to analyze")
+    parser.add_argument("--list", help="File containing list of templates to analyze (default: every *.j2 under the base path)")
     parser.add_argument("--out", default="template_analysis_report.json", help="Output report file")
     parser.add_argument("--base-path", default=".", help="Base path for template resolution")
     
     args = parser.parse_args()
     
-    # Read template list
-    with open(args.list, 'r') as f:
-        templates = [line.strip() for line in f if line.strip()]
+    # Read template list, or take every template in the project index
+    if args.list:
+        with open(args.list, 'r') as f:
+            templates = [line.strip() for line in f if line.strip()]
+    else:
+        templates = [str(path) for path in ProjectIndex(args.base_path, use_cache=False).templates()]
     
     # Validate templates
     validator = TemplateValidator(args.base_path)
@@ -0,0 +1,141 @@
+"""
+Line Rule Engine for the Security Validation Scanner
+Matches all line-based security rules against a file in a single pass
+
+Every rule names a literal that any match of its pattern must contain. The
+literals are searched for across the whole file at C speed to find candidate
+lines, and only those are matched against the rule patterns themselves. Most
+lines of a playbook contain none of the literals and are never looked at in
+Python.
+"""
+
+import re
+import json
+import hashlib
+from typing import Dict, List, Any, Iterator, Tuple
+
+# Lines that reference vaulted or templated values are not hardcoded secrets
+TEMPLATED_VALUE = r'\{\{|(?i:vault)|lookup\('
+
+SECRETS_RECOMMENDATION = 'Use Ansible Vault or environment variables for secrets'
+COMMANDS_RECOMMENDATION = 'Use safer alternatives or add safety checks'
+
+# Each rule names a literal every match of its pattern contains, found
+# case-insensitively; lines without any literal are never matched
+LINE_RULES = [
+    {'id': 'hardcoded-password', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Potential hardcoded password', 'literal': 'password',
+     'pattern': r'password\s*[:=]\s*["\']?[^"\'\s]{8,}', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+    {'id': 'hardcoded-api-key', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Potential hardcoded API key', 'literal': 'api',
+     'pattern': r'api[_-]?key\s*[:=]\s*["\']?[A-Za-z0-9]{20,}', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+    {'id': 'hardcoded-secret-key', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Potential hardcoded secret key', 'literal': 'secret',
+     'pattern': r'secret[_-]?key\s*[:=]\s*["\']?[A-Za-z0-9]{20,}', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+    {'id': 'hardcoded-token', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Potential hardcoded token', 'literal': 'token',
+     'pattern': r'token\s*[:=]\s*["\']?[A-Za-z0-9]{20,}', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+    {'id': 'private-key', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Hardcoded private key', 'literal': '-----begin',
+     'pattern': r'-----BEGIN\s+(RSA\s+)?PRIVATE\s+KEY-----', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+    {'id': 'mysql-credentials', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Database connection string with credentials', 'literal': 'mysql://',
+     'pattern': r'mysql://[^:]+:[^@]+@', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+    {'id': 'postgresql-credentials', 'category': 'secrets', 'severity': 'critical',
+     'description': 'Database connection string with credentials', 'literal': 'postgresql://',
+     'pattern': r'postgresql://[^:]+:[^@]+@', 'exclude': TEMPLATED_VALUE,
+     'recommendation': SECRETS_RECOMMENDATION},
+
+    {'id': 'recursive-delete', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Dangerous recursive delete command', 'literal': '-rf',
+     'pattern': r'\brm\s+-rf\s+/', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'disk-dd', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Dangerous disk operation', 'literal': 'if=',
+     'pattern': r'\bdd\s+if=', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'mkfs', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Filesystem creation command', 'literal': 'mkfs',
+     'pattern': r'\bmkfs\b', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'fdisk', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Disk partitioning command', 'literal': 'fdisk',
+     'pattern': r'\bfdisk\b', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'shred', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Secure file deletion command', 'literal': 'shred',
+     'pattern': r'\bshred\b', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'wipefs', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Filesystem signature removal', 'literal': 'wipefs',
+     'pattern': r'\bwipefs\b', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'raw-disk-write', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Direct disk write operation', 'literal': '/dev/sd',
+     'pattern': r'>\s*/dev/sd[a-z]', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'chmod-777', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Overly permissive file permissions', 'literal': 'chmod',
+     'pattern': r'\bchmod\s+777', 'recommendation': COMMANDS_RECOMMENDATION},
+    {'id': 'sudo-su', 'category': 'dangerous_commands', 'severity': 'high',
+     'description': 'Privilege escalation to root', 'literal': 'sudo',
+     'pattern': r'sudo\s+su\s+-', 'recommendation': COMMANDS_RECOMMENDATION},
+]
+
+
+def ruleset_digest(rules: List[Dict[str, Any]]) -> str:
+    """Short hash of the rule definitions, so cached results follow rule edits"""
+    return hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class LineRuleEngine:
+    """Match a set of line rules against file contents.
+
+    Findings come out in the order the per-line, per-pattern loops produced
+    them: by line, then by rule order, at most once per rule and line.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = rules
+        self.patterns = [re.compile(rule['pattern'], re.IGNORECASE) for rule in rules]
+        self.exclusions = [re.compile(rule['exclude']) if rule.get('exclude') else None for rule in rules]
+        self.literals = sorted({rule['literal'].lower() for rule in rules})
+        self.prefilter = re.compile('|'.join(re.escape(literal) for literal in self.literals), re.IGNORECASE)
+
+    def candidate_lines(self, content: str) -> Iterator[Tuple[int, str]]:
+        """(line number, line) for each line containing at least one rule literal, in file order"""
+        if content.isascii():
+            # Lower-casing ASCII keeps offsets, and str.find on the lowered
+            # text is an order of magnitude faster than a case-insensitive
+            # alternation; other text goes through the regex, which also
+            # knows Unicode case folding
+            lowered = content.lower()
+            starts = set()
+            for literal in self.literals:
+                offset = lowered.find(literal)
+                while offset >= 0:
+                    start = lowered.rfind('\n', 0, offset) + 1
+                    starts.add(start)
+                    end = lowered.find('\n', offset)
+                    offset = lowered.find(literal, end) if end >= 0 else -1
+        else:
+            starts = set()
+            match = self.prefilter.search(content)
+            while match:
+                starts.add(content.rfind('\n', 0, match.start()) + 1)
+                end = content.find('\n', match.start())
+                match = self.prefilter.search(content, end) if end >= 0 else None
+
+        line_num = 1
+        previous = 0
+        for start in sorted(starts):
+            line_num += content.count('\n', previous, start)
+            previous = start
+            end = content.find('\n', start)
+            yield line_num, content[start:end] if end >= 0 else content[start:]
+
+    def scan(self, content: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """(line number, rule) for each rule matching a line, lines split on '\\n'"""
+        for line_num, line in self.candidate_lines(content):
+            for rule, pattern, exclusion in zip(self.rules, self.patterns, self.exclusions):
+                if pattern.search(line) and not (exclusion and exclusion.search(line)):
+                    yield line_num, rule
@@ -7,27 +7,71 @@ Performs security scanning of Ansible configurations and playbooks
 
 import os
 import sys
-import yaml
 import json
 import re
+import time
+import hashlib
+import tempfile
 import subprocess
 import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from line_rules import LINE_RULES, LineRuleEngine, ruleset_digest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'scripts'))
+from project_index import ProjectIndex
+
+# Bump whenever a check changes what it reports, so cached findings are discarded;
+# edits to the line rules are picked up through their digest
+RULESET_VERSION = f'2-{ruleset_digest(LINE_RULES)}'
+
+SECRET_RULES = LineRuleEngine([rule for rule in LINE_RULES if rule['category'] == 'secrets'])
+COMMAND_RULES = LineRuleEngine([rule for rule in LINE_RULES if rule['category'] == 'dangerous_commands'])
+
+# Files modified this recently may change again within the same mtime tick,
+# so their cache entries are checked by content hash rather than stat
+RACY_WINDOW_SECONDS = 2
+
+# Below this many files to scan, starting worker processes costs more than it saves
+PARALLEL_MIN_FILES = 64
+
+# Finding fields stored in the scan cache; timestamps are set when replayed
+CACHED_FIELDS = ('severity', 'category', 'message', 'line_number', 'recommendation')
+
+# Scanner of each worker process, set up once by _init_worker
+_worker_scanner = None
+
+def _init_worker(base_path: str, index_cache: Optional[str]):
+    """Give the worker one scanner whose index loads the parent's index cache once"""
+    global _worker_scanner
+    index = ProjectIndex(base_path, cache_file=index_cache, use_cache=index_cache is not None)
+    _worker_scanner = SecurityScanner(base_path, index=index)
+
+def scan_file(file_path: Path) -> List[Dict[str, Any]]:
+    """Findings of one file, reduced to the cached fields; runs in worker processes"""
+    return _worker_scanner.file_findings(file_path)
 
 class SecurityScanner:
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, cache_file: Optional[str] = None, index: Optional[ProjectIndex] = None):
         self.base_path = Path(base_path)
+        # Walk and parsed YAML, shared with the other repository tools when given
+        self.index = index or ProjectIndex(base_path, use_cache=False)
         self.findings = []
         self.stats = {
             'files_scanned': 0,
+            'files_from_cache': 0,
             'critical_issues': 0,
             'high_issues': 0,
             'medium_issues': 0,
             'low_issues': 0,
             'info_issues': 0
         }
+        # Findings per file keyed by content hash, so unchanged files are not rescanned
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.cache = self._load_cache()
         
     def add_finding(self, severity: str, category: str, message: str, 
                    file_path: str = None, line_number: int = None, 
@@ -45,16 +89,144 @@ class SecurityScanner:
         self.findings.append(finding)
         self.stats[f'{severity.lower()}_issues'] += 1
         
-    def scan_yaml_files(self):
-        """Scan YAML files for security issues"""
-        yaml_files = list(self.base_path.rglob('*.yml')) + list(self.base_path.rglob('*.yaml'))
+    def add_findings(self, findings: List[Tuple]):
+        """Add findings given as add_finding arguments"""
+        for finding in findings:
+            self.add_finding(*finding)
+        
+    def _load_cache(self) -> Dict[str, Any]:
+        """Cached findings, or an empty cache when missing or from another rule set"""
+        empty = {'ruleset': RULESET_VERSION, 'files': {}}
+        if not self.cache_file:
+            return empty
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        if cache.get('ruleset') != RULESET_VERSION or not isinstance(cache.get('files'), dict):
+            return empty
+        return cache
+        
+    def save_cache(self):
+        """Write the scan cache atomically"""
+        if not self.cache_file:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_file.parent), prefix='.security-scan-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.cache, f, separators=(',', ':'))
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, self.cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+    def find_yaml_files(self) -> List[Path]:
+        """YAML files under the base path from the project index, in a stable order"""
+        return [yaml_file for yaml_file in self.index.yaml_files() if not self._should_skip_file(yaml_file)]
+        
+    def changed_files(self, git_ref: str) -> Set[Path]:
+        """Files changed since a git ref, including uncommitted and untracked ones"""
+        def git(*args) -> List[str]:
+            result = subprocess.run(['git', '-C', str(self.base_path)] + list(args),
+                                    capture_output=True, text=True, check=True)
+            return [line for line in result.stdout.split('\n') if line]
         
+        top_level = Path(git('rev-parse', '--show-toplevel')[0])
+        changed = git('diff', '--name-only', '--diff-filter=d', git_ref, '--') + \
+            git('ls-files', '--others', '--exclude-standard', '--full-name')
+        return {(top_level / name).resolve() for name in changed}
+        
+    def scan_yaml_files(self, changed_since: Optional[str] = None, jobs: int = 1):
+        """Scan YAML files for security issues
+        
+        Files whose content hash is in the scan cache have their findings
+        replayed instead of being parsed again. With changed_since, only files
+        changed since that git ref are scanned and reported. With jobs > 1 the
+        remaining files are sharded across worker processes; findings are
+        merged in file order either way, so reports do not depend on jobs.
+        """
+        yaml_files = self.find_yaml_files()
+        if changed_since:
+            changed = self.changed_files(changed_since)
+            yaml_files = [yaml_file for yaml_file in yaml_files if yaml_file.resolve() in changed]
+        
+        cached_files = self.cache['files']
+        entries = []
+        misses = []
         for yaml_file in yaml_files:
-            if self._should_skip_file(yaml_file):
-                continue
-                
+            key = str(yaml_file.relative_to(self.base_path))
+            entry = self._cached_entry(yaml_file, key, cached_files)
+            entries.append((yaml_file, key, entry))
+            if 'findings' not in entry:
+                misses.append(yaml_file)
+        
+        scanned = dict(zip(misses, self._scan_files(misses, jobs)))
+        
+        for yaml_file, key, entry in entries:
             self.stats['files_scanned'] += 1
-            self._scan_yaml_file(yaml_file)
+            if 'findings' in entry:
+                self.stats['files_from_cache'] += 1
+            else:
+                entry['findings'] = scanned[yaml_file]
+            if entry['sha256']:
+                cached_files[key] = entry
+            for finding in entry['findings']:
+                self.add_finding(finding['severity'], finding['category'], finding['message'], yaml_file,
+                                 finding['line_number'], finding['recommendation'])
+        
+        # A full scan knows every file; drop entries for deleted ones
+        if not changed_since:
+            for key in set(cached_files) - {key for _, key, _ in entries}:
+                del cached_files[key]
+        self.save_cache()
+        self.index.save()
+        
+    def _cached_entry(self, file_path: Path, key: str, cached_files: Dict[str, Any]) -> Dict[str, Any]:
+        """Cache entry for the file's current content; it has findings only on a cache hit"""
+        entry = cached_files.get(key)
+        try:
+            stat = file_path.stat()
+            signature = [stat.st_mtime_ns, stat.st_size]
+            if entry and entry.get('stat') == signature and \
+                    stat.st_mtime < time.time() - RACY_WINDOW_SECONDS:
+                digest = entry['sha256']
+            else:
+                digest = hashlib.sha256(file_path.read_bytes()).hexdigest()
+        except OSError:
+            # Unreadable files are reported by the scan itself and never cached
+            return {'sha256': None, 'stat': None}
+        
+        if entry and entry.get('sha256') == digest:
+            return {'sha256': digest, 'stat': signature, 'findings': entry['findings']}
+        return {'sha256': digest, 'stat': signature}
+        
+    def file_findings(self, file_path: Path) -> List[Dict[str, Any]]:
+        """Findings of one file, reduced to the cached fields, without recording them"""
+        findings, stats = self.findings, dict(self.stats)
+        self.findings = []
+        try:
+            self._scan_yaml_file(file_path)
+            return [{field: finding[field] for field in CACHED_FIELDS} for finding in self.findings]
+        finally:
+            self.findings, self.stats = findings, stats
+        
+    def _scan_files(self, file_paths: List[Path], jobs: int = 1) -> List[List[Dict[str, Any]]]:
+        """Findings of each file, in this process with its index or sharded across workers"""
+        if jobs <= 1 or len(file_paths) < PARALLEL_MIN_FILES:
+            return [self.file_findings(file_path) for file_path in file_paths]
+        
+        # Workers load the saved index once each instead of parsing every file again
+        self.index.save()
+        index_cache = str(self.index.cache_file) if self.index.cache_file else None
+        # Several files per task keep the pickling overhead per file low while
+        # still leaving enough tasks to balance uneven file sizes
+        chunksize = max(1, len(file_paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(str(self.base_path), index_cache)) as pool:
+            return list(pool.map(scan_file, file_paths, chunksize=chunksize))
             
     def _should_skip_file(self, file_path: Path) -> bool:
         """Check if file should be skipped"""
@@ -73,14 +245,12 @@ class SecurityScanner:
     def _scan_yaml_file(self, file_path: Path):
         """Scan individual YAML file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self.index.text(file_path)
                 
-            # Parse YAML
-            try:
-                yaml_data = yaml.safe_load(content)
-            except yaml.YAMLError as e:
-                self.add_finding('medium', 'syntax', f'YAML syntax error: {e}', 
+            # Parse YAML, or take it from the project index cache
+            yaml_data, error = self.index.parse(file_path)
+            if error is not None:
+                self.add_finding('medium', 'syntax', f'YAML syntax error: {error}', 
                                file_path, recommendation='Fix YAML syntax errors')
                 return
                 
@@ -99,51 +269,18 @@ class SecurityScanner:
             
     def _check_hardcoded_secrets(self, content: str, file_path: Path):
         """Check for hardcoded secrets"""
-        secret_patterns = [
-            (r'password\s*[:=]\s*["\']?[^"\'\s]{8,}', 'Potential hardcoded password'),
-            (r'api[_-]?key\s*[:=]\s*["\']?[A-Za-z0-9]{20,}', 'Potential hardcoded API key'),
-            (r'secret[_-]?key\s*[:=]\s*["\']?[A-Za-z0-9]{20,}', 'Potential hardcoded secret key'),
-            (r'token\s*[:=]\s*["\']?[A-Za-z0-9]{20,}', 'Potential hardcoded token'),
-            (r'-----BEGIN\s+(RSA\s+)?PRIVATE\s+KEY-----', 'Hardcoded private key'),
-            (r'mysql://[^:]+:[^@]+@', 'Database connection string with credentials'),
-            (r'postgresql://[^:]+:[^@]+@', 'Database connection string with credentials'),
-        ]
-        
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            for pattern, description in secret_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    # Skip if it's a vault reference or template variable
-                    if '{{' in line or 'vault' in line.lower() or 'lookup(' in line:
-                        continue
-                        
-                    self.add_finding('critical', 'secrets', 
-                                   f'{description} found in line {line_num}',
-                                   file_path, line_num,
-                                   'Use Ansible Vault or environment variables for secrets')
+        self._check_line_rules(SECRET_RULES, content, file_path)
                     
     def _check_dangerous_commands(self, content: str, file_path: Path):
         """Check for dangerous commands"""
-        dangerous_patterns = [
-            (r'\brm\s+-rf\s+/', 'Dangerous recursive delete command'),
-            (r'\bdd\s+if=', 'Dangerous disk operation'),
-            (r'\bmkfs\b', 'Filesystem creation command'),
-            (r'\bfdisk\b', 'Disk partitioning command'),
-            (r'\bshred\b', 'Secure file deletion command'),
-            (r'\bwipefs\b', 'Filesystem signature removal'),
-            (r'>\s*/dev/sd[a-z]', 'Direct disk write operation'),
-            (r'\bchmod\s+777', 'Overly permissive file permissions'),
-            (r'sudo\s+su\s+-', 'Privilege escalation to root'),
-        ]
+        self._check_line_rules(COMMAND_RULES, content, file_path)
         
-        lines = content.split('\n')
-        for line_num, line in enumerate(lines, 1):
-            for pattern, description in dangerous_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    self.add_finding('high', 'dangerous_commands',
-                                   f'{description} found in line {line_num}',
-                                   file_path, line_num,
-                                   'Use safer alternatives or add safety checks')
+    def _check_line_rules(self, engine: LineRuleEngine, content: str, file_path: Path):
+        """Report every line rule matching a line of the file"""
+        for line_num, rule in engine.scan(content):
+            self.add_finding(rule['severity'], rule['category'],
+                           f"{rule['description']} found in line {line_num}",
+                           file_path, line_num, rule['recommendation'])
                     
     def _check_file_permissions(self, yaml_data: Any, file_path: Path):
         """Check file permissions in YAML data"""
@@ -247,12 +384,20 @@ class SecurityScanner:
                            
     def run_ansible_lint(self):
         """Run ansible-lint for additional checks"""
+        self.add_findings(self.ansible_lint_findings())
+        
+    def ansible_lint_findings(self) -> List[Tuple]:
+        """Findings from ansible-lint, as add_finding arguments
+        
+        Nothing is recorded on the scanner, so this can run alongside a scan.
+        """
+        findings = []
         try:
             result = subprocess.run(['ansible-lint', '--parseable', str(self.base_path)],
                                   capture_output=True, text=True, timeout=300)
             
             if result.returncode == 0:
-                self.add_finding('info', 'ansible_lint', 'ansible-lint passed successfully')
+                findings.append(('info', 'ansible_lint', 'ansible-lint passed successfully'))
             else:
                 lines = result.stdout.split('\n')
                 for line in lines:
@@ -263,20 +408,29 @@ class SecurityScanner:
                             line_num = parts[1] if parts[1].isdigit() else None
                             message = ':'.join(parts[3:]).strip()
                             
-                            self.add_finding('medium', 'ansible_lint',
+                            findings.append(('medium', 'ansible_lint',
                                            f'ansible-lint: {message}',
                                            file_path, line_num,
-                                           'Fix ansible-lint issues')
+                                           'Fix ansible-lint issues'))
                                            
         except subprocess.TimeoutExpired:
-            self.add_finding('low', 'ansible_lint', 'ansible-lint timed out')
+            findings.append(('low', 'ansible_lint', 'ansible-lint timed out'))
         except FileNotFoundError:
-            self.add_finding('info', 'ansible_lint', 'ansible-lint not available')
+            findings.append(('info', 'ansible_lint', 'ansible-lint not available'))
         except Exception as e:
-            self.add_finding('low', 'ansible_lint', f'ansible-lint error: {e}')
+            findings.append(('low', 'ansible_lint', f'ansible-lint error: {e}'))
+        return findings
             
     def run_yamllint(self):
         """Run yamllint for YAML syntax checking"""
+        self.add_findings(self.yamllint_findings())
+        
+    def yamllint_findings(self) -> List[Tuple]:
+        """Findings from yamllint, as add_finding arguments
+        
+        Nothing is recorded on the scanner, so this can run alongside a scan.
+        """
+        findings = []
         try:
             result = subprocess.run(['yamllint', '-f', 'parsable', str(self.base_path)],
                                   capture_output=True, text=True, timeout=300)
@@ -290,17 +444,32 @@ class SecurityScanner:
                         file_path, line_num, col, level, message = match.groups()
                         severity = 'low' if level == 'warning' else 'medium'
                         
-                        self.add_finding(severity, 'yaml_lint',
+                        findings.append((severity, 'yaml_lint',
                                        f'YAML: {message}',
                                        file_path, int(line_num),
-                                       'Fix YAML formatting issues')
+                                       'Fix YAML formatting issues'))
                                        
         except subprocess.TimeoutExpired:
-            self.add_finding('low', 'yaml_lint', 'yamllint timed out')
+            findings.append(('low', 'yaml_lint', 'yamllint timed out'))
         except FileNotFoundError:
-            self.add_finding('info', 'yaml_lint', 'yamllint not available')
+            findings.append(('info', 'yaml_lint', 'yamllint not available'))
         except Exception as e:
-            self.add_finding('low', 'yaml_lint', f'yamllint error: {e}')
+            findings.append(('low', 'yaml_lint', f'yamllint error: {e}'))
+        return findings
+            
+    def run_all(self, changed_since: Optional[str] = None, jobs: int = 1):
+        """Scan YAML files while ansible-lint and yamllint run alongside
+        
+        The external linters are subprocesses, so threads are enough to
+        overlap them with the scan. Their findings are added after the scan
+        findings, in the same order as running each step in turn.
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='security-lint') as linters:
+            ansible_lint = linters.submit(self.ansible_lint_findings)
+            yamllint = linters.submit(self.yamllint_findings)
+            self.scan_yaml_files(changed_since, jobs)
+            self.add_findings(ansible_lint.result())
+            self.add_findings(yamllint.result())
             
     def generate_report(self, output_file: str = None):
         """Generate security scan report"""
@@ -309,6 +478,7 @@ class SecurityScanner:
                 'timestamp': datetime.now().isoformat(),
                 'base_path': str(self.base_path),
                 'scanner_version': '1.0.0',
+                'ruleset_version': RULESET_VERSION,
                 'total_findings': len(self.findings)
             },
             'statistics': self.stats,
@@ -366,7 +536,7 @@ class SecurityScanner:
         print(f"\n{'='*60}")
         print("SECURITY SCAN SUMMARY")
         print(f"{'='*60}")
-        print(f"Files Scanned: {self.stats['files_scanned']}")
+        print(f"Files Scanned: {self.stats['files_scanned']} ({self.stats['files_from_cache']} unchanged, from cache)")
         print(f"Total Findings: {len(self.findings)}")
         print(f"Risk Level: {self._calculate_risk_level()}")
         print(f"\nFindings by Severity:")
@@ -389,15 +559,22 @@ def main():
     parser.add_argument('path', help='Path to scan')
     parser.add_argument('--output', '-o', help='Output file for JSON report')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--cache-file', help='Scan cache file (default: <path>/.cache/security_scan.json)')
+    parser.add_argument('--no-cache', action='store_true', help='Rescan and reparse every file without reading or writing the caches')
+    parser.add_argument('--changed-since', metavar='GIT_REF',
+                        help='Only scan YAML files changed since this git ref (plus uncommitted and untracked files)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help='Worker processes for scanning files (0: one per CPU)')
     
     args = parser.parse_args()
     
-    scanner = SecurityScanner(args.path)
+    cache_file = None if args.no_cache else \
+        args.cache_file or os.path.join(args.path, '.cache', 'security_scan.json')
+    index = ProjectIndex(args.path, use_cache=not args.no_cache)
+    scanner = SecurityScanner(args.path, cache_file, index)
     
     print("Starting security scan...")
-    scanner.scan_yaml_files()
-    scanner.run_ansible_lint()
-    scanner.run_yamllint()
+    scanner.run_all(args.changed_since, args.jobs or os.cpu_count() or 1)
     
     report = scanner.generate_report(args.output)
     scanner.print_summary()
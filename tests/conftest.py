@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the test suites
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts', 'quality'))
+
+from project_index import ProjectIndex
+from tool_runner import ToolRunner
+
+
+@pytest.fixture(scope='session')
+def project_index():
+    """The repository walked and parsed once for every test that reads it"""
+    index = ProjectIndex(Path(__file__).parent.parent)
+    yield index
+    index.save()
+
+
+@pytest.fixture(scope='session')
+def tool_runner(project_index):
+    """External quality tools, each run once and shared with the quality gate through .cache/"""
+    return ToolRunner(Path(__file__).parent.parent, index=project_index)
@@ -0,0 +1,159 @@
+"""
+Integration tests for the controller-side fleet health sweep
+Local listeners stand in for inventory hosts
+"""
+
+import os
+import sys
+import socket
+import threading
+import time
+import http.server
+from pathlib import Path
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'automation', 'monitoring'))
+
+from fleet_health_sweep import FleetHealthSweep, load_inventory
+
+
+class HealthHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'ok'
+        self.send_response(200 if self.path == '/health' else 503)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), HealthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def silent_listener():
+    """Accepts TCP connections but never answers HTTP requests"""
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(128)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def write_inventory(tmp_path, web_port, db_port, host_count=3):
+    inventory = {
+        'all': {
+            'children': {
+                'web_servers': {
+                    'hosts': {f'web{i:02d}': {'ansible_host': '127.0.0.1'} for i in range(host_count)},
+                    'vars': {'health_checks': {'services': [
+                        {'name': 'nginx', 'port': web_port, 'http': {'path': '/health', 'expected_body': 'ok'}}
+                    ]}}
+                },
+                'database_servers': {
+                    'hosts': {'db01': {'ansible_host': '127.0.0.1'}},
+                    'vars': {'health_checks': {'services': [{'name': 'postgresql', 'port': db_port}]}}
+                }
+            },
+            'vars': {'environment_type': 'test'}
+        }
+    }
+    path = tmp_path / 'hosts.yml'
+    path.write_text(yaml.safe_dump(inventory))
+    return path
+
+
+class TestInventoryLoading:
+    def test_flattens_groups_and_vars(self, tmp_path):
+        hosts = load_inventory(write_inventory(tmp_path, 80, 5432))
+        assert sorted(hosts) == ['db01', 'web00', 'web01', 'web02']
+        assert hosts['web00']['groups'] == ['all', 'web_servers']
+        assert hosts['web00']['vars']['environment_type'] == 'test'
+        assert hosts['db01']['vars']['health_checks']['services'][0]['port'] == 5432
+
+    def test_group_and_host_vars_files(self, tmp_path, http_server):
+        (tmp_path / 'dev').mkdir()
+        inventory = write_inventory(tmp_path / 'dev', http_server, http_server)
+        (tmp_path / 'group_vars').mkdir()
+        (tmp_path / 'group_vars' / 'all.yml').write_text('environment_type: shared\ntier: all\n')
+        (tmp_path / 'dev' / 'group_vars' / 'web_servers').mkdir(parents=True)
+        (tmp_path / 'dev' / 'group_vars' / 'web_servers' / 'main.yml').write_text(
+            yaml.safe_dump({'tier': 'web', 'health_checks': [{'name': 'app', 'port': http_server},
+                                                              {'name': 'gpu_status', 'command': 'nvidia-smi'}]}))
+        (tmp_path / 'dev' / 'host_vars').mkdir()
+        (tmp_path / 'dev' / 'host_vars' / 'web01.yml').write_text('tier: web01\n')
+
+        hosts = load_inventory(inventory)
+        # group_vars files over inline group vars, children over parents, host_vars over all
+        assert hosts['db01']['vars']['environment_type'] == 'shared'
+        assert hosts['web00']['vars']['tier'] == 'web' and hosts['web01']['vars']['tier'] == 'web01'
+
+        # A list of services replaces the inline mapping; entries without probes are skipped
+        report = FleetHealthSweep().run(hosts)
+        assert set(report['hosts']['web00']['checks']) == {f'port_app_{http_server}'}
+        assert report['hosts']['web00']['healthy'] is True
+
+    def test_repository_inventories_parse(self):
+        root = Path(__file__).parent.parent.parent
+        inventories = list(root.glob('inventories/*/hosts.yml'))
+        assert inventories, "Repository should ship inventories/*/hosts.yml"
+        sweeper = FleetHealthSweep()
+        for inventory in inventories:
+            for host in load_inventory(inventory).values():
+                # Shared inventories/group_vars apply to every environment
+                assert host['vars']['project_name'] == 'HX Infrastructure'
+                sweeper.services_for_host(host)
+
+        # The list form of health_checks used by inventories/group_vars/ai_ml.yml
+        ai_ml = yaml.safe_load((root / 'inventories' / 'group_vars' / 'ai_ml.yml').read_text())
+        host = {'vars': {'health_checks': ai_ml['monitoring']['health_checks']}, 'groups': ['ai_ml']}
+        assert sweeper.services_for_host(host) == ai_ml['monitoring']['health_checks']
+
+
+class TestFleetHealthSweep:
+    def test_aggregates_fleet_report(self, tmp_path, http_server):
+        hosts = load_inventory(write_inventory(tmp_path, http_server, unused_port()))
+        report = FleetHealthSweep(concurrency=8, host_deadline=5, probe_timeout=2).run(hosts)
+
+        assert report['summary']['hosts'] == 4
+        assert report['summary']['healthy_hosts'] == 3
+        assert report['hosts']['web01']['checks']['http_nginx']['status_code'] == 200
+        assert report['hosts']['web01']['checks'][f'port_nginx_{http_server}']['response_time_ms'] >= 0
+        assert report['hosts']['db01']['healthy'] is False
+
+    def test_host_deadline_and_concurrency(self, tmp_path, silent_listener):
+        hosts = load_inventory(write_inventory(tmp_path, silent_listener, silent_listener, host_count=20))
+        sweeper = FleetHealthSweep(concurrency=50, host_deadline=0.5, probe_timeout=5)
+
+        started = time.monotonic()
+        report = sweeper.run(hosts)
+        elapsed = time.monotonic() - started
+
+        # 20 hanging hosts in one concurrent wave: bounded by a single host deadline
+        assert elapsed < 3
+        assert report['summary']['deadline_exceeded'] == 20
+        assert report['hosts']['db01']['healthy'] is True
+
+    def test_group_checks_extend_inventory_services(self, tmp_path, http_server):
+        hosts = load_inventory(write_inventory(tmp_path, http_server, http_server))
+        sweeper = FleetHealthSweep(group_checks={'database_servers': [{'name': 'api', 'http': {
+            'url': f'http://127.0.0.1:{http_server}/missing'}}]})
+        report = sweeper.run(hosts)
+        assert report['hosts']['db01']['checks']['http_api']['status_code'] == 503
+        assert report['hosts']['db01']['healthy'] is False
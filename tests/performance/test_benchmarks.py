@@ -199,37 +199,22 @@ class TestRolePerformance:
         avg_time_per_role = duration / max(role_count, 1)
         assert avg_time_per_role < 1.0, f"Role loading too slow: {avg_time_per_role:.2f}s per role"
     
-    def test_template_rendering_performance(self, project_root):
-        """Test template rendering performance"""
-        from jinja2 import Environment, FileSystemLoader
-        
-        roles_dir = project_root / 'roles'
-        template_count = 0
-        start_time = time.time()
-        
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                templates_dir = role_dir / 'templates'
-                if templates_dir.exists():
-                    env = Environment(loader=FileSystemLoader(str(templates_dir)))
-                    
-                    for template_file in templates_dir.glob('*'):
-                        if template_file.is_file() and not template_file.name.startswith('.'):
-                            try:
-                                template = env.get_template(template_file.name)
-                                # Render with minimal context
-                                template.render({})
-                                template_count += 1
-                            except Exception:
-                                # Skip templates that require specific context
-                                pass
-        
-        end_time = time.time()
-        duration = end_time - start_time
-        
-        if template_count > 0:
-            avg_time_per_template = duration / template_count
-            assert avg_time_per_template < 0.5, f"Template rendering too slow: {avg_time_per_template:.2f}s per template"
+    def test_template_rendering_performance(self, project_root, project_index):
+        """Test template rendering performance with contexts inferred from each template"""
+        from template_profiler import TemplateRenderProfiler
+        
+        profiler = TemplateRenderProfiler(str(project_root), runs=3, index=project_index)
+        profile = profiler.profile(slowest=5)
+        summary = profile['summary']
+        failed = {path: template['error'] for path, template in profile['templates'].items() if template['error']}
+        
+        assert summary['total_templates'] > 0
+        # Contexts are synthesized, so nearly every template must actually render
+        assert summary['rendered_templates'] >= 0.9 * summary['total_templates'], \
+            f"Templates failed to render: {failed}"
+        
+        slowest = {path: profile['templates'][path]['median_ms'] for path in profile['slowest']}
+        assert max(slowest.values()) < 500, f"Template rendering too slow (median ms): {slowest}"
 
 
 class TestScalabilityBenchmarks:
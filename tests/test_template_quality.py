@@ -113,7 +113,52 @@ password = "hardcoded_secret_123"
         perf_issues = [issue['type'] for issue in result.get('performance_issues', [])]
         assert 'nested_loops' in perf_issues
         assert 'complex_conditionals' in perf_issues
-    
+        assert 'long_filter_chains' in perf_issues
+        assert result['metrics']['max_loop_depth'] == 2
+        assert result['metrics']['max_filter_chain'] == 4
+
+    def test_metrics_from_ast(self):
+        """Test loop depth, filter chains and include fan-out come from the parsed template"""
+        path = self.create_test_template("fan_out.j2", """
+{# {% for in a comment %}{% if a and b or c %} #}
+{% for a in items %}{% for b in a %}{% for c in b %}{{ c | lower | trim }}{% endfor %}{% endfor %}{% endfor %}
+{% include 'one.j2' %}{% include 'two.j2' %}{% include 'three.j2' %}{% include 'four.j2' %}
+{{ value | to_nice_yaml | indent(2) }}
+""")
+        validator = TemplateValidator(self.test_dir)
+        result = validator.analyze_template(path)
+
+        metrics = result['metrics']
+        assert metrics['max_loop_depth'] == 3
+        assert metrics['complex_conditionals'] == 0
+        assert metrics['filters'] == 4
+        assert result['includes'] == ['one.j2', 'two.j2', 'three.j2', 'four.j2']
+        assert 'value' in result['variables']
+        perf_issues = [issue['type'] for issue in result['performance_issues']]
+        assert 'include_fan_out' in perf_issues
+        assert 'long_filter_chains' not in perf_issues
+
+    def test_template_parsed_once(self, monkeypatch):
+        """Test unchanged template content is parsed once per validator"""
+        validator = TemplateValidator(self.test_dir)
+        validator.validate_templates(self.test_templates)
+        assert len(validator.ast_cache) == len(self.test_templates)
+
+        calls = []
+        parse = validator.env.parse
+        def counting_parse(*args, **kwargs):
+            calls.append(args)
+            return parse(*args, **kwargs)
+        monkeypatch.setattr(validator.env, 'parse', counting_parse)
+        result = validator.analyze_template(self.test_templates[2])
+        assert calls == []
+        assert 'error' not in result
+
+        # The stub itself parses, so a cold cache would be noticed
+        validator.ast_cache.clear()
+        assert 'error' not in validator.analyze_template(self.test_templates[2])
+        assert len(calls) == 1
+
     def test_inheritance_analysis(self):
         """Test template inheritance pattern analysis"""
         validator = TemplateValidator(self.test_dir)
@@ -0,0 +1,419 @@
+"""
+Unit tests for the monitoring dashboard generator
+"""
+
+import json
+import math
+import os
+import socket
+import sys
+import threading
+import time
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'automation', 'monitoring'))
+
+from dashboard_generator import DashboardGenerator, DASHBOARD_BUILDERS
+from dashboard_server import DashboardServer
+from data_catalog import DataCatalog
+from metric_store import MetricStore
+from incident_store import IncidentStore
+from rolling_stats import percentile, ewma, rate_of_change, summarize, window_stats, rolling_windows
+
+EPOCH = 1735689600
+
+
+def write_sample(data_dir, name, payload, age_seconds=0):
+    path = data_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload))
+    stamp = time.time() - age_seconds
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    for minute in range(30):
+        write_sample(data_dir, f'health-{EPOCH + minute * 60}.json',
+                     {'cpu_usage': 10 + minute, 'memory_usage': 50, 'disk_usage': 40,
+                      'timestamp': f'2025-01-01T00:{minute:02d}:00'})
+        # ctime ordering needs distinct stamps; creation order provides them
+        time.sleep(0.001)
+    write_sample(data_dir, 'incidents/detected-0001.json', {'incident_id': 'INC-1'})
+    return data_dir
+
+
+class TestDataCatalog:
+    """Test the persistent data file catalog"""
+
+    def test_files_newest_first(self, data_dir):
+        catalog = DataCatalog(data_dir)
+        files = catalog.files('health-*.json')
+        assert len(files) == 30
+        assert files[0].name == f'health-{EPOCH + 29 * 60}.json'
+        assert catalog.latest('incidents/detected-*.json').name == 'detected-0001.json'
+        assert catalog.latest('missing-*.json') is None
+
+    def test_saved_catalog_avoids_rescans(self, data_dir, tmp_path):
+        catalog = DataCatalog(data_dir, tmp_path / 'catalog.json')
+        catalog.files('health-*.json')
+        # Settle the directory mtime outside the racy window
+        stamp = time.time() - 60
+        os.utime(data_dir, (stamp, stamp))
+        catalog.begin_generation()
+        catalog.files('health-*.json')
+        catalog.save()
+
+        reloaded = DataCatalog(data_dir, tmp_path / 'catalog.json')
+        assert len(reloaded.files('health-*.json')) == 30
+        assert reloaded.stats == {'directory_scans': 0, 'file_stats': 0}
+
+    def test_new_files_stat_incrementally(self, data_dir, tmp_path):
+        catalog = DataCatalog(data_dir, tmp_path / 'catalog.json')
+        catalog.files('health-*.json')
+        catalog.save()
+
+        write_sample(data_dir, f'health-{EPOCH + 3600}.json', {'cpu_usage': 99})
+        reloaded = DataCatalog(data_dir, tmp_path / 'catalog.json')
+        assert reloaded.latest('health-*.json').name == f'health-{EPOCH + 3600}.json'
+        assert reloaded.stats['file_stats'] == 1
+
+    def test_replaced_file_moves_to_newest(self, data_dir, tmp_path):
+        catalog = DataCatalog(data_dir, tmp_path / 'catalog.json')
+        oldest = f'health-{EPOCH}.json'
+        assert catalog.names('health-*.json')[-1] == oldest
+        catalog.save()
+
+        time.sleep(0.01)
+        (data_dir / 'rewrite.tmp').write_text(json.dumps({'cpu_usage': 1}))
+        os.replace(data_dir / 'rewrite.tmp', data_dir / oldest)
+        reloaded = DataCatalog(data_dir, tmp_path / 'catalog.json')
+        assert reloaded.names('health-*.json')[0] == oldest
+        assert reloaded.stats['file_stats'] == 1
+
+
+class TestDashboardGenerator:
+    """Test dashboard data generation"""
+
+    def test_each_file_parsed_once_per_generation(self, data_dir, tmp_path, monkeypatch):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        opened = []
+        real_open = open
+
+        def counting_open(path, *args, **kwargs):
+            opened.append(str(path))
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr('builtins.open', counting_open)
+        generator.generate_all_dashboards()
+
+        data_reads = [path for path in opened if path.startswith(str(data_dir))]
+        assert len(data_reads) == len(set(data_reads))
+        assert os.path.join(str(data_dir), f'health-{EPOCH + 29 * 60}.json') in data_reads
+
+    def test_system_health_dashboard(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        dashboard = generator.generate_system_health_dashboard()
+        assert dashboard['current_status']['cpu_usage'] == 39
+        assert len(dashboard['trends']['cpu_usage']) == 24
+        assert dashboard['trends']['cpu_usage'][0] == 39
+        assert dashboard['trends']['timestamps'][0] == '2025-01-01T00:29:00Z'
+        summary = dashboard['summary']
+        assert summary['peak_cpu_24h'] == 39
+        assert summary['avg_cpu_24h'] == 24.5
+        assert summary['data_points'] == 30
+        assert summary['windows']['cpu_usage']['1h']['rate_per_hour'] == 60
+        assert 'Rolling Statistics' in generator.generate_html_dashboard(dashboard, 'system_health')
+
+    def test_health_check_reports_do_not_stall_ingestion(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        generator.generate_system_health_dashboard()
+
+        # health_check.sh reports match health-*.json too, and are newer by ctime
+        write_sample(data_dir, f'health-{EPOCH + 3600}.json', {'cpu_usage': 99})
+        time.sleep(0.001)
+        write_sample(data_dir, 'health-check-20250101-120000.json', {'overall_status': 'healthy'})
+        time.sleep(0.001)
+        write_sample(data_dir, 'health-check-20250101-120500.json', {'overall_status': 'healthy'})
+
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        dashboard = generator.generate_system_health_dashboard()
+        assert dashboard['current_status']['cpu_usage'] == 99
+        assert dashboard['trends']['cpu_usage'][0] == 99
+        assert dashboard['summary']['data_points'] == 31
+
+    def test_temporary_metrics_removed_without_state_dir(self, data_dir, tmp_path):
+        (tmp_path / 'not-a-dir').write_text('')
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'not-a-dir' / 'state'))
+        assert generator.state_dir is None
+        assert generator.generate_system_health_dashboard()['summary']['data_points'] == 30
+        metrics_dir = generator.metrics_dir
+        assert metrics_dir.is_dir()
+        generator.close()
+        assert not metrics_dir.exists()
+
+    def test_sla_dashboard(self, data_dir, tmp_path):
+        for hour in range(3):
+            status = 'violated' if hour == 1 else 'met'
+            write_sample(data_dir, f'sla-metrics-{EPOCH + hour * 3600}.json', {
+                'overall_status': status,
+                'availability': {'current': '99.95', 'status': 'met'},
+                'response_time': {'current': 1500.0 if hour == 1 else 200.0, 'status': status},
+                'error_rate': {'current': 0.1, 'status': 'met'}
+            })
+            time.sleep(0.001)
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        dashboard = generator.generate_sla_dashboard()
+        assert dashboard['current_sla']['response_time']['current'] == 200.0
+        assert dashboard['sla_trends']['response_time_trend'] == [200.0, 1500.0, 200.0]
+        assert dashboard['sla_trends']['availability_trend'][0] == 99.95
+        assert dashboard['sla_violations'] == [{'timestamp': '2025-01-01T01:00:00Z', 'violated_slas': ['response_time']}]
+        assert dashboard['sla_summary']['total_violations'] == 1
+
+
+class TestMetricStore:
+    """Test the columnar metric store"""
+
+    def test_append_and_range_query(self, tmp_path):
+        store = MetricStore(tmp_path / 'health', ['cpu_usage', 'memory_usage'])
+        store.extend((EPOCH + i * 60, {'cpu_usage': i}) for i in range(120))
+        assert len(store) == 120
+        rows = store.range(EPOCH + 600, EPOCH + 1200)
+        assert list(rows['cpu_usage']) == list(range(10, 20))
+        assert all(math.isnan(value) for value in rows['memory_usage'])
+        assert list(store.tail(2)['timestamp']) == [EPOCH + 118 * 60, EPOCH + 119 * 60]
+
+        with pytest.raises(ValueError):
+            store.append(EPOCH, {'cpu_usage': 1})
+
+        reopened = MetricStore(tmp_path / 'health', ['cpu_usage', 'memory_usage'])
+        assert reopened.last_timestamp() == EPOCH + 119 * 60
+
+    def test_downsample(self, tmp_path):
+        store = MetricStore(tmp_path / 'health', ['cpu_usage'])
+        store.extend((EPOCH + i * 60, {'cpu_usage': i}) for i in range(120))
+        hourly = store.downsample(3600)
+        assert list(hourly['timestamp']) == [EPOCH, EPOCH + 3600]
+        assert list(hourly['cpu_usage']) == [29.5, 89.5]
+        assert list(store.downsample(3600, aggregate='max')['cpu_usage']) == [59, 119]
+
+    def test_interrupted_append_is_truncated(self, tmp_path):
+        store = MetricStore(tmp_path / 'health', ['cpu_usage'])
+        store.extend((EPOCH + i, {'cpu_usage': i}) for i in range(3))
+        with open(tmp_path / 'health' / 'cpu_usage.f64', 'ab') as f:
+            f.write(b'\0' * 8)
+        assert len(MetricStore(tmp_path / 'health', ['cpu_usage'])) == 3
+        assert (tmp_path / 'health' / 'cpu_usage.f64').stat().st_size == 24
+
+
+def write_incident_database(data_dir, count=6):
+    incidents = [{
+        'incident_metadata': {'incident_id': f'INC-{i}', 'created_at': f'2025-01-0{1 + i % 3}T10:00:00Z',
+                              'status': 'resolved' if i % 2 else 'active'},
+        'remediation': {'attempted': 'True', 'successful': bool(i % 2)},
+        'escalation': {'escalated': i == 0}
+    } for i in range(count)]
+    statistics = {'total': count, 'resolved': count // 2, 'escalated': 1}
+    return write_sample(data_dir, 'incident_database.json', {'incidents': incidents, 'statistics': statistics})
+
+
+class TestIncidentStore:
+    """Test the SQLite incident store"""
+
+    def test_import_and_aggregates(self, tmp_path):
+        incident_db = write_incident_database(tmp_path)
+        store = IncidentStore(tmp_path / 'incidents.db')
+        assert store.import_json(incident_db) == 6
+        # Re-importing upserts instead of duplicating
+        store.import_json(incident_db)
+
+        assert store.statistics() == {'total': 6, 'resolved': 3, 'escalated': 1}
+        assert store.status_counts() == {'active': 3, 'resolved': 3}
+        assert store.daily_counts() == {'2025-01-01': 2, '2025-01-02': 2, '2025-01-03': 2}
+        assert store.daily_counts(since='2025-01-02') == {'2025-01-02': 2, '2025-01-03': 2}
+        assert store.response_metrics()['auto_resolution_rate'] == 50
+        assert store.recent(1)[0]['incident_metadata']['created_at'].startswith('2025-01-03')
+
+    def test_queries_use_indexes(self, tmp_path):
+        store = IncidentStore(tmp_path / 'incidents.db')
+        for query in ["SELECT COUNT(*) FROM incidents WHERE escalated = 1",
+                      "SELECT status, COUNT(*) FROM incidents GROUP BY status",
+                      "SELECT substr(created_at, 1, 10), COUNT(*) FROM incidents WHERE created_at >= '2025' "
+                      "GROUP BY substr(created_at, 1, 10)"]:
+            plan = ' '.join(row[-1] for row in store.conn.execute('EXPLAIN QUERY PLAN ' + query))
+            assert 'USING' in plan and 'INDEX' in plan, plan
+
+    def test_dashboard_matches_json_without_store(self, data_dir, tmp_path):
+        write_incident_database(data_dir)
+        without_store = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        expected = without_store.generate_incident_dashboard()
+
+        IncidentStore(tmp_path / 'state' / 'incidents.db').close()
+        with_store = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        dashboard = with_store.generate_incident_dashboard()
+        for key in ['statistics', 'incident_trends', 'response_metrics']:
+            assert dashboard[key] == expected[key]
+        assert with_store.generate_operational_overview()['incidents']['total'] == 6
+
+
+class TestRollingStats:
+    """Test rolling window statistics"""
+
+    def test_percentiles_and_summary(self):
+        assert percentile([1, 2, 3, 4], 50) == 2.5
+        assert percentile([5], 99) == 5
+        summary = summarize([float(v) for v in range(1, 101)] + [math.nan])
+        assert summary['count'] == 100
+        assert summary['p50'] == 50.5
+        assert summary['p99'] == 99.01
+        assert (summary['min'], summary['max']) == (1, 100)
+        assert summarize([]) == {'count': 0}
+
+    def test_ewma_and_rate(self):
+        assert ewma([10, 10, 10]) == 10
+        assert ewma([0, 10], alpha=0.5) == 5
+        assert ewma([]) is None
+        assert rate_of_change([0, 1800, 3600], [1, 2, 3]) == 2
+        assert rate_of_change([0], [1]) is None
+
+    def test_windows_select_recent_samples(self):
+        # One sample a minute for eight days, value = minutes elapsed
+        timestamps = [EPOCH + minute * 60 for minute in range(8 * 1440)]
+        values = [float(minute) for minute in range(8 * 1440)]
+        windows = rolling_windows(timestamps, values)
+        assert windows['1h']['count'] == 60
+        assert windows['24h']['count'] == 1440
+        assert windows['7d']['count'] == 7 * 1440
+        assert windows['1h']['min'] == values[-60]
+        assert windows['7d']['rate_per_hour'] == 60
+        # A window ending earlier only sees samples up to its end
+        assert window_stats(timestamps, values, 3600, end=timestamps[99])['max'] == 99
+
+
+class TestIncrementalGeneration:
+    """Test that only dashboards with changed inputs are rebuilt"""
+
+    def test_unchanged_inputs_skip_regeneration(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        assert generator.generate_all_dashboards() == list(DASHBOARD_BUILDERS)
+        assert generator.generate_all_dashboards() == []
+
+        # Fingerprints survive a restart
+        restarted = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        assert restarted.generate_all_dashboards() == []
+        assert restarted.generate_all_dashboards(force=True) == list(DASHBOARD_BUILDERS)
+
+    def test_new_data_regenerates_affected_dashboards(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        generator.generate_all_dashboards()
+
+        write_sample(data_dir, f'health-{EPOCH + 3600}.json', {'cpu_usage': 97, 'memory_usage': 50, 'disk_usage': 40})
+        assert generator.generate_all_dashboards() == ['system_health', 'operational']
+
+        write_sample(data_dir, 'incident_database.json', {'incidents': [], 'statistics': {'total': 1}})
+        assert generator.generate_all_dashboards() == ['incident', 'operational']
+
+    def test_parallel_workers_record_fingerprints(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'), workers=2)
+        assert generator.generate_all_dashboards() == list(DASHBOARD_BUILDERS)
+        assert set(generator.fingerprints) == set(DASHBOARD_BUILDERS)
+        assert generator.generate_all_dashboards() == []
+        html = (tmp_path / 'out' / 'system_health_dashboard.html').read_text()
+        assert 'status-healthy">39.0%' in html
+
+    def test_html_escapes_data(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        html = generator.generate_html_dashboard(
+            {'title': 'Ops', 'alerts': [{'type': 'critical', 'message': '<script>x</script>'}],
+             'system_health': {'overall_status': 'critical', 'cpu_usage': '12.5'}}, 'operational')
+        assert '&lt;script&gt;x&lt;/script&gt;' in html
+        assert '12.5%' in html
+        assert (tmp_path / 'state' / 'template-cache').is_dir()
+
+    def test_metric_with_empty_window_renders(self, tmp_path):
+        data_dir = tmp_path / 'data'
+        now = int(time.time())
+        write_sample(data_dir, f'health-{now - 7200}.json', {'cpu_usage': 20, 'memory_usage': 50}, 7200)
+        write_sample(data_dir, f'health-{now}.json', {'cpu_usage': 30})
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        assert generator.generate_dashboard('system_health', force=True)
+        html = (tmp_path / 'out' / 'system_health_dashboard.html').read_text()
+        assert '<td>memory_usage</td><td>1h</td><td>-</td>' in html
+
+    def test_outputs_written_atomically(self, data_dir, tmp_path):
+        generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+        generator.generate_all_dashboards()
+        outputs = sorted(path.name for path in (tmp_path / 'out').iterdir())
+        assert outputs == sorted(f'{name}_dashboard.{ext}' for name in DASHBOARD_BUILDERS for ext in ('json', 'html'))
+        assert json.loads((tmp_path / 'out' / 'system_health_dashboard.json').read_text())['current_status']['cpu_usage'] == 39
+        assert (tmp_path / 'out' / 'sla_dashboard.html').stat().st_mode & 0o777 == 0o644
+
+
+@pytest.fixture
+def server(data_dir, tmp_path):
+    generator = DashboardGenerator(str(data_dir), str(tmp_path / 'out'), str(tmp_path / 'state'))
+    server = DashboardServer(generator, '127.0.0.1', 0, poll_interval=0.05, keepalive=0.5)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while server._server is None or not server._server.sockets:
+        assert time.monotonic() < deadline, 'server did not start'
+        time.sleep(0.01)
+    yield server
+    server.stop()
+    thread.join(10)
+
+
+def open_event_stream(port, dashboard):
+    conn = socket.create_connection(('127.0.0.1', port), timeout=10)
+    conn.sendall(f'GET /events?dashboard={dashboard} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+    return conn.makefile('rb')
+
+
+def read_event(stream, name):
+    """Next event of the given type, as (id, payload)"""
+    event_id = event = None
+    for line in stream:
+        line = line.decode().rstrip('\n')
+        if line.startswith('id: '):
+            event_id = line[4:]
+        elif line.startswith('event: '):
+            event = line[7:]
+        elif line.startswith('data: ') and event == name:
+            return event_id, json.loads(line[6:])
+
+
+class TestDashboardServer:
+    """Test serving dashboards and pushing updates from shared state"""
+
+    def test_serves_dashboards(self, server):
+        base = f'http://127.0.0.1:{server.port}'
+        data = json.load(urllib.request.urlopen(f'{base}/system_health_dashboard.json'))
+        assert data['current_status']['cpu_usage'] == 39
+        html = urllib.request.urlopen(f'{base}/system_health').read().decode()
+        assert "new EventSource('/events?dashboard=system_health')" in html
+        assert 'status-healthy">39.0%' in html
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f'{base}/missing_dashboard.json')
+
+    def test_clients_share_one_refresh(self, server, data_dir):
+        streams = [open_event_stream(server.port, 'system_health') for _ in range(10)]
+        for stream in streams:
+            assert read_event(stream, 'content')[0] == 'system_health:1'
+        renders = server.stats['renders']
+
+        write_sample(data_dir, f'health-{EPOCH + 3600}.json',
+                     {'cpu_usage': 97, 'memory_usage': 50, 'disk_usage': 40})
+        for stream in streams:
+            event_id, update = read_event(stream, 'metrics')
+            assert event_id == 'system_health:2'
+            assert update['changed']['current_status']['cpu_usage'] == 97
+        # Only the two dashboards reading health data were rebuilt, once each
+        assert server.stats['renders'] == renders + 2
+        for stream in streams:
+            stream.close()
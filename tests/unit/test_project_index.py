@@ -0,0 +1,94 @@
+"""
+Unit tests for the shared project index
+"""
+
+import os
+import sys
+import time
+
+import pytest
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from project_index import ProjectIndex
+
+
+def settle(root):
+    """Backdate every file past the racy window so the cache keeps it"""
+    past = time.time() - 60
+    for current, _, names in os.walk(root):
+        for name in names:
+            os.utime(os.path.join(current, name), (past, past))
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = tmp_path / 'project'
+    files = {
+        'roles/web/meta/main.yml': 'galaxy_info:\n  author: ops\ndependencies:\n  - common\n',
+        'roles/web/defaults/main.yml': 'web_port: 8080\n',
+        'roles/web/tasks/main.yml': '- name: Install nginx\n  apt:\n    name: nginx\n',
+        'roles/web/tasks/extra/nested.yml': '[]\n',
+        'roles/web/templates/nginx.conf.j2': 'listen {{ web_port }};\n',
+        'roles/common/tasks/main.yaml': '- name: Broken\n  apt: [\n',
+        'roles/.hidden/tasks/main.yml': '[]\n',
+        'inventories/prod/group_vars/all.yml': 'env: prod\n',
+        'templates/motd.j2': 'Welcome\n',
+        '.venv/lib/ignored.yml': 'x: 1\n',
+    }
+    for name, content in files.items():
+        path = project / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return project
+
+
+class TestProjectIndex:
+    """Test the shared walk, parse cache and queries"""
+
+    def test_queries(self, project):
+        index = ProjectIndex(str(project), use_cache=False)
+        assert [role.name for role in index.roles()] == ['common', 'web']
+
+        web = index.role('web')
+        assert web.meta['dependencies'] == ['common']
+        assert web.defaults == {'web_port': 8080}
+        assert web.vars is None
+        assert list(web.tasks) == [project / 'roles/web/tasks/main.yml']
+        assert web.templates == [project / 'roles/web/templates/nginx.conf.j2']
+        assert index.templates() == [project / 'roles/web/templates/nginx.conf.j2', project / 'templates/motd.j2']
+        assert index.vars_files() == [project / 'inventories/prod/group_vars/all.yml',
+                                      project / 'roles/web/defaults/main.yml']
+        assert project / '.venv/lib/ignored.yml' not in index.yaml_files()
+
+    def test_parse_errors(self, project):
+        index = ProjectIndex(str(project), use_cache=False)
+        data, error = index.parse(project / 'roles/common/tasks/main.yaml')
+        assert data is None and 'flow' in error
+        with pytest.raises(yaml.YAMLError):
+            index.role('common').tasks
+
+    def test_cache_skips_unchanged_files(self, project, tmp_path):
+        cache_file = str(tmp_path / 'index.pickle')
+        settle(project)
+        cold = ProjectIndex(str(project), cache_file)
+        expected = {path: cold.parse(path) for path in cold.yaml_files()}
+        cold.save()
+        assert cold.stats == {'parsed': 7, 'from_cache': 0}
+
+        (project / 'roles/web/defaults/main.yml').write_text('web_port: 9090\n')
+        warm = ProjectIndex(str(project), cache_file)
+        assert {path: warm.parse(path) for path in warm.yaml_files()} == \
+            {**expected, project / 'roles/web/defaults/main.yml': ({'web_port': 9090}, None)}
+        assert warm.stats == {'parsed': 1, 'from_cache': 6}
+
+    def test_recent_files_are_not_cached(self, project, tmp_path):
+        cache_file = str(tmp_path / 'index.pickle')
+        index = ProjectIndex(str(project), cache_file)
+        index.load(project / 'roles/web/defaults/main.yml')
+        index.save()
+
+        again = ProjectIndex(str(project), cache_file)
+        again.load(project / 'roles/web/defaults/main.yml')
+        assert again.stats == {'parsed': 1, 'from_cache': 0}
@@ -0,0 +1,138 @@
+"""
+Unit tests for the quality gate evaluator
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'quality-gate'))
+
+from evaluate import QualityGateEvaluator
+from perf_regression import RegressionDetector, load_history, mann_whitney_u
+
+SARIF = {'runs': [{'results': [{'level': 'error'}, {'level': 'warning'}, {'level': 'warning'}]}]}
+
+JUNIT = '''<testsuite name="unit" tests="4" failures="1" errors="0" skipped="1">
+  <testcase classname="t" name="a" time="0.5"/><testcase classname="t" name="b" time="2.25"><failure/></testcase>
+  <testcase classname="t" name="c" time="1.0"/><testcase classname="t" name="d"><skipped/></testcase>
+</testsuite>
+'''
+
+
+@pytest.fixture
+def artifacts(tmp_path, monkeypatch):
+    (tmp_path / 'trivy-results.sarif').write_text(json.dumps(SARIF))
+    (tmp_path / 'reports').mkdir()
+    (tmp_path / 'reports' / 'test-results.xml').write_text(JUNIT)
+    (tmp_path / 'coverage.json').write_text(json.dumps({'totals': {'percent_covered': 91.5}}))
+    (tmp_path / 'yamllint.log').write_text('ok\nerror: line too long\n')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+class TestQualityGateEvaluator:
+    """Test concurrent gate evaluation and the artifact cache"""
+
+    def test_gates_evaluated_with_timing(self, artifacts):
+        results = QualityGateEvaluator().evaluate_all_gates()
+        assert list(results['gates']) == ['security', 'testing', 'code_quality', 'performance']
+        assert results['gates']['security']['result']['vulnerabilities']['critical'] == 1
+        testing = results['gates']['testing']['result']
+        assert testing['test_results'] == {'total_tests': 4, 'passed_tests': 2, 'failed_tests': 1, 'skipped_tests': 1}
+        assert testing['coverage'] == 91.5
+        assert testing['suite_time'] == 3.75
+        assert [(test['name'], test['time'], test['outcome']) for test in testing['slowest_tests']] == \
+            [('b', 2.25, 'failure'), ('c', 1.0, 'passed'), ('a', 0.5, 'passed'), ('d', 0.0, 'skipped')]
+        assert testing['test_suites'][0]['file'] == os.path.join('reports', 'test-results.xml')
+        assert results['gates']['code_quality']['result']['lint_results']['yamllint_errors'] == 1
+        assert set(results['timing']['gates']) == set(results['gates'])
+        assert all(gate['duration_seconds'] >= 0 for gate in results['gates'].values())
+        assert results['timing']['artifacts_parsed'] == 4
+
+    def test_junit_nested_suites_streamed(self, tmp_path):
+        junit = tmp_path / 'results.xml'
+        junit.write_text('<testsuites>' + ''.join(
+            f'<testsuite tests="3" failures="0" errors="1" skipped="0" time="{i}.5">'
+            + ''.join(f'<testcase name="s{i}t{j}" time="{i * 3 + j}"/>' for j in range(3)) + '</testsuite>'
+            for i in range(5)) + '</testsuites>')
+        test_data = QualityGateEvaluator()._parse_junit_xml(str(junit))
+        assert (test_data['total'], test_data['passed'], test_data['errors']) == (15, 10, 5)
+        assert test_data['time'] == 12.5
+        assert [test['name'] for test in test_data['slowest_tests']][:3] == ['s4t2', 's4t1', 's4t0']
+        assert len(test_data['slowest_tests']) == 10
+
+    def test_unchanged_artifacts_not_reparsed(self, artifacts, monkeypatch):
+        cache_file = str(artifacts / 'cache.json')
+        first = QualityGateEvaluator(cache_file).evaluate_all_gates()
+
+        parse_sarif_file = QualityGateEvaluator._parse_sarif_file
+
+        def fail(*args):
+            raise AssertionError('artifact parsed again')
+        monkeypatch.setattr(QualityGateEvaluator, '_parse_sarif_file', fail)
+        monkeypatch.setattr(QualityGateEvaluator, '_parse_junit_xml', fail)
+        monkeypatch.setenv('MAX_HIGH_VULNERABILITIES', '1')
+        second = QualityGateEvaluator(cache_file).evaluate_all_gates()
+        assert second['timing']['artifacts_from_cache'] == 4
+        assert second['gates']['testing']['result'] == first['gates']['testing']['result']
+        assert 'High vulnerabilities (2) exceed threshold (1)' in second['gates']['security']['result']['issues']
+
+        (artifacts / 'trivy-results.sarif').write_text(json.dumps({'runs': []}))
+        monkeypatch.setattr(QualityGateEvaluator, '_parse_sarif_file', parse_sarif_file)
+        third = QualityGateEvaluator(cache_file).evaluate_all_gates()
+        assert third['gates']['security']['result']['vulnerabilities']['critical'] == 0
+        assert third['timing']['artifacts_parsed'] == 1
+
+
+def write_runs(history_dir, runs):
+    history_dir.mkdir(exist_ok=True)
+    for i, results in enumerate(runs):
+        (history_dir / f'render_benchmark_20261019_0100{i:02d}.json').write_text(json.dumps(
+            {'results': {name: {'samples': samples, 'unit': 'seconds'} for name, samples in results.items()}}))
+
+
+class TestRegressionDetector:
+    """Test the statistical performance-regression gate"""
+
+    def test_mann_whitney_exact_p_values(self):
+        assert mann_whitney_u([4, 5, 6], [1, 2, 3]) == (9, 0.05, 1.0)
+        assert mann_whitney_u([1, 5, 3], [4, 2, 6])[1:] == (0.8, 0.35)
+
+    def test_only_significant_slowdowns_over_threshold_fail(self, tmp_path):
+        history = [{'steady': [1.0, 1.02, 0.98], 'slow': [1.0, 1.01, 0.99], 'mild': [1.0, 1.01, 0.99]}] * 4
+        write_runs(tmp_path / 'benchmarks', history + [
+            {'steady': [1.03, 0.97, 1.01], 'slow': [1.5, 1.6, 1.55], 'mild': [1.1, 1.12, 1.09], 'new': [0.5]}])
+        (tmp_path / 'benchmarks' / 'render_benchmark_20250101_000000.json').write_text('{"results": ')
+
+        verdicts = RegressionDetector(max_degradation=20.0, history_runs=3).evaluate(
+            load_history(str(tmp_path / 'benchmarks')))
+        assert {metric: verdict['verdict'] for metric, verdict in verdicts.items()} == \
+            {'steady': 'unchanged', 'slow': 'regression', 'mild': 'slower', 'new': 'no_baseline'}
+        assert verdicts['slow']['baseline_runs'] == 3 and verdicts['slow']['degradation_percent'] == 55.0
+
+    def test_too_few_samples_fall_back_to_threshold(self, artifacts):
+        detector = RegressionDetector(max_degradation=20.0)
+        verdict = detector.compare([100.0], [1.0, 1.01, 0.99, 1.02, 1.0])
+        assert verdict['verdict'] == 'insufficient_samples' and verdict['p_value'] is None
+        assert detector.fails(verdict)
+        assert not detector.fails(detector.compare([1.1], [1.0, 1.01, 0.99, 1.02, 1.0]))
+
+        write_runs(artifacts / 'benchmark_results', [{'cold': [1.0]}, {'cold': [1.5]}])
+        passed, result = QualityGateEvaluator().evaluate_performance_gate()
+        assert not passed
+        assert 'cold slowed down 50.0% (1 vs 1 samples, too few to test), above threshold (20.0%)' in result['issues']
+
+    def test_performance_gate_reports_verdicts(self, artifacts, monkeypatch):
+        write_runs(artifacts / 'benchmark_results', [{'slow': [1.0, 1.01, 0.99]}, {'slow': [1.5, 1.6, 1.55]}])
+        monkeypatch.setenv('MAX_PERFORMANCE_DEGRADATION', '60')
+        passed, result = QualityGateEvaluator().evaluate_performance_gate()
+        assert result['regression']['metrics']['slow']['verdict'] == 'slower'
+        assert not [issue for issue in result['issues'] if 'slow ' in issue]
+
+        monkeypatch.setenv('MAX_PERFORMANCE_DEGRADATION', '20')
+        passed, result = QualityGateEvaluator().evaluate_performance_gate()
+        assert not passed
+        assert 'slow slowed down 55.0% (p=0.050), above threshold (20.0%)' in result['issues']
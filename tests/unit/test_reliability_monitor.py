@@ -0,0 +1,348 @@
+"""
+Unit tests for the reliability_monitor role's Python components
+Loads the deployed script templates directly as modules
+"""
+
+import http.server
+import importlib.machinery
+import importlib.util
+import socket
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+import yaml
+
+pytest.importorskip('psutil')
+pytest.importorskip('requests')
+
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / 'roles' / 'reliability_monitor' / 'templates'
+
+
+def load_template_module(name):
+    """Import a Python script template under the name it is deployed with"""
+    path = TEMPLATES_DIR / f'{name}.py.j2'
+    loader = importlib.machinery.SourceFileLoader(name, str(path))
+    spec = importlib.util.spec_from_loader(name, loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def resource_sampler():
+    return load_template_module('resource_sampler')
+
+
+@pytest.fixture
+def probes():
+    return load_template_module('probes')
+
+
+class HealthHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        status = 200 if self.path == '/health' else 503
+        body = b'ok' if status == 200 else b'unavailable'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def history_store():
+    return load_template_module('history_store')
+
+
+@pytest.fixture
+def metrics_exporter():
+    return load_template_module('metrics_exporter')
+
+
+@pytest.fixture
+def health_checker(tmp_path):
+    load_template_module('history_store')
+    load_template_module('metrics_exporter')
+    load_template_module('probes')
+    load_template_module('resource_sampler')
+    module = load_template_module('health_checker')
+    config_path = tmp_path / 'config.yml'
+    config_path.write_text(yaml.safe_dump({
+        'service_monitoring': {'enabled': True},
+        'health_checks': {'enabled': True, 'services': []},
+        'resource_sampling': {'interval': 0.05, 'history_size': 100, 'average_windows': [60]},
+        'error_handling': {'log_level': 'INFO', 'log_file': str(tmp_path / 'monitor.log')}
+    }))
+    checker = module.HealthChecker(str(config_path))
+    yield checker
+    if checker.resource_sampler is not None:
+        checker.resource_sampler.stop()
+
+
+class TestResourceSampler:
+    """Test background resource sampling"""
+
+    def test_start_takes_initial_sample(self, resource_sampler):
+        sampler = resource_sampler.ResourceSampler(interval=60)
+        sampler.start()
+        try:
+            sample = sampler.latest()
+            assert sample is not None
+            assert sample['memory']['total'] > 0
+            # Primed, so a one-shot run already has CPU and I/O rates
+            assert 0 <= sample['cpu']['percent'] <= 100
+            assert sample['network']['bytes_recv_per_sec'] >= 0
+            assert any(disk['mountpoint'] == '/' for disk in sample['disks'])
+        finally:
+            sampler.stop()
+
+    def test_rates_and_ring_buffer(self, resource_sampler):
+        sampler = resource_sampler.ResourceSampler(interval=60, history_size=3)
+        for _ in range(5):
+            sampler.sample()
+            time.sleep(0.01)
+
+        assert len(sampler.samples) == 3
+        latest = sampler.latest()
+        assert latest['cpu']['percent'] is not None
+        assert len(latest['cpu']['per_core']) == sampler.cpu_count
+        assert latest['network']['bytes_recv_per_sec'] >= 0
+
+    def test_window_average(self, resource_sampler):
+        sampler = resource_sampler.ResourceSampler(interval=60)
+        sampler.sample()
+        sampler.sample()
+
+        averages = sampler.window_average(60)
+        assert averages['samples'] == 2
+        assert averages['memory']['percent'] is not None
+        assert sampler.window_average(0)['samples'] == 0
+
+
+class TestHealthCheckerResources:
+    """Test the resource utilization check"""
+
+    def test_check_does_not_block(self, health_checker):
+        started = time.monotonic()
+        result = health_checker.check_resource_utilization()
+        assert time.monotonic() - started < 0.5
+        assert 'error' not in result
+        assert result['disk']['percent'] is not None
+        assert '60s' in result['averages']
+
+    def test_check_reads_background_samples(self, health_checker):
+        health_checker.check_resource_utilization()
+        time.sleep(0.2)
+        result = health_checker.check_resource_utilization()
+        assert result['cpu']['percent'] is not None
+        assert result['averages']['60s']['samples'] >= 2
+
+
+class TestProbes:
+    """Test TCP, HTTP and TLS probes"""
+
+    def test_percentile(self, probes):
+        values = [float(v) for v in range(1, 101)]
+        assert probes.percentile(values, 50) == pytest.approx(50.5)
+        assert probes.percentile(values, 99) == pytest.approx(99.01)
+        assert probes.percentile([], 50) is None
+
+    def test_tcp_probe_measures_latency(self, probes, http_server):
+        prober = probes.Prober(timeout=2)
+        port = http_server.server_address[1]
+        for _ in range(5):
+            result = prober.tcp_probe('127.0.0.1', port)
+
+        assert result['accessible'] is True
+        assert isinstance(result['response_time_ms'], float)
+        assert result['latency']['count'] == 5
+        assert result['latency']['p50_ms'] <= result['latency']['p99_ms']
+
+    def test_tcp_probe_refused(self, probes):
+        result = probes.Prober(timeout=2).tcp_probe('127.0.0.1', unused_port())
+        assert result['accessible'] is False
+        assert 'error' in result
+
+    def test_http_probe_reuses_session(self, probes, http_server):
+        prober = probes.Prober(timeout=2)
+        url = f"http://127.0.0.1:{http_server.server_address[1]}/health"
+        results = [prober.http_probe(url, expected_body='ok') for _ in range(3)]
+
+        assert all(result['healthy'] for result in results)
+        assert len(prober._sessions) == 1
+        assert results[-1]['latency']['count'] == 3
+        prober.close()
+
+    def test_http_probe_unexpected_status(self, probes, http_server):
+        prober = probes.Prober(timeout=2)
+        result = prober.http_probe(f"http://127.0.0.1:{http_server.server_address[1]}/down")
+        assert result['healthy'] is False
+        assert result['status_code'] == 503
+
+    def test_tls_probe_refused(self, probes):
+        result = probes.Prober(timeout=2).tls_probe('127.0.0.1', unused_port())
+        assert result['healthy'] is False
+
+
+class TestHealthCheckerProbes:
+    """Test probe-backed service checks"""
+
+    def test_service_probes_use_configured_host(self, health_checker, http_server):
+        port = http_server.server_address[1]
+        health_checker.config['health_checks']['services'] = [{
+            'name': 'web',
+            'host': '127.0.0.1',
+            'port': port,
+            'http': {'path': '/health', 'expected_body': 'ok'}
+        }]
+        health_checker.check_service_status = lambda name: {'service': name, 'active': True}
+
+        results = health_checker.run_health_checks('services')
+        assert results['results'][f'port_web_{port}']['accessible'] is True
+        assert results['results']['http_web']['healthy'] is True
+        assert results['summary']['failed'] == 0
+
+
+def sample_results(passed=True):
+    return {'results': {
+        'service_web': {'service': 'web', 'active': passed, 'passed': passed, 'duration_ms': 3.0},
+        'port_web_80': {'service': 'web', 'accessible': True, 'passed': True, 'response_time_ms': 1.5},
+        'service_db': {'service': 'db', 'error': 'Circuit breaker is OPEN', 'passed': False}
+    }}
+
+
+class TestHistoryStore:
+    """Test check history storage and downsampling"""
+
+    def test_recent_returns_raw_results(self, history_store, tmp_path):
+        store = history_store.HistoryStore(str(tmp_path / 'history.db'))
+        now = 1_700_000_000
+        store.record_results(sample_results(), now=now - 120)
+        store.record_results(sample_results(passed=False), now=now - 30)
+
+        history = store.recent('service_web', minutes=1, now=now)
+        assert len(history) == 1
+        assert history[0]['passed'] is False
+        assert len(store.recent('port_web_80', minutes=5, now=now)) == 2
+        assert store.recent('port_web_80', minutes=5, now=now)[0]['latency_ms'] == 1.5
+
+    def test_failure_rate_spans_tiers_without_double_counting(self, history_store, tmp_path):
+        store = history_store.HistoryStore(str(tmp_path / 'history.db'), raw_retention_hours=1)
+        hour = 1_700_000_000 // 3600 * 3600
+        # Two hours of per-minute results: web fails one run in four
+        for minute in range(120):
+            store.record_results(sample_results(passed=minute % 4 != 0), now=hour + minute * 60)
+
+        rates = store.failure_rate_per_hour(hours=3, service='web', now=hour + 7199)
+        assert [rate['hour'] for rate in rates] == [hour, hour + 3600]
+        assert all(rate['total'] == 120 for rate in rates)
+        assert all(rate['failures'] == 15 for rate in rates)
+        assert rates[0]['failure_rate'] == 0.125
+
+        rows = store._conn.execute("SELECT COUNT(*) FROM results_1h").fetchone()[0]
+        assert rows == 3, "first hour should be rolled up for every check"
+
+    def test_retention_keeps_unrolled_raw_rows(self, history_store, tmp_path):
+        store = history_store.HistoryStore(str(tmp_path / 'history.db'), raw_retention_hours=0)
+        now = 1_700_000_000
+        store.record_results(sample_results(), now=now)
+        store.record_results(sample_results(), now=now + 600)
+
+        assert store._conn.execute("SELECT COUNT(*) FROM results_raw").fetchone()[0] == 3
+        assert store._conn.execute("SELECT SUM(total) FROM results_1m").fetchone()[0] == 3
+
+    def test_health_checker_records_history(self, health_checker, tmp_path):
+        health_checker.config['history'] = {'enabled': True, 'path': str(tmp_path / 'history.db')}
+        health_checker.run_health_checks('resources')
+        history = health_checker.history.recent('system_resources', minutes=5)
+        assert len(history) == 1
+        assert history[0]['passed'] is True
+
+    def test_raising_check_is_recorded_as_error(self, health_checker, history_store, tmp_path):
+        def broken():
+            raise RuntimeError('probe crashed')
+        results = {'results': {}, 'summary': {'total_checks': 0, 'passed': 0, 'failed': 0, 'errors': 0}}
+        health_checker._run_check(results, 'broken', 'web', bool, broken)
+        health_checker._run_check(results, 'down', 'web', lambda r: r['up'], lambda: {'up': False})
+
+        store = history_store.HistoryStore(str(tmp_path / 'history.db'))
+        store.record_results(results)
+        assert store.recent('broken', minutes=1)[0]['error'] is True
+        down = store.recent('down', minutes=1)[0]
+        assert down['passed'] is False and down['error'] is False
+
+
+class TestMetricsExporter:
+    """Test the Prometheus exporter"""
+
+    def test_render_after_update(self, metrics_exporter, health_checker):
+        breaker = health_checker._get_circuit_breaker('db')
+        breaker.state = 'OPEN'
+        exporter = metrics_exporter.MetricsExporter(health_checker)
+        exporter.update(dict(sample_results(passed=False), duration_ms=12.0, summary={'passed': 1, 'failed': 1, 'errors': 1}))
+
+        page = exporter.render().decode()
+        assert 'hx_health_check_up{check="service_web",service="web"} 0' in page
+        assert 'hx_health_check_up{check="port_web_80",service="web"} 1' in page
+        assert 'hx_health_check_latency_seconds{check="port_web_80",service="web"} 0.0015' in page
+        assert 'hx_health_check_failures_total{check="service_web",service="web"} 1' in page
+        assert 'hx_health_check_errors_total{check="service_db",service="db"} 1' in page
+        assert 'hx_health_check_circuit_breaker_state{service="db"} 2' in page
+        assert 'hx_health_checker_last_run_duration_seconds 0.012' in page
+        assert 'hx_health_checker_checks{outcome="errors"} 1' in page
+
+    def test_scrapes_reuse_cached_render(self, metrics_exporter, health_checker, monkeypatch):
+        exporter = metrics_exporter.MetricsExporter(health_checker)
+        exporter.update(sample_results())
+        renders = []
+        original = exporter._render
+        monkeypatch.setattr(exporter, '_render', lambda: renders.append(1) or original())
+
+        exporter.render()
+        page = exporter.render().decode()
+        assert len(renders) == 1
+        assert page.endswith('hx_health_checker_scrapes_total 2\n')
+
+        exporter.update(sample_results())
+        exporter.render()
+        assert len(renders) == 2
+
+    def test_label_escaping(self, metrics_exporter):
+        sample = metrics_exporter.format_sample('m', {'check': 'a"b\\c'}, 1)
+        assert sample == 'm{check="a\\"b\\\\c"} 1'
+
+    def test_serves_metrics_endpoint(self, metrics_exporter, health_checker):
+        exporter = metrics_exporter.MetricsExporter(health_checker, listen_address='127.0.0.1', port=0)
+        exporter.update(sample_results())
+        exporter.start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{exporter.port}/metrics', timeout=5) as response:
+                assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+                assert b'hx_health_checker_runs_total 1' in response.read()
+        finally:
+            exporter.stop()
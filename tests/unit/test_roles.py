@@ -5,7 +5,6 @@ Tests role functionality, variable validation, and task logic
 """
 
 import pytest
-import yaml
 import os
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -40,124 +39,84 @@ class TestRoleStructure:
                         keep_file = role_dir / '.keep'
                         assert keep_file.exists(), f"Role {role_dir.name} missing {req_dir} directory or .keep file"
     
-    def test_role_metadata(self, roles_dir):
+    def test_role_metadata(self, project_index):
         """Test that roles have proper metadata"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                meta_file = role_dir / 'meta' / 'main.yml'
-                if meta_file.exists():
-                    with open(meta_file, 'r') as f:
-                        meta_data = yaml.safe_load(f)
-                        assert 'galaxy_info' in meta_data, f"Role {role_dir.name} missing galaxy_info"
-                        
-                        galaxy_info = meta_data['galaxy_info']
-                        assert 'author' in galaxy_info, f"Role {role_dir.name} missing author"
-                        assert 'description' in galaxy_info, f"Role {role_dir.name} missing description"
+        for role in project_index.roles():
+            if role.main_file('meta'):
+                meta_data = role.meta
+                assert 'galaxy_info' in meta_data, f"Role {role.name} missing galaxy_info"
+                
+                galaxy_info = meta_data['galaxy_info']
+                assert 'author' in galaxy_info, f"Role {role.name} missing author"
+                assert 'description' in galaxy_info, f"Role {role.name} missing description"
 
 
 class TestRoleVariables:
     """Test role variable definitions and validation"""
     
-    @pytest.fixture
-    def roles_dir(self):
-        return Path(__file__).parent.parent.parent / 'roles'
-    
-    def test_defaults_syntax(self, roles_dir):
+    def test_defaults_syntax(self, project_index):
         """Test that defaults/main.yml files have valid YAML syntax"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                defaults_file = role_dir / 'defaults' / 'main.yml'
-                if defaults_file.exists():
-                    with open(defaults_file, 'r') as f:
-                        try:
-                            yaml.safe_load(f)
-                        except yaml.YAMLError as e:
-                            pytest.fail(f"Invalid YAML in {defaults_file}: {e}")
-    
-    def test_vars_syntax(self, roles_dir):
+        for role in project_index.roles():
+            defaults_file = role.main_file('defaults')
+            if defaults_file:
+                _, error = project_index.parse(defaults_file)
+                if error:
+                    pytest.fail(f"Invalid YAML in {defaults_file}: {error}")
+    
+    def test_vars_syntax(self, project_index):
         """Test that vars/main.yml files have valid YAML syntax"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                vars_file = role_dir / 'vars' / 'main.yml'
-                if vars_file.exists():
-                    with open(vars_file, 'r') as f:
-                        try:
-                            yaml.safe_load(f)
-                        except yaml.YAMLError as e:
-                            pytest.fail(f"Invalid YAML in {vars_file}: {e}")
-    
-    def test_variable_naming(self, roles_dir):
+        for role in project_index.roles():
+            vars_file = role.main_file('vars')
+            if vars_file:
+                _, error = project_index.parse(vars_file)
+                if error:
+                    pytest.fail(f"Invalid YAML in {vars_file}: {error}")
+    
+    def test_variable_naming(self, project_index):
         """Test that variables follow naming conventions"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                defaults_file = role_dir / 'defaults' / 'main.yml'
-                if defaults_file.exists():
-                    with open(defaults_file, 'r') as f:
-                        defaults_data = yaml.safe_load(f) or {}
-                        for var_name in defaults_data.keys():
-                            # Variables should use snake_case
-                            assert '_' in var_name or var_name.islower(), \
-                                f"Variable {var_name} in {role_dir.name} should use snake_case"
+        for role in project_index.roles():
+            defaults_data = role.load_main('defaults') or {}
+            for var_name in defaults_data.keys():
+                # Variables should use snake_case
+                assert '_' in var_name or var_name.islower(), \
+                    f"Variable {var_name} in {role.name} should use snake_case"
 
 
 class TestRoleTasks:
     """Test role task definitions and logic"""
     
-    @pytest.fixture
-    def roles_dir(self):
-        return Path(__file__).parent.parent.parent / 'roles'
-    
-    def test_tasks_syntax(self, roles_dir):
+    def test_tasks_syntax(self, project_index):
         """Test that task files have valid YAML syntax"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                tasks_dir = role_dir / 'tasks'
-                if tasks_dir.exists():
-                    for task_file in tasks_dir.glob('*.yml'):
-                        with open(task_file, 'r') as f:
-                            try:
-                                yaml.safe_load(f)
-                            except yaml.YAMLError as e:
-                                pytest.fail(f"Invalid YAML in {task_file}: {e}")
+        for role in project_index.roles():
+            for task_file in role.yaml_files('tasks'):
+                _, error = project_index.parse(task_file)
+                if error:
+                    pytest.fail(f"Invalid YAML in {task_file}: {error}")
     
-    def test_task_naming(self, roles_dir):
+    def test_task_naming(self, project_index):
         """Test that tasks have descriptive names"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                tasks_dir = role_dir / 'tasks'
-                if tasks_dir.exists():
-                    for task_file in tasks_dir.glob('*.yml'):
-                        with open(task_file, 'r') as f:
-                            tasks_data = yaml.safe_load(f) or []
-                            if isinstance(tasks_data, list):
-                                for task in tasks_data:
-                                    if isinstance(task, dict) and 'name' in task:
-                                        name = task['name']
-                                        assert len(name) > 5, \
-                                            f"Task name '{name}' in {task_file} should be descriptive"
-                                        assert not name.startswith('Task'), \
-                                            f"Task name '{name}' in {task_file} should not start with 'Task'"
+        for role in project_index.roles():
+            for task_file, tasks_data in role.tasks.items():
+                if isinstance(tasks_data, list):
+                    for task in tasks_data:
+                        if isinstance(task, dict) and 'name' in task:
+                            name = task['name']
+                            assert len(name) > 5, \
+                                f"Task name '{name}' in {task_file} should be descriptive"
+                            assert not name.startswith('Task'), \
+                                f"Task name '{name}' in {task_file} should not start with 'Task'"
 
 
 class TestRoleHandlers:
     """Test role handler definitions"""
     
-    @pytest.fixture
-    def roles_dir(self):
-        return Path(__file__).parent.parent.parent / 'roles'
-    
-    def test_handlers_syntax(self, roles_dir):
+    def test_handlers_syntax(self, project_index):
         """Test that handler files have valid YAML syntax"""
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                handlers_dir = role_dir / 'handlers'
-                if handlers_dir.exists():
-                    for handler_file in handlers_dir.glob('*.yml'):
-                        with open(handler_file, 'r') as f:
-                            try:
-                                yaml.safe_load(f)
-                            except yaml.YAMLError as e:
-                                pytest.fail(f"Invalid YAML in {handler_file}: {e}")
+        for role in project_index.roles():
+            for handler_file in role.yaml_files('handlers'):
+                _, error = project_index.parse(handler_file)
+                if error:
+                    pytest.fail(f"Invalid YAML in {handler_file}: {error}")
 
 
 class TestRoleTemplates:
@@ -194,29 +153,25 @@ class TestRoleTemplates:
 class TestRoleIntegration:
     """Integration tests for role functionality"""
     
-    def test_role_dependencies(self):
+    def test_role_dependencies(self, project_index):
         """Test that role dependencies are properly defined"""
         roles_dir = Path(__file__).parent.parent.parent / 'roles'
         
-        for role_dir in roles_dir.iterdir():
-            if role_dir.is_dir() and not role_dir.name.startswith('.'):
-                meta_file = role_dir / 'meta' / 'main.yml'
-                if meta_file.exists():
-                    with open(meta_file, 'r') as f:
-                        meta_data = yaml.safe_load(f) or {}
-                        dependencies = meta_data.get('dependencies', [])
-                        
-                        # Check that dependencies exist
-                        for dep in dependencies:
-                            if isinstance(dep, str):
-                                dep_name = dep
-                            elif isinstance(dep, dict):
-                                dep_name = dep.get('role', dep.get('name', ''))
-                            
-                            if dep_name and not dep_name.startswith('community.'):
-                                dep_path = roles_dir / dep_name
-                                assert dep_path.exists(), \
-                                    f"Dependency {dep_name} for role {role_dir.name} does not exist"
+        for role in project_index.roles():
+            meta_data = role.meta or {}
+            dependencies = meta_data.get('dependencies', [])
+            
+            # Check that dependencies exist
+            for dep in dependencies:
+                if isinstance(dep, str):
+                    dep_name = dep
+                elif isinstance(dep, dict):
+                    dep_name = dep.get('role', dep.get('name', ''))
+                
+                if dep_name and not dep_name.startswith('community.'):
+                    dep_path = roles_dir / dep_name
+                    assert dep_path.exists(), \
+                        f"Dependency {dep_name} for role {role.name} does not exist"
 
 
 class TestRoleDocumentation:
@@ -0,0 +1,223 @@
+"""
+Unit tests for security report generation
+"""
+
+import io
+import json
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'security'))
+
+from streaming_json import StreamingJSONReader, START_ARRAY
+from generate_security_report import SecurityReportGenerator
+from finding_dedup import FindingIndex, fingerprint
+from security_gate import SecurityGate
+from finding_baseline import FindingBaseline
+
+SARIF = {
+    'version': '2.1.0',
+    'runs': [{
+        'tool': {'driver': {'name': 'Trivy', 'rules': [{'id': 'CVE-2024-0001', 'help': {'text': 'x' * 100}}]}},
+        'results': [
+            {'ruleId': 'CVE-2024-0001', 'level': 'error', 'message': {'text': 'openssl 3.0.1'},
+             'locations': [{'physicalLocation': {'artifactLocation': {'uri': 'Dockerfile'},
+                                                 'region': {'startLine': 3}}}],
+             'properties': {'tags': {'cwe': 'CWE-79'}}},
+            {'ruleId': 'CVE-2024-0002', 'level': 'note', 'message': {'text': 'zlib 1.2'}}
+        ]
+    }]
+}
+
+
+def read_items(text, prefixes, chunk_size):
+    reader = StreamingJSONReader(io.StringIO(text), chunk_size)
+    return [(prefix, value) for prefix, value in reader.items(prefixes) if value is not START_ARRAY]
+
+
+class TestStreamingJSONReader:
+    """Test pulling values out of JSON without loading the document"""
+
+    @pytest.mark.parametrize('chunk_size', [1, 5, 4096])
+    def test_items_match_json_load(self, chunk_size):
+        text = json.dumps(SARIF, indent=1)
+        items = read_items(text, ['runs.item.tool.driver.name', 'runs.item.results.item'], chunk_size)
+        assert items == [('runs.item.tool.driver.name', 'Trivy')] + \
+            [('runs.item.results.item', result) for result in SARIF['runs'][0]['results']]
+
+    @pytest.mark.parametrize('chunk_size', [1, 3])
+    def test_values_split_across_chunks(self, chunk_size):
+        text = '{"skip": {"a": ["]}{\\"", -1.5e10]}, "items": [-25000000000.0, 12345678901234567890, "\\u00e9", true, null]}'
+        assert [value for _, value in read_items(text, ['items.item'], chunk_size)] == \
+            [-25000000000.0, 12345678901234567890, 'é', True, None]
+
+    def test_empty_array_is_announced(self):
+        events = list(StreamingJSONReader(io.StringIO('{"issues": [], "results": [1]}')).items(
+            ['issues.item', 'results.item']))
+        assert events == [('issues', START_ARRAY), ('results', START_ARRAY), ('results.item', 1)]
+
+    @pytest.mark.parametrize('text', ['{"results": [1,', '{"results": [1] x', '{"results": [1 2]}', '{} {}'])
+    def test_malformed_input_raises(self, text):
+        with pytest.raises(ValueError):
+            read_items(text, ['results.item'], 2)
+
+
+class TestCollectScanResults:
+    """Test collecting findings from tool output files"""
+
+    @pytest.fixture
+    def results_dir(self, tmp_path, monkeypatch):
+        (tmp_path / 'trivy-image.sarif').write_text(json.dumps(SARIF))
+        (tmp_path / 'bandit-report.json').write_text(json.dumps({'results': [
+            {'test_id': 'B105', 'issue_severity': 'LOW', 'filename': 'app.py', 'line_number': 7}]}))
+        (tmp_path / 'checkov-report.json').write_text(json.dumps({'issues': [], 'results': [{'id': 'CKV_1'}]}))
+        (tmp_path / 'grype-image.json').write_text('{"matches": [')
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    @pytest.mark.parametrize('workers', [1, 3])
+    def test_findings_merged_in_tool_order(self, results_dir, workers):
+        generator = SecurityReportGenerator()
+        generator.collect_scan_results(workers)
+        vulnerabilities = generator.report_data['vulnerabilities']
+        assert [v['id'] for v in vulnerabilities] == ['CVE-2024-0001', 'CVE-2024-0002', 'B105']
+        assert vulnerabilities[0]['severity'] == 'high'
+        assert vulnerabilities[0]['locations'] == [{'file': 'Dockerfile', 'line': 3, 'column': 0}]
+        assert vulnerabilities[0]['cwe'] == ['CWE-79']
+        assert generator.report_data['summary']['tools_executed'] == ['Trivy', 'Checkov', 'Bandit', 'Grype']
+        # Generic output takes findings from the first list key, even an empty one
+        assert generator.report_data['tool_results']['checkov']['vulnerabilities'] == []
+        assert generator.report_data['tool_results']['grype']['errors']
+
+
+class TestFindingDedup:
+    """Test merging findings several tools report"""
+
+    @pytest.fixture
+    def overlapping_results(self, tmp_path, monkeypatch):
+        (tmp_path / 'trivy-fs.json').write_text(json.dumps({'Results': [{'Target': 'requirements.txt', 'Vulnerabilities': [
+            {'VulnerabilityID': 'CVE-2023-32681', 'PkgName': 'requests', 'InstalledVersion': '2.25.0', 'Severity': 'MEDIUM'},
+            {'VulnerabilityID': 'CVE-2024-0001', 'PkgName': 'jinja2', 'InstalledVersion': '3.1.2', 'Severity': 'HIGH'}]}]}))
+        (tmp_path / 'grype-fs.json').write_text(json.dumps({'matches': [
+            {'vulnerability': {'id': 'GHSA-j8r2-6x86-q33q', 'severity': 'High'},
+             'relatedVulnerabilities': [{'id': 'CVE-2023-32681'}],
+             'artifact': {'name': 'Requests', 'version': 'v2.25.0', 'locations': [{'path': '/app/requirements.txt'}]}}]}))
+        (tmp_path / 'snyk.json').write_text(json.dumps({'vulnerabilities': [
+            {'id': 'SNYK-PYTHON-REQUESTS-5595532', 'severity': 'medium', 'packageName': 'requests', 'version': '2.25.0',
+             'identifiers': {'CVE': ['CVE-2023-32681'], 'CWE': ['CWE-200']}}]}))
+        (tmp_path / 'bandit-report.json').write_text(json.dumps({'results': [
+            {'test_id': 'B105', 'filename': './app.py', 'line_number': 7},
+            {'test_id': 'B105', 'filename': 'app.py', 'line_number': 7},
+            {'test_id': 'B105', 'filename': 'app.py', 'line_number': 9}]}))
+        monkeypatch.chdir(tmp_path)
+        return tmp_path
+
+    def test_same_cve_on_same_package_merged(self, overlapping_results):
+        generator = SecurityReportGenerator()
+        generator.collect_scan_results(workers=1)
+        generator.calculate_summary_statistics()
+        vulnerabilities = generator.report_data['vulnerabilities']
+
+        requests_cve = [v for v in vulnerabilities if v.get('package', '').lower() == 'requests']
+        assert len(requests_cve) == 1
+        assert requests_cve[0]['tools'] == ['Trivy', 'Snyk', 'Grype']
+        assert [p['id'] for p in requests_cve[0]['provenance']] == \
+            ['CVE-2023-32681', 'SNYK-PYTHON-REQUESTS-5595532', 'GHSA-j8r2-6x86-q33q']
+        assert requests_cve[0]['severity'] == 'high'
+        assert requests_cve[0]['cwe'] == ['CWE-200']
+
+        summary = generator.report_data['summary']
+        assert summary['total_vulnerabilities'] == 4
+        assert summary['raw_counts']['total'] == 7
+        assert summary['duplicates_merged'] == 3
+        assert summary['high_count'] == 2
+        assert summary['raw_counts']['high'] == 2
+
+    def test_code_findings_keep_their_location(self):
+        index = FindingIndex()
+        index.add_all([{'id': 'B105', 'tool': 'Bandit', 'locations': [{'file': 'app.py', 'line': line}]}
+                       for line in (7, 7, 9)])
+        assert len(index.findings()) == 2
+        assert index.duplicate_count == 1
+        assert fingerprint({'id': 'B105', 'locations': [{'file': './app.py', 'line': 7}]}) == \
+            index.findings()[0]['fingerprint']
+
+    def test_gate_thresholds_use_deduplicated_counts(self, overlapping_results, monkeypatch):
+        generator = SecurityReportGenerator()
+        generator.collect_scan_results(workers=1)
+        generator.calculate_summary_statistics()
+        generator.generate_recommendations()
+        generator.generate_json_report('security-report.json')
+
+        monkeypatch.setenv('MAX_HIGH_VULNERABILITIES', '2')
+        monkeypatch.setenv('REQUIRED_SECURITY_TOOLS', 'trivy')
+        result = SecurityGate().evaluate_security_gate('security-report.json')
+        assert result['vulnerabilities']['high'] == 2
+        assert result['vulnerabilities']['raw']['total'] == 7
+        assert result['vulnerabilities']['duplicates_merged'] == 3
+        assert not [v for v in result['violations'] if v['type'] == 'high_vulnerabilities']
+
+
+class TestFindingBaseline:
+    """Test gating on findings new since the baseline"""
+
+    FINDINGS = [
+        {'fingerprint': 'a1', 'id': 'CVE-2024-0001', 'severity': 'high', 'tools': ['Trivy']},
+        {'fingerprint': 'b2', 'id': 'CVE-2024-0002', 'severity': 'critical', 'tools': ['Grype']},
+        {'fingerprint': 'c3', 'id': 'B105', 'severity': 'medium', 'tool': 'Bandit',
+         'locations': [{'file': 'app.py', 'line': 7}]},
+    ]
+
+    def test_accept_expire_and_diff(self, tmp_path):
+        baseline = FindingBaseline(str(tmp_path / 'baseline.json'))
+        assert baseline.accept(self.FINDINGS[:2], reason='Vendor fix pending') == 2
+        assert baseline.accept(self.FINDINGS[2:], status='suppressed', reason='Test fixture', expires='2000-01-01') == 1
+        baseline.save()
+
+        groups = FindingBaseline(str(tmp_path / 'baseline.json')).partition(self.FINDINGS)
+        assert [len(groups[key]) for key in ('new', 'accepted', 'suppressed', 'expired')] == [0, 2, 0, 1]
+
+        assert baseline.expire() == 1
+        assert baseline.expire(['a1']) == 1
+        assert baseline.classify(self.FINDINGS[0]) == 'expired'
+        assert baseline.diff_report(self.FINDINGS[:1]) == {'new': ['a1'], 'fixed': ['b2']}
+        assert FindingBaseline(str(tmp_path / 'baseline.json')).diff(baseline) == \
+            {'added': [], 'removed': [], 'changed': ['a1', 'c3']}
+
+    def test_expiry_with_offset_round_trips(self, tmp_path):
+        baseline = FindingBaseline(str(tmp_path / 'baseline.json'))
+        baseline.accept(self.FINDINGS[:1], expires='2999-01-01T00:00:00Z')
+        baseline.accept(self.FINDINGS[1:2], expires='2000-01-01T00:00:00+02:00')
+        baseline.save()
+
+        reloaded = FindingBaseline(str(tmp_path / 'baseline.json'))
+        assert reloaded.entries['a1']['expires'] == '2999-01-01T00:00:00+00:00'
+        groups = reloaded.partition(self.FINDINGS[:2])
+        assert groups['accepted'] == self.FINDINGS[:1] and groups['expired'] == self.FINDINGS[1:2]
+        # Naive times, including entries saved before expiries were normalized, are UTC
+        assert reloaded.classify(self.FINDINGS[0], now=datetime(3000, 1, 1)) == 'expired'
+        assert reloaded.expire() == 1
+
+    def test_gate_counts_only_new_findings(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        report = {'summary': {'critical_count': 1, 'high_count': 2, 'total_vulnerabilities': 4,
+                              'tools_executed': ['Trivy'], 'scan_coverage': {'coverage_percentage': 100.0}},
+                  'vulnerabilities': self.FINDINGS + [{'fingerprint': 'd4', 'id': 'CVE-2024-0004', 'severity': 'high'}]}
+        (tmp_path / 'security-report.json').write_text(json.dumps(report))
+        baseline = FindingBaseline('baseline.json')
+        baseline.accept(self.FINDINGS)
+        baseline.save()
+
+        monkeypatch.setenv('MAX_HIGH_VULNERABILITIES', '0')
+        monkeypatch.setenv('REQUIRED_SECURITY_TOOLS', 'trivy')
+        assert SecurityGate().evaluate_security_gate()['status'] == 'FAIL'
+
+        result = SecurityGate('baseline.json', new_only=True).evaluate_security_gate()
+        assert result['vulnerabilities']['critical'] == 0
+        assert result['vulnerabilities']['high'] == 1
+        assert result['baseline']['new'] == 1 and result['baseline']['accepted'] == 3
+        assert [f['fingerprint'] for f in result['baseline']['new_findings']] == ['d4']
+        assert [v['message'] for v in result['violations']] == ['High new vulnerabilities (1) exceed threshold (0)']
@@ -0,0 +1,175 @@
+"""
+Unit tests for the Ansible security validation scanner
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'security', 'validation'))
+
+import security_scan
+from security_scan import SecurityScanner, SECRET_RULES, COMMAND_RULES
+from line_rules import LINE_RULES, LineRuleEngine
+from project_index import ProjectIndex
+
+PLAYBOOK = """- hosts: all
+  tasks:
+    - name: Wipe scratch space
+      shell: rm -rf /tmp/scratch
+    - name: Write config
+      copy:
+        dest: /etc/app.conf
+        mode: '0777'
+"""
+
+VARS = """db_password: "{{ vault_db_password }}"
+api_key: AKIA1234567890ABCDEFGHIJ
+"""
+
+
+def stripped(findings):
+    return [{key: value for key, value in finding.items() if key != 'timestamp'} for finding in findings]
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = tmp_path / 'project'
+    (project / 'playbooks').mkdir(parents=True)
+    (project / 'group_vars').mkdir()
+    (project / 'playbooks' / 'site.yml').write_text(PLAYBOOK)
+    (project / 'group_vars' / 'all.yaml').write_text(VARS)
+    # Skipped directories are never walked
+    (project / '.venv').mkdir()
+    (project / '.venv' / 'ignored.yml').write_text('password: hunter2hunter2')
+    return project
+
+
+class TestScanCache:
+    """Test replaying findings for unchanged files"""
+
+    def test_warm_run_replays_findings(self, project, tmp_path, monkeypatch):
+        cache_file = tmp_path / 'cache.json'
+        cold = SecurityScanner(str(project), str(cache_file))
+        cold.scan_yaml_files()
+        assert cold.stats['files_scanned'] == 2
+        assert cold.stats['files_from_cache'] == 0
+
+        def fail(self, file_path):
+            raise AssertionError(f'{file_path} rescanned')
+        monkeypatch.setattr(SecurityScanner, '_scan_yaml_file', fail)
+        warm = SecurityScanner(str(project), str(cache_file))
+        warm.scan_yaml_files()
+        assert warm.stats == cold.stats | {'files_from_cache': 2}
+        assert stripped(warm.findings) == stripped(cold.findings)
+
+    def test_changed_content_is_rescanned(self, project, tmp_path):
+        cache_file = tmp_path / 'cache.json'
+        SecurityScanner(str(project), str(cache_file)).scan_yaml_files()
+
+        (project / 'playbooks' / 'site.yml').write_text(PLAYBOOK.replace('rm -rf /tmp/scratch', 'echo done'))
+        scanner = SecurityScanner(str(project), str(cache_file))
+        scanner.scan_yaml_files()
+        assert scanner.stats['files_from_cache'] == 1
+        assert not [f for f in scanner.findings if f['category'] == 'dangerous_commands']
+
+    def test_ruleset_change_discards_cache(self, project, tmp_path, monkeypatch):
+        cache_file = tmp_path / 'cache.json'
+        SecurityScanner(str(project), str(cache_file)).scan_yaml_files()
+        monkeypatch.setattr(security_scan, 'RULESET_VERSION', 'next')
+        scanner = SecurityScanner(str(project), str(cache_file))
+        scanner.scan_yaml_files()
+        assert scanner.stats['files_from_cache'] == 0
+
+    def test_serial_scan_uses_warm_project_index(self, project, tmp_path):
+        index_cache = tmp_path / 'index.pickle'
+        # Backdated past the racy window, so the index caches both files
+        past = time.time() - 60
+        for yaml_file in (project / 'playbooks' / 'site.yml', project / 'group_vars' / 'all.yaml'):
+            os.utime(yaml_file, (past, past))
+        SecurityScanner(str(project), index=ProjectIndex(str(project), str(index_cache))).scan_yaml_files()
+
+        index = ProjectIndex(str(project), str(index_cache))
+        SecurityScanner(str(project), index=index).scan_yaml_files(jobs=1)
+        assert index.stats == {'parsed': 0, 'from_cache': 2}
+
+    def test_changed_since_git_ref(self, project, tmp_path):
+        def git(*args):
+            subprocess.run(['git', '-C', str(project)] + list(args), check=True, capture_output=True)
+        git('init', '-q')
+        git('add', '.')
+        git('-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', 'initial')
+
+        (project / 'group_vars' / 'all.yaml').write_text(VARS + 'token: abcdefghijklmnopqrstuvwxyz\n')
+        (project / 'playbooks' / 'new.yml').write_text(PLAYBOOK)
+        scanner = SecurityScanner(str(project), str(tmp_path / 'cache.json'))
+        scanner.scan_yaml_files(changed_since='HEAD')
+        assert scanner.stats['files_scanned'] == 2
+        assert {os.path.basename(f['file_path']) for f in scanner.findings} == {'all.yaml', 'new.yml'}
+
+
+class TestParallelScan:
+    """Test sharding the scan across worker processes"""
+
+    def test_jobs_do_not_change_the_report(self, project, monkeypatch):
+        for i in range(6):
+            (project / 'playbooks' / f'play_{i}.yml').write_text(PLAYBOOK.replace('scratch', f'scratch_{i}'))
+        serial = SecurityScanner(str(project))
+        serial.scan_yaml_files(jobs=1)
+
+        monkeypatch.setattr(security_scan, 'PARALLEL_MIN_FILES', 1)
+        parallel = SecurityScanner(str(project))
+        parallel.scan_yaml_files(jobs=3)
+        assert parallel.stats == serial.stats
+        assert stripped(parallel.findings) == stripped(serial.findings)
+
+    def test_linter_findings_follow_scan_findings(self, project, monkeypatch):
+        monkeypatch.setattr(SecurityScanner, 'ansible_lint_findings',
+                            lambda self: [('medium', 'ansible_lint', 'ansible-lint: risky-shell-pipe')])
+        monkeypatch.setattr(SecurityScanner, 'yamllint_findings',
+                            lambda self: [('low', 'yaml_lint', 'YAML: trailing spaces', 'site.yml', 3)])
+        scanner = SecurityScanner(str(project))
+        scanner.run_all()
+        categories = [finding['category'] for finding in scanner.findings]
+        assert categories[-2:] == ['ansible_lint', 'yaml_lint']
+        assert 'yaml_lint' not in categories[:-2]
+        assert scanner.stats['low_issues'] == 1
+
+
+class TestLineRuleEngine:
+    """Test the compiled line rules against per-line pattern matching"""
+
+    CONTENT = '\n'.join([
+        'db_password: SuperSecretValue123',
+        'admin_password: "{{ vault_admin_password }}"',
+        'PASSWORD=hunter2hunter2 API-KEY=ABCDEFGHIJKLMNOPQRSTUVWX',
+        '  shell: sudo su - && RM -RF /srv && mkfs.ext4 /dev/sdb',
+        '  shell: echo \u00e9 > /dev/sdc; shred -u key.pem',
+        'url: postgresql://app:hunter2@db/app\r',
+        'nothing to see here',
+        'token: abcdefghijklmnopqrstuvwxyz',
+    ])
+
+    @staticmethod
+    def per_line_matches(rules, content):
+        matches = []
+        for line_num, line in enumerate(content.split('\n'), 1):
+            for rule in rules:
+                if re.search(rule['pattern'], line, re.IGNORECASE) and \
+                        not (rule.get('exclude') and re.search(rule['exclude'], line)):
+                    matches.append((line_num, rule['id']))
+        return matches
+
+    @pytest.mark.parametrize('content', [CONTENT, CONTENT.replace('\u00e9', 'e'), CONTENT + '\n', ''])
+    def test_matches_per_line_search(self, content):
+        for engine in (SECRET_RULES, COMMAND_RULES):
+            assert [(line_num, rule['id']) for line_num, rule in engine.scan(content)] == \
+                self.per_line_matches(engine.rules, content)
+
+    def test_exclusions_skip_templated_values(self):
+        engine = LineRuleEngine([rule for rule in LINE_RULES if rule['id'] == 'hardcoded-password'])
+        assert [line_num for line_num, _ in engine.scan(self.CONTENT)] == [1, 3]
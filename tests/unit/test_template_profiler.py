@@ -0,0 +1,95 @@
+"""
+Unit tests for the template render profiler
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts'))
+
+from template_profiler import TemplateRenderProfiler, ansible_environment, schema_context
+
+PROVIDERS = '''model_list:
+{% for provider in providers %}
+  - model_name: {{ provider.model_name }}
+{% for key, value in provider.params.items() %}
+    {{ key }}: {{ value | to_json }}
+{% endfor %}
+{% endfor %}
+{% if cors_enabled %}cors: {{ cors_origins | to_json }}{% endif %}
+timeout: {{ timeout | default(600) }}
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    templates = tmp_path / 'roles' / 'proxy' / 'templates'
+    templates.mkdir(parents=True)
+    (templates / 'config.yaml.j2').write_text(PROVIDERS)
+    (templates / 'broken.j2').write_text('{{ 1 / zero | int }}')
+    (tmp_path / 'roles' / 'proxy' / 'defaults').mkdir()
+    (tmp_path / 'roles' / 'proxy' / 'defaults' / 'main.yml').write_text(
+        'providers: []\ncors_enabled: false\nlisten: "{{ bind_host }}:{{ port }}"\nport: 4000\n')
+
+    inventory = tmp_path / 'inventories' / 'dev'
+    (inventory / 'group_vars').mkdir(parents=True)
+    (inventory / 'hosts.yml').write_text('''all:
+  vars: {bind_host: 0.0.0.0, tier: all}
+  children:
+    proxies:
+      hosts:
+        proxy01: {port: 4100}
+      vars: {tier: inline}
+''')
+    (inventory / 'group_vars' / 'proxies.yml').write_text(
+        'tier: group_vars\nproviders:\n  - model_name: gpt\n    params: {api_base: http://gpt}\n')
+    return tmp_path
+
+
+class TestTemplateRenderProfiler:
+    """Test inferred contexts, host contexts and the render profile"""
+
+    def test_schema_context_fills_lists_and_branches(self):
+        context, error = schema_context(ansible_environment(), PROVIDERS, list_size=4)
+        assert error is None
+        assert len(context['providers']) == 4
+        assert context['providers'][0]['model_name'] == 'model_name'
+        assert len(context['providers'][0]['params']) == 4
+        # Used with a default, so the template's default renders
+        assert 'timeout' not in context
+        assert context['cors_enabled'] and 'cors_origins' in context
+
+    def test_profile_flags_slowest_and_reports_failures(self, project):
+        profiler = TemplateRenderProfiler(str(project), runs=3, list_size=20)
+        profile = profiler.profile(slowest=1)
+        config = profile['templates'][os.path.join('roles', 'proxy', 'templates', 'config.yaml.j2')]
+        assert config['error'] is None and config['schema_error'] is None
+        assert len(config['samples']) == 3
+        assert config['output_bytes'] > 20 * 20 * len('    params_0: "params"\n')
+        assert config['peak_bytes'] > 0
+        assert profile['slowest'] == [os.path.join('roles', 'proxy', 'templates', 'config.yaml.j2')]
+        assert config['slow']
+
+        broken = profile['templates'][os.path.join('roles', 'proxy', 'templates', 'broken.j2')]
+        assert broken['error'].startswith('ZeroDivisionError')
+        assert profile['summary']['rendered_templates'] == 1 and profile['summary']['failed_templates'] == 1
+
+    def test_host_context_uses_inventory_precedence(self, project):
+        profiler = TemplateRenderProfiler(str(project), runs=1, host='proxy01')
+        profiler.profile([project / 'roles' / 'proxy' / 'templates' / 'config.yaml.j2'])
+        env = profiler.environment(project / 'roles' / 'proxy' / 'templates')
+        context, _ = profiler.context(env, PROVIDERS, project / 'roles' / 'proxy')
+        # group_vars file over inline group vars over role defaults; host vars over all of them
+        assert context['tier'] == 'group_vars'
+        assert context['providers'] == [{'model_name': 'gpt', 'params': {'api_base': 'http://gpt'}}]
+        assert context['cors_enabled'] is False
+        assert context['listen'] == '0.0.0.0:4100'
+        assert context['group_names'] == ['proxies'] and context['groups']['all'] == ['proxy01']
+        # Not defined for the host; inferred instead
+        assert context['cors_origins'] == 'cors_origins'
+
+    def test_unknown_host(self, project):
+        with pytest.raises(ValueError, match='not in inventory'):
+            TemplateRenderProfiler(str(project), host='db99').profile()
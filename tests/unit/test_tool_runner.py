@@ -0,0 +1,86 @@
+"""
+Unit tests for the quality tool runner
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'scripts', 'quality'))
+
+from tool_runner import ToolRunner
+
+
+def record(name, delay=0.0):
+    """A tool that appends start and end marks to runs.log and prints the lint config"""
+    script = (f"import time; open('runs.log', 'a').write('+{name} '); time.sleep({delay}); "
+              f"open('runs.log', 'a').write('-{name} '); print(open('lint.cfg').read())")
+    return [sys.executable, '-c', script]
+
+
+@pytest.fixture
+def project(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'lint.cfg').write_text('strict\n')
+    (project / 'notes.md').write_text('# Notes\n')
+    return project
+
+
+@pytest.fixture
+def tools():
+    return {
+        'lint': {'command': record('lint', 0.2), 'inputs': ['*.cfg']},
+        'docs': {'command': record('docs', 0.2), 'inputs': ['*.md']},
+        'bench': {'command': record('bench'), 'inputs': ['*.cfg'], 'after': ['lint', 'docs']},
+        'missing': {'command': ['no-such-quality-tool'], 'inputs': ['*']}
+    }
+
+
+class TestToolRunner:
+    """Test parallel, once-only and cached tool runs"""
+
+    def test_dependency_order_and_parallelism(self, project, tools):
+        runner = ToolRunner(str(project), tools, use_cache=False, max_workers=2)
+        results = runner.run(['bench', 'lint', 'docs'])
+        marks = (project / 'runs.log').read_text().split()
+        # lint and docs overlap; bench starts after both finished
+        assert marks[:2] in (['+lint', '+docs'], ['+docs', '+lint'])
+        assert marks[-2:] == ['+bench', '-bench']
+        assert results['bench']['stdout'] == 'strict\n\n'
+        assert runner.stats == {'run': 3, 'from_cache': 0}
+
+        assert runner.result('lint') is results['lint']
+        assert runner.stats['run'] == 3
+
+    def test_timed_tool_runs_alone(self, project, tools):
+        tools['lint']['timed'] = True
+        tools['notes'] = {'command': record('notes', 0.2), 'inputs': ['*.md']}
+        runner = ToolRunner(str(project), tools, use_cache=False, max_workers=3)
+        runner.run(['docs', 'lint', 'notes'])
+        marks = (project / 'runs.log').read_text().split()
+        assert marks.index('-lint') == marks.index('+lint') + 1
+        assert set(marks[:2]) in ({'+lint', '-lint'}, {'+docs', '+notes'})
+
+    def test_cached_until_inputs_change(self, project, tools, tmp_path):
+        cache_dir = str(tmp_path / 'cache')
+        ToolRunner(str(project), tools, cache_dir).run(['lint', 'docs'])
+
+        runner = ToolRunner(str(project), tools, cache_dir)
+        assert runner.result('lint')['cached'] and runner.result('docs')['cached']
+        assert runner.stats == {'run': 0, 'from_cache': 2}
+
+        (project / 'lint.cfg').write_text('relaxed\n')
+        runner = ToolRunner(str(project), tools, cache_dir)
+        results = runner.run(['lint', 'docs'])
+        assert not results['lint']['cached'] and results['lint']['stdout'] == 'relaxed\n\n'
+        assert results['docs']['cached']
+
+    def test_missing_tool_and_unknown_name(self, project, tools, tmp_path):
+        runner = ToolRunner(str(project), tools, str(tmp_path / 'cache'))
+        result = runner.result('missing')
+        assert result['returncode'] is None and 'not found' in result['error']
+        assert not (tmp_path / 'cache').exists()
+        with pytest.raises(KeyError):
+            runner.run(['lint', 'unknown'])